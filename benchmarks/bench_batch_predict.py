@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+bench_batch_predict.py
+
+Rows per second when predicting every target for a batch of signs: one
+pipe.predict() per model and target against inference.predict_frame(),
+which encodes each chunk once for all models and returns labels and
+class probabilities. Models are trained on synthetic coded columns first.
+
+Every combination of --trees and --n-jobs is measured. Smaller forests
+are the first trees of the trained one, which is exactly the forest
+that many trees would have given (each tree's seed is drawn in turn from
+random_state); --trees only applies to "rf".
+
+Usage (from the project root):
+    python benchmarks/bench_batch_predict.py
+    python benchmarks/bench_batch_predict.py --trees 300 100 50 --n-jobs 1 2 4 -1
+    python benchmarks/bench_batch_predict.py --rows 100000 --engine hgb --n-jobs 4
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from joblib import cpu_count, effective_n_jobs
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from ml_scripts.config import DEFAULT_TARGETS, ENGINES  # noqa: E402
+from ml_scripts.inference import predict_frame  # noqa: E402
+from ml_scripts.registry import ModelRegistry  # noqa: E402
+from ml_scripts.training import train_all_targets  # noqa: E402
+
+
+def synthetic_frame(n_rows, n_columns, seed=0):
+    """Coded columns, and targets that mostly follow two of them."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for j in range(n_columns):
+        if j % 3:
+            columns[f"Code{j}"] = pd.Categorical(rng.choice([f"v{k}" for k in range(6)], size=n_rows))
+        else:
+            columns[f"Score{j}"] = rng.normal(size=n_rows)
+    frame = pd.DataFrame(columns)
+    for i, target in enumerate(DEFAULT_TARGETS):
+        label = frame[f"Code{3 * i + 1}"].astype(str) + "_" + frame[f"Code{3 * i + 2}"].astype(str)
+        label = label.where(rng.random(n_rows) > 0.05, "other")
+        frame[target] = pd.Categorical(label)
+    return frame
+
+
+def rows_per_second(func, n_rows, repeats=3):
+    best = min(_timed(func) for _ in range(repeats))
+    return n_rows / best
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def first_trees(models, n_trees):
+    """Cut every forest in models to its first n_trees trees, in place."""
+    for pipe in models.values():
+        forest = pipe.named_steps["model"]
+        forest.estimators_ = forest.estimators_[:n_trees]
+        forest.n_estimators = len(forest.estimators_)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--train-rows", type=int, default=10_000)
+    parser.add_argument("--columns", type=int, default=30)
+    parser.add_argument("--engine", choices=ENGINES, default="rf")
+    parser.add_argument("--n-jobs", type=int, nargs="+", default=[1, -1],
+                        help="cores per prediction; each value is measured")
+    parser.add_argument("--trees", type=int, nargs="+", default=[300, 50],
+                        help='forest sizes to measure ("rf" only)')
+    args = parser.parse_args()
+    trees = sorted(args.trees, reverse=True) if args.engine == "rf" else [None]
+
+    frame = synthetic_frame(args.train_rows, args.columns)
+    batch = synthetic_frame(args.rows, args.columns, seed=1).drop(columns=DEFAULT_TARGETS)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        train_all_targets(frame, models_dir=tmp, engine=args.engine)
+        registry = ModelRegistry(tmp)
+        # The registry hands out these same objects, so predict_frame sees the cut forests
+        models = {t: registry.get(t) for t in DEFAULT_TARGETS}
+
+        for n_trees in trees:
+            if n_trees is not None:
+                first_trees(models, n_trees)
+            for n_jobs in args.n_jobs:
+                per_model = rows_per_second(
+                    lambda: [pipe.predict(batch) for pipe in models.values()], len(batch)
+                )
+                batched = rows_per_second(
+                    lambda: predict_frame(batch, registry=registry, n_jobs=n_jobs), len(batch)
+                )
+                rows.append((n_trees, n_jobs, per_model, batched))
+
+    print(f"\n{len(batch)} rows x {len(DEFAULT_TARGETS)} targets ({args.engine}), "
+          f"{cpu_count()} cores")
+    print(f"{'trees':>6} | {'n_jobs':>9} | {'pipe.predict per target':>23} | {'predict_frame':>14}")
+    for n_trees, n_jobs, per_model, batched in rows:
+        cores = f"{n_jobs} ({effective_n_jobs(n_jobs)})" if n_jobs < 0 else str(n_jobs)
+        print(f"{n_trees or '-':>6} | {cores:>9} | {per_model:>17,.0f} rows/s | "
+              f"{batched:>8,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+bench_csv_parse.py
+
+Cold-parse wall time of prepareData.read_csv for each csv engine, on 1x,
+10x and 100x copies of the lexicon. Uses Data/signdata.csv when it exists,
+otherwise a synthetic lexicon of the same shape (--rows x --columns).
+
+The pyarrow engine is skipped when pyarrow is not installed.
+
+Usage (from the project root):
+    python benchmarks/bench_csv_parse.py
+    python benchmarks/bench_csv_parse.py --copies 1 10 --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from data_prep.prepareData import SIGNDATA_PATH, has_pyarrow, read_csv  # noqa: E402
+
+
+def synthetic_lexicon(n_rows, n_columns, seed=0):
+    """Mix of short codes, free text and numbers, like signdata.csv."""
+    rng = np.random.default_rng(seed)
+    columns = {"LemmaID": [f"sign_{i}" for i in range(n_rows)]}
+    for j in range(n_columns - 1):
+        kind = j % 3
+        if kind == 0:
+            columns[f"Code{j}.2.0"] = rng.choice([f"v{k}" for k in range(20)], size=n_rows)
+        elif kind == 1:
+            columns[f"Text{j}"] = rng.choice(["caf\xe9 sign", "a longer gloss", ""], size=n_rows)
+        else:
+            columns[f"Score{j}"] = rng.normal(size=n_rows).round(4)
+    return pd.DataFrame(columns)
+
+
+def write_copies(header, body, copies, path):
+    with open(path, "wb") as f:
+        f.write(header)
+        for _ in range(copies):
+            f.write(body)
+    return path
+
+
+def time_parse(path, engine, repeat):
+    times = []
+    for _ in range(repeat):
+        # Keep read_csv's progress messages out of the table
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            data = read_csv(path, engine=engine)
+        times.append(time.perf_counter() - start)
+    return min(times), data.shape
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=2723)
+    parser.add_argument("--columns", type=int, default=120)
+    args = parser.parse_args()
+
+    engines = ["c"] + (["pyarrow"] if has_pyarrow() else [])
+    if len(engines) == 1:
+        print("[SKIP] pyarrow is not installed; timing the C parser only")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if SIGNDATA_PATH.exists():
+            source = SIGNDATA_PATH
+        else:
+            source = tmp / "synthetic.csv"
+            synthetic_lexicon(args.rows, args.columns).to_csv(source, index=False, encoding="latin1")
+        print(f"[INFO] Lexicon: {source}")
+
+        raw = source.read_bytes()
+        header, _, body = raw.partition(b"\n")
+        header += b"\n"
+        if not body.endswith(b"\n"):
+            body += b"\n"
+
+        print(f"\n{'copies':>7} | {'rows':>9} | {'MB':>8} | " + " | ".join(f"{e:>9}" for e in engines))
+        for copies in args.copies:
+            path = write_copies(header, body, copies, tmp / f"copies-{copies}.csv")
+            size_mb = path.stat().st_size / 1e6
+            results = [time_parse(path, engine, args.repeat) for engine in engines]
+            rows = results[0][1][0]
+            cells = " | ".join(f"{seconds:>8.3f}s" for seconds, _ in results)
+            print(f"{copies:>6}x | {rows:>9} | {size_mb:>8.1f} | {cells}")
+
+
+if __name__ == "__main__":
+    main()
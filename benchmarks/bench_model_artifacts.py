@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+bench_model_artifacts.py
+
+File size, load time and resident memory of a trained model saved in each
+artifact format (see ml_scripts.artifacts). Each load runs in a fresh
+process so the figures do not share caches or allocations.
+
+Usage (from the project root):
+    python benchmarks/bench_model_artifacts.py
+    python benchmarks/bench_model_artifacts.py --rows 50000 --engine hgb
+"""
+
+import argparse
+import multiprocessing as mp
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from ml_scripts import artifacts  # noqa: E402
+from ml_scripts.config import ARTIFACT_FORMATS, ENGINES  # noqa: E402
+from ml_scripts.training import train_all_targets  # noqa: E402
+
+
+def synthetic_frame(n_rows, n_columns, seed=0):
+    """Coded columns plus a Handshape target that depends on a few of them."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for j in range(n_columns):
+        if j % 3:
+            columns[f"Code{j}"] = pd.Categorical(rng.choice([f"v{k}" for k in range(20)], size=n_rows))
+        else:
+            columns[f"Score{j}"] = rng.normal(size=n_rows)
+    frame = pd.DataFrame(columns)
+    noise = rng.choice(["flat", "B", "A", "S", "open_B"], size=n_rows)
+    frame["Handshape"] = pd.Categorical(
+        np.where(rng.random(n_rows) < 0.5, "hs_" + frame["Code1"].astype(str), noise)
+    )
+    return frame
+
+
+def load_worker(path, results):
+    _, info = artifacts.load_artifact(path, verbose=False)
+    results.put((info["load_seconds"], info["rss_bytes"]))
+
+
+def timed_load(path):
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=load_worker, args=(path, results))
+    proc.start()
+    out = results.get()
+    proc.join()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--columns", type=int, default=30)
+    parser.add_argument("--engine", choices=ENGINES, default="rf")
+    args = parser.parse_args()
+
+    frame = synthetic_frame(args.rows, args.columns)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        results = train_all_targets(frame, targets=["Handshape"], models_dir=tmp,
+                                    engine=args.engine)
+        pipe, _ = artifacts.load_artifact(results[0]["path"], verbose=False)
+
+        rows = []
+        for artifact_format in ARTIFACT_FORMATS:
+            path = artifacts.write_artifact(pipe, tmp / f"{artifact_format}.pkl", "Handshape",
+                                            artifact_format)
+            seconds, rss = timed_load(path)
+            rows.append((artifact_format, path.stat().st_size, seconds, rss))
+
+    print(f"\n{'format':<11} | {'file':>9} | {'load':>7} | {'resident':>9}   ({args.engine})")
+    for artifact_format, size, seconds, rss in rows:
+        print(f"{artifact_format:<11} | {size / 2**20:>6.1f} MB | "
+              f"{seconds:>6.2f}s | {rss / 2**20:>6.1f} MB")
+
+if __name__ == "__main__":
+    main()
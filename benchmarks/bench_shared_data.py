@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+bench_shared_data.py
+
+Memory of N worker processes that each hold their own copy of a sign frame
+against N workers attached to one published, memory-mapped copy (see
+data_prep.shared). Each worker touches every column, then reports its
+proportional set size (PSS, Linux only), which splits shared pages between
+the processes using them.
+
+Usage (from the project root):
+    python benchmarks/bench_shared_data.py
+    python benchmarks/bench_shared_data.py --rows 500000 --workers 8
+"""
+
+import argparse
+import multiprocessing as mp
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from data_prep import shared  # noqa: E402
+
+
+def synthetic_frame(n_rows, n_columns, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {"LemmaID": [f"sign_{i}" for i in range(n_rows)]}
+    for j in range(n_columns - 1):
+        if j % 2:
+            columns[f"Code{j}"] = rng.choice([f"v{k}" for k in range(30)], size=n_rows)
+        else:
+            columns[f"Score{j}"] = rng.normal(size=n_rows)
+    return pd.DataFrame(columns)
+
+
+def pss_mb():
+    with open("/proc/self/smaps_rollup", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def touch(frame):
+    # Read every value so all pages are resident
+    for col in frame.columns:
+        values = frame[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values.array.codes.sum()
+        elif values.dtype.kind in "biufc":
+            values.to_numpy().sum()
+        else:
+            values.map(len).sum()
+
+
+def worker(mode, path, barrier, results):
+    baseline = pss_mb()
+    frame = pd.read_pickle(path) if mode == "own" else shared.attach(path)
+    touch(frame)
+    # Measure while every worker still holds its frame
+    barrier.wait()
+    results.put(pss_mb() - baseline)
+    barrier.wait()
+
+
+def run(mode, path, n_workers):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(n_workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(mode, path, barrier, results)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    sizes = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return sum(sizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    if not Path("/proc/self/smaps_rollup").exists():
+        print("[SKIP] PSS is only available on Linux")
+        return
+
+    frame = synthetic_frame(args.rows, args.columns)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        own = tmp / "frame.pkl"
+        frame.to_pickle(own)
+        # The shared copy is published categorical, like publish_sign_frame()
+        published = shared.publish(frame, tmp / "shared")
+        size_mb = sum(p.stat().st_size for p in published.iterdir()) / 2**20
+        print(f"[INFO] {args.rows} rows x {args.columns} columns, published {size_mb:.1f} MB")
+
+        print(f"\n{'workers':>7} | {'own copies':>12} | {'attached':>12}")
+        for n in args.workers:
+            own_mb = run("own", own, n)
+            shared_mb = run("shared", published, n)
+            print(f"{n:>7} | {own_mb:>9.1f} MB | {shared_mb:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+bench_sign_index.py
+
+Query latency of SignIndex against a boolean DataFrame scan, reported in
+microseconds. Runs on the full lexicon from get_sign_data(), or on a
+synthetic lexicon with --synthetic N.
+
+Usage (from the project root):
+    python benchmarks/bench_sign_index.py
+    python benchmarks/bench_sign_index.py --synthetic 100000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from data_prep.schema import CANONICAL_ATTRIBUTES  # noqa: E402
+from sign_data import get_sign_data  # noqa: E402
+from sign_data.index import SignIndex  # noqa: E402
+
+
+def synthetic_lexicon(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    sizes = {"Handshape": 50, "Movement": 8, "MajorLocation": 5, "MinorLocation": 30}
+    df = pd.DataFrame({"LemmaID": [f"sign_{i}" for i in range(n_rows)]})
+    for attr, n_values in sizes.items():
+        df[attr] = rng.choice([f"{attr[:2]}{i}" for i in range(n_values)], size=n_rows)
+    return df
+
+
+def random_queries(df, n_queries, seed=0):
+    """Criteria taken from real rows so most queries have hits."""
+    rng = np.random.default_rng(seed)
+    rows = df.dropna(subset=CANONICAL_ATTRIBUTES).sample(
+        n=n_queries, replace=True, random_state=seed
+    )
+    queries = []
+    for _, row in rows.iterrows():
+        n_attrs = rng.integers(1, len(CANONICAL_ATTRIBUTES) + 1)
+        attrs = rng.choice(CANONICAL_ATTRIBUTES, size=n_attrs, replace=False)
+        queries.append({attr: row[attr] for attr in attrs})
+    return queries
+
+
+def scan(df, criteria):
+    mask = np.ones(len(df), dtype=bool)
+    for attr, value in criteria.items():
+        mask &= (df[attr] == value).to_numpy()
+    return df.loc[mask, "LemmaID"]
+
+
+def latencies_us(func, queries):
+    times = []
+    for criteria in queries:
+        start = time.perf_counter()
+        func(criteria)
+        times.append((time.perf_counter() - start) * 1e6)
+    return np.array(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--synthetic", type=int, default=None, metavar="N")
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        df = synthetic_lexicon(args.synthetic)
+    else:
+        df = get_sign_data(view="canonical")
+
+    start = time.perf_counter()
+    index = SignIndex(df)
+    build_ms = (time.perf_counter() - start) * 1e3
+    print(f"Built index over {len(df)} signs in {build_ms:.1f} ms")
+
+    queries = random_queries(df, args.queries)
+    idx = latencies_us(lambda c: index.query(**c), queries)
+    ids = latencies_us(lambda c: index.rows(**c), queries)
+    ref = latencies_us(lambda c: scan(df, c), queries)
+
+    print(f"{'method':<22} | {'median (us)':>11} | {'p95 (us)':>9}")
+    for name, t in [
+        ("index rows", ids),
+        ("index -> Sign objects", idx),
+        ("boolean scan", ref),
+    ]:
+        print(f"{name:<22} | {np.median(t):>11.1f} | {np.percentile(t, 95):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
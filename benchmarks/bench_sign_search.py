@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+bench_sign_search.py
+
+Per-keystroke latency of SignSearch (prefix and fuzzy) against filtering
+the DataFrame with string operations, in microseconds. Runs on the full
+lexicon, or on synthetic names with --synthetic N.
+
+Usage (from the project root):
+    python benchmarks/bench_sign_search.py
+    python benchmarks/bench_sign_search.py --synthetic 50000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sign_data import get_sign_data  # noqa: E402
+from sign_data.classes import SignTable  # noqa: E402
+from sign_data.search import SignSearch  # noqa: E402
+
+
+def synthetic_names(n, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz_"))
+    lengths = rng.integers(3, 14, size=n)
+    return list(dict.fromkeys("".join(rng.choice(letters, size=k)) for k in lengths))
+
+
+def keystrokes(names, n_queries, seed=0):
+    """Prefixes of real names, as typed one character at a time."""
+    rng = np.random.default_rng(seed)
+    queries = []
+    for name in rng.choice(names, size=n_queries):
+        queries += [name[:i] for i in range(1, len(name) + 1)]
+    return queries
+
+
+def latencies_us(func, queries):
+    times = []
+    for q in queries:
+        start = time.perf_counter()
+        func(q)
+        times.append((time.perf_counter() - start) * 1e6)
+    return np.array(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--synthetic", type=int, default=None, metavar="N")
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        frame = pd.DataFrame({"LemmaID": synthetic_names(args.synthetic)})
+    else:
+        frame = get_sign_data(view="canonical")
+    frame = frame.dropna(subset=["LemmaID"])
+    names = frame["LemmaID"].astype(str).tolist()
+
+    start = time.perf_counter()
+    search = SignSearch(SignTable(frame))
+    print(f"[INFO] {len(names)} names, index built in {time.perf_counter() - start:.2f}s")
+
+    lowered = frame["LemmaID"].astype(str).str.lower()
+    queries = keystrokes(names, args.queries)
+    results = {
+        "DataFrame str.startswith": latencies_us(
+            lambda q: frame[lowered.str.startswith(q.lower())].head(20), queries
+        ),
+        "SignSearch.prefix": latencies_us(search.prefix, queries),
+        "SignSearch.fuzzy": latencies_us(search.fuzzy, queries),
+        "SignSearch.lookup": latencies_us(search.lookup, queries),
+    }
+
+    print(f"\n{'method':<26} | {'median':>9} | {'p95':>9}   ({len(queries)} keystrokes)")
+    for label, times in results.items():
+        print(f"{label:<26} | {np.median(times):>7.1f}us | {np.percentile(times, 95):>7.1f}us")
+
+
+if __name__ == "__main__":
+    main()
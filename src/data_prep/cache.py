@@ -0,0 +1,380 @@
+"""
+cache.py
+
+On-disk cache for parsed data frames.
+
+A cache entry is a directory holding the frame in one or more columnar
+binary parts plus a ``meta.json`` describing the source file it was built
+from:
+
+Data/.cache/
+    signdata-canonical/
+        meta.json
+        part-00000.parquet   (or .pkl when pyarrow is not installed)
+        part-00001.parquet   (streamed loads write one part per chunk)
+
+An entry is valid while the source file keeps the same size and content.
+The mtime is checked first so a warm load never has to read the CSV; the
+content hash is only recomputed when the mtime moved (e.g. after a
+``git checkout`` or a copy) to tell a touched file from an edited one.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Bump when the layout of an entry changes so old entries are ignored
+CACHE_VERSION = 2
+
+META_NAME = "meta.json"
+
+# Remembered content digests of source files, see known_digest
+DIGESTS_NAME = "digests.json"
+
+# Sources modified this close to the cache write are always re-hashed
+RACY_WINDOW_NS = 2 * 10**9
+
+# Preferred storage formats, in order. Parquet needs pyarrow (or fastparquet);
+# pickle is always available and keeps every pandas dtype as-is.
+FORMATS = ("parquet", "pickle")
+
+_EXTENSIONS = {"parquet": ".parquet", "pickle": ".pkl"}
+
+
+def file_stat(path):
+    """Return the size and mtime (ns) of a file."""
+    st = Path(path).stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Return the blake2b hex digest of a file's contents."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_fingerprint(path):
+    """Return size, mtime and content hash of a source file."""
+    return {**file_stat(path), "digest": file_digest(path)}
+
+
+def entry_dir(cache_dir, source_path, tag):
+    """Directory of the cache entry for ``source_path`` and variant ``tag``."""
+    return Path(cache_dir) / f"{Path(source_path).stem}-{tag}"
+
+
+def _replace_atomically(path, write):
+    """
+    Call write(tmp) on a temporary file of its own next to ``path``, then
+    rename it over ``path``: readers never see half a file, and writers
+    racing on the same path never share a temporary file.
+    """
+    path = Path(path)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + ".", suffix=".tmp",
+                                     delete=False) as f:
+        tmp = Path(f.name)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, obj):
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2)
+
+    _replace_atomically(path, write)
+
+
+def _read_meta(entry):
+    return _read_json(entry / META_NAME)
+
+
+def _write_meta(entry, meta):
+    _write_json(entry / META_NAME, meta)
+
+
+def is_fresh(meta, source_path):
+    """
+    Check a cache entry's metadata against the current source file.
+
+    Returns (fresh, stat) where stat is the current size/mtime so callers
+    can refresh the stored mtime after a content-hash match.
+    """
+    if meta is None or meta.get("version") != CACHE_VERSION:
+        return False, None
+
+    stat = file_stat(source_path)
+    source = meta.get("source", {})
+
+    # A different size always means different content
+    if stat["size"] != source.get("size"):
+        return False, stat
+
+    # Same size and mtime: trust it without reading the file, unless the
+    # source was modified so close to the cache write that an edit within
+    # the same timestamp tick could hide (the "racy git" problem)
+    if stat["mtime_ns"] == source.get("mtime_ns") and (
+        stat["mtime_ns"] < meta.get("stored_ns", 0) - RACY_WINDOW_NS
+    ):
+        return True, stat
+
+    # The mtime moved; only a content change invalidates the entry
+    return file_digest(source_path) == source.get("digest"), stat
+
+
+def _read_frame(path, fmt):
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _write_frame(df, path, fmt):
+    if fmt == "parquet":
+        df.to_parquet(path)
+    else:
+        df.to_pickle(path)
+
+
+def _concat_parts(parts):
+    """
+    Concatenate parts, keeping Category columns as Category.
+
+    Parts written chunk by chunk may know fewer categories than later ones
+    (or none, if a column only became categorical in a later chunk), so
+    every part is cast to the union of categories first.
+    """
+    if len(parts) == 1:
+        return parts[0]
+
+    categories = {}
+    for part in parts:
+        for col in part.columns:
+            if isinstance(part[col].dtype, pd.CategoricalDtype):
+                seen = categories.setdefault(col, {})
+                seen.update(dict.fromkeys(part[col].cat.categories))
+
+    # Values of parts where the column was not categorical yet come last
+    for part in parts:
+        for col, seen in categories.items():
+            if col in part.columns and not isinstance(part[col].dtype, pd.CategoricalDtype):
+                seen.update(dict.fromkeys(part[col].dropna().unique()))
+
+    if categories:
+        dtypes = {col: pd.CategoricalDtype(list(seen)) for col, seen in categories.items()}
+        parts = [
+            part.astype({col: dtype for col, dtype in dtypes.items() if col in part.columns})
+            for part in parts
+        ]
+
+    return pd.concat(parts, ignore_index=True)
+
+
+def load(source_path, cache_dir, tag):
+    """
+    Return the cached frame for ``source_path`` or None on a miss.
+    """
+    entry = entry_dir(cache_dir, source_path, tag)
+    meta = _read_meta(entry)
+
+    try:
+        fresh, stat = is_fresh(meta, source_path)
+    except OSError:
+        return None
+    if not fresh:
+        return None
+
+    try:
+        parts = [_read_frame(entry / p["file"], p["format"]) for p in meta["parts"]]
+        df = _concat_parts(parts)
+    except Exception as e:
+        print(f"[cache] Ignoring unreadable cache entry {entry}: {e}")
+        return None
+
+    # Remember the new mtime so the next load skips hashing again
+    if stat["mtime_ns"] != meta["source"]["mtime_ns"]:
+        meta["source"].update(stat)
+        try:
+            _write_meta(entry, meta)
+        except OSError:
+            pass
+
+    return df
+
+
+def _write_part(df, staging, number, formats):
+    for fmt in formats:
+        name = f"part-{number:05d}" + _EXTENSIONS[fmt]
+        try:
+            _write_frame(df, staging / name, fmt)
+            return {"file": name, "format": fmt, "rows": int(df.shape[0])}
+        except Exception:
+            (staging / name).unlink(missing_ok=True)
+    return None
+
+
+def store_parts(frames, source_path, cache_dir, tag, formats=FORMATS):
+    """
+    Write an iterable of frames as the parts of one cache entry.
+
+    Frames are written as they are produced, so only one of them needs to
+    be in memory at a time. Each part uses the first format in ``formats``
+    that works (parquet rejects some mixed-type object columns). Returns
+    the entry directory, or None if the entry could not be written.
+    """
+    entry = entry_dir(cache_dir, source_path, tag)
+    fingerprint = source_fingerprint(source_path)
+
+    try:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=entry.name + ".", dir=cache_dir))
+    except OSError as e:
+        print(f"[cache] Cannot create cache directory {cache_dir}: {e}")
+        return None
+
+    try:
+        parts = []
+        columns = None
+        for number, df in enumerate(frames):
+            part = _write_part(df, staging, number, formats)
+            if part is None:
+                print(f"[cache] Could not write {entry.name} in any of {formats}")
+                return None
+            parts.append(part)
+            columns = int(df.shape[1])
+
+        if not parts:
+            return None
+
+        _write_meta(staging, {
+            "version": CACHE_VERSION,
+            "parts": parts,
+            "stored_ns": time.time_ns(),
+            "rows": sum(p["rows"] for p in parts),
+            "columns": columns,
+            "source": {"path": str(source_path), **fingerprint},
+        })
+
+        # Swap the finished entry into place
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(staging, entry)
+        return entry
+    except OSError as e:
+        print(f"[cache] Failed to write cache entry {entry}: {e}")
+        return None
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def store(df, source_path, cache_dir, tag, formats=FORMATS):
+    """
+    Write ``df`` as the cache entry for ``source_path``.
+    Returns the entry directory, or None if nothing could be written.
+    """
+    return store_parts([df], source_path, cache_dir, tag, formats)
+
+
+def known_digest(path, cache_dir):
+    """
+    file_digest(path), remembered in ``cache_dir`` with the file's size and
+    mtime. The file is only read again when those no longer vouch for the
+    remembered digest (same rules as a cache entry, see is_fresh).
+    """
+    memo_path = Path(cache_dir) / DIGESTS_NAME
+    memo = _read_json(memo_path) or {}
+    name = str(Path(path).resolve())
+    remembered = memo.get(name)
+
+    fresh, stat = is_fresh(remembered, path)
+    if fresh and stat["mtime_ns"] == remembered["source"]["mtime_ns"]:
+        return remembered["source"]["digest"]
+
+    if fresh:
+        # Touched but unchanged: is_fresh has just hashed it
+        source = {**remembered["source"], **stat}
+    else:
+        source = source_fingerprint(path)
+    memo[name] = {"version": CACHE_VERSION, "stored_ns": time.time_ns(), "source": source}
+    try:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        _write_json(memo_path, memo)
+    except OSError:
+        pass
+    return source["digest"]
+
+
+def clear(cache_dir):
+    """Remove every cache entry under ``cache_dir``."""
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+# ---------------------------------------------------------------
+# Derived outputs (neighbor tables, indexes, ...) are not tied to one
+# source file; they are keyed on a digest of the frame they came from.
+# ---------------------------------------------------------------
+
+
+def frame_digest(df, columns=None):
+    """Content hash of a DataFrame (or a subset of its columns)."""
+    if columns is not None:
+        df = df[list(columns)]
+    h = hashlib.blake2b(digest_size=12)
+    h.update("\0".join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def derived_path(cache_dir, name, digest):
+    return Path(cache_dir) / f"{name}-{digest}.pkl"
+
+
+def load_derived(cache_dir, name, digest):
+    """Return a cached derived object, or None on a miss."""
+    path = derived_path(cache_dir, name, digest)
+    if not path.exists():
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception as e:
+        print(f"[cache] Ignoring unreadable cache file {path}: {e}")
+        return None
+
+
+def store_derived(obj, cache_dir, name, digest, replace=False):
+    """
+    Pickle a derived object into the cache. Returns its path or None.
+    replace: remove the entries of ``name`` under other digests, for
+             outputs where only the latest one is worth keeping
+    """
+    path = derived_path(cache_dir, name, digest)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _replace_atomically(path, lambda tmp: pd.to_pickle(obj, tmp))
+    except OSError as e:
+        print(f"[cache] Failed to write {path}: {e}")
+        return None
+
+    if replace:
+        for old in path.parent.glob(f"{name}-*.pkl"):
+            if old != path and old.stem.rsplit("-", 1)[0] == name:
+                old.unlink(missing_ok=True)
+    return path
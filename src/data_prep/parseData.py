@@ -18,8 +18,9 @@ from dataclasses import dataclass
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data_prep.prepareData import signData, attemptRowGet
-from sign_data.classes import Sign
+from data_prep import profiling
+from data_prep.prepareData import attemptRowGet, ensure_canonical_columns, get_sign_frame, memoized
+from sign_data.classes import SignTable
 
 '''	
 	---------------------
@@ -27,55 +28,45 @@ from sign_data.classes import Sign
 	---------------------
 '''
 
-# If we have no sign data, the program cannot continue
-if signData is None:
-	raise RuntimeError("signdata.csv failed to load")
+# Build the signs object on first use instead of at import
+# Raises if signdata.csv could not be loaded
+def get_signs():
+	return memoized("signs", lambda: buildSigns(get_sign_frame()))
 
-# Sort signs by name so we can look up by name
-indexedSignData = signData.set_index('LemmaID')
 
-# Initiate object containing all signs in dataset
-signs = {}
-
-# Append signs into our signs object
-for name, row in indexedSignData.iterrows():
-	signs[name] = {
-		"Movement":        attemptRowGet(row, "Movement"),
-		"MajorLocation":   attemptRowGet(row, "MajorLocation"),
-		"MinorLocation":   attemptRowGet(row, "MinorLocation"),
-		"Handshape":       attemptRowGet(row, "Handshape"),
-		**row.to_dict()
-	}	
+# `parseData.signs` and `parseData.signData` used to be built at import
+# They are still available as attributes, but only load when first accessed
+def __getattr__(name):
+	if name == "signs":
+		return get_signs()
+	if name == "signData":
+		return get_sign_frame()
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 '''
-	--------
-	- Test -
-	--------	
+	---------------
+	- Build Signs -
+	---------------
 '''
 
 def buildSigns(sign_df):
+    """
+    Build the SignTable for a sign DataFrame: O(1) lookup by LemmaID,
+    with Sign views over the frame's columns instead of a dict per sign.
+    """
     if sign_df is None:
         raise RuntimeError("signdata.csv failed to load")
 
-    indexed = sign_df.set_index("LemmaID")
-    signs = {}
-    for name, row in indexed.iterrows():
-        signs[name] = {
-            "Movement":      attemptRowGet(row, "Movement"),
-            "MajorLocation": attemptRowGet(row, "MajorLocation"),
-            "MinorLocation": attemptRowGet(row, "MinorLocation"),
-            "Handshape":     attemptRowGet(row, "Handshape"),
-            **row.to_dict(),
-        }
-    return signs
+    with profiling.stage("sign_table_build"):
+        return SignTable(ensure_canonical_columns(sign_df), key="LemmaID")
 
 
 # Only run the demo when executing as a script
 if __name__ == "__main__":
-    signs = buildSigns(signData)
+    signs = get_signs()
 
-    tree = Sign("hello", signs["hello"])
+    tree = signs["hello"]
     print(f"Movement: {tree.movement}")
     print(f"Major Location: {tree.majorLocation}")
     print(f"Minor Location: {tree.minorLocation}")
@@ -11,17 +11,90 @@ import pandas as pd
 import numpy as np
 import os
 import re
+import threading
+import functools
 
 from pathlib import Path
 from dataclasses import dataclass
 
+from data_prep import cache, profiling, schema, shared
+from data_prep.schema import CANONICAL_ATTRIBUTES, canonical_candidates
+
+# Parser backend for whole-file reads:
+#   "c"       : pandas' single-threaded C parser (the default)
+#   "pyarrow" : Arrow's multithreaded CSV reader, falling back to "c" when
+#               pyarrow is not installed, cannot read the file, or finds rows
+#               with the wrong number of fields (see _read_csv_arrow)
+#   "auto"    : "pyarrow" if it is installed, otherwise "c"
+# Override with the ASL_CSV_ENGINE environment variable
+CSV_ENGINES = ("auto", "c", "pyarrow")
+CSV_ENGINE = os.environ.get("ASL_CSV_ENGINE", "c")
+
+
+def has_pyarrow():
+	try:
+		import pyarrow  # noqa: F401
+	except ImportError:
+		return False
+	return True
+
+
+def resolve_csv_engine(engine=None):
+	engine = engine or CSV_ENGINE
+	if engine not in CSV_ENGINES:
+		msg = f"Unknown csv engine {engine!r}, expected one of {CSV_ENGINES}"
+		raise ValueError(msg)
+	if engine == "auto":
+		return "pyarrow" if has_pyarrow() else "c"
+	return engine
+
+
+# The Arrow reader only takes a list of column names, so a usecols callable
+# is resolved against the header first
+def _usecols_list(path, usecols):
+	if not callable(usecols):
+		return usecols
+	header = pd.read_csv(path, encoding="latin1", nrows=0).columns
+	return [name for name in header if usecols(name)]
+
+
+# Multithreaded parse through Arrow, latin1 like the C parser
+# Arrow would drop every row with the wrong number of fields, where the C parser
+# pads short rows and keeps long ones whose extra fields usecols leaves out;
+# so any such row raises here and the caller falls back to the C parser,
+# which keeps both engines' frames (and the cache entries built from them) the same
+def _read_csv_arrow(path, usecols=None, dtype=None):
+	return pd.read_csv(path, encoding="latin1", on_bad_lines="error", engine="pyarrow",
+	                   usecols=_usecols_list(path, usecols), dtype=dtype)
+
+
 # Attempt to read csv file
 # Throw an exception if unable to
-def read_csv(path):
+# usecols / dtype are passed through to pandas to project and type the columns
+# engine picks the parser backend (see CSV_ENGINE)
+# The parser that actually ran is recorded in the load profile, which may
+# differ from the requested one when pyarrow is missing or fails
+def read_csv(path, usecols=None, dtype=None, engine=None):
+	engine = resolve_csv_engine(engine)
+	if engine == "pyarrow":
+		if has_pyarrow():
+			try:
+				print(f"Loading {path} (pyarrow)")
+				data = _read_csv_arrow(path, usecols=usecols, dtype=dtype)
+				print(f"Successfully opened {path}")
+				_record_csv_engine(engine, "pyarrow")
+				return data
+			except Exception as e:
+				print(f"pyarrow could not read {path}, using the C parser. Error: {e}")
+		else:
+			print("pyarrow is not installed, using the C parser")
+
 	try:
 		print(f"Loading {path}")
-		data = pd.read_csv(path, encoding="latin1", on_bad_lines="skip", low_memory=False)
+		data = pd.read_csv(path, encoding="latin1", on_bad_lines="skip", low_memory=False,
+		                   usecols=usecols, dtype=dtype)
 		print(f"Successfully opened {path}")
+		_record_csv_engine(engine, "c")
 		return data
 	except Exception as e:
 		print(f"Cannot open data: {path}. Error: {e}")
@@ -29,6 +102,24 @@ def read_csv(path):
 		return None
 
 
+# Profile the parser used for a read and tag the enclosing stage with it
+def _record_csv_engine(requested, used):
+	profiling.event("csv_engine", requested=requested, used=used)
+	profiling.tag(engine=used)
+
+
+# Same as read_csv, but yields the file in chunks of `chunksize` rows
+# Returns None if the file cannot be opened
+def read_csv_chunks(path, chunksize, usecols=None, dtype=None):
+	try:
+		print(f"Streaming {path} in chunks of {chunksize} rows")
+		return pd.read_csv(path, encoding="latin1", on_bad_lines="skip", low_memory=False,
+		                   usecols=usecols, dtype=dtype, chunksize=chunksize)
+	except Exception as e:
+		print(f"Cannot open data: {path}. Error: {e}")
+		return None
+
+
 '''
 	-----------------
 	-  Access Data  -
@@ -41,24 +132,18 @@ DATA_DIR = PROJECT_ROOT / "Data"
 SIGNDATA_PATH = DATA_DIR / "signdata.csv"
 SIGNDATA_KEY_PATH = DATA_DIR / "signdataKEY.csv"
 
-# Sign handshape and movement data
-signData        = read_csv(SIGNDATA_PATH)
-signDataKey     = read_csv(SIGNDATA_KEY_PATH)
+# Parsed frames are cached here, keyed on the source file (see cache.py)
+CACHE_DIR = DATA_DIR / ".cache"
 
+# Rows per chunk when streaming a csv into the cache
+DEFAULT_CHUNKSIZE = 50_000
 
-'''
-# Reaction time and sign familiarity
-aslLEXR	        = read_csv(dataPath / "Frequency/ASLLEXR.csv")
-aslLEXRKey      = read_csv(dataPath / "Frequency/ASLLEXRkey.csv") 
-# freqStatus    = read_csv(dataPath / "Frequency/Freq_ASLstatus.R")
+# Default location of the memory-mapped dataset shared with worker processes
+SHARED_DIR = CACHE_DIR / "shared"
 
-# Iconic rating of signs
-iconDTrial      = read_csv(dataPath / "Iconicity/IconD_trial.csv")
-iconicityTrial  = read_csv(dataPath / "Iconicity/IconicityTrial.csv")
 
-# Pairs of similar-looking signs
-neigborPairs    = read_csv(dataPath / "Phonology/NeigborPairs.csv")
-''' 
+# Frequency, iconicity and neighbor-pair tables are optional and only loaded
+# on request; see sources.py
 
 '''
 	---------------------------
@@ -74,7 +159,7 @@ def attemptRowGet(row: pd.Series, prefix: str):
 	correctValue = ""
 
 	# Account for varying stems for each attribute
-	correctPathCandidates = [f"{prefix}.2.0"] + [f"{prefix}M{i}.2.0" for i in range(2, 7)]
+	correctPathCandidates = canonical_candidates(prefix)
 
 	# Check if attribute is assigned value according to stem
 	for candidate in correctPathCandidates:	
@@ -84,3 +169,233 @@ def attemptRowGet(row: pd.Series, prefix: str):
 	print(f"{prefix} attribute does not exist")
 	return None 
 
+
+# Candidate columns present in a schema, worked out once per set of columns
+@functools.lru_cache(maxsize=64)
+def _present_candidates(columns: tuple, prefix: str):
+	present = set(columns)
+	return [c for c in canonical_candidates(prefix) if c in present]
+
+
+# Column-wise version of attemptRowGet for a whole frame
+# Like attemptRowGet, the first candidate column that exists wins, and a row only
+# falls through to the next candidate when its value is None (NaN does not)
+def resolve_canonical_column(data: pd.DataFrame, prefix: str) -> pd.Series:
+
+	candidates = _present_candidates(tuple(data.columns), prefix)
+
+	if not candidates:
+		print(f"{prefix} attribute does not exist")
+		return pd.Series([None] * len(data), index=data.index, dtype=object)
+
+	first = data[candidates[0]]
+
+	# Only object columns can hold None, so nothing else ever falls through
+	if first.dtype != object or len(candidates) == 1:
+		return first.rename(None)
+
+	values = first.to_numpy(dtype=object, copy=True)
+	for candidate in candidates[1:]:
+		holes = np.equal(values, None)
+		if not holes.any():
+			break
+		values[holes] = data[candidate].to_numpy(dtype=object)[holes]
+
+	return pd.Series(values, index=data.index)
+
+
+# Add the canonical Movement / MajorLocation / MinorLocation / Handshape columns
+# Columns that already exist are left untouched
+def ensure_canonical_columns(data: pd.DataFrame) -> pd.DataFrame:
+
+	missing = [attr for attr in CANONICAL_ATTRIBUTES if attr not in data.columns]
+
+	# Only make a copy if we actually need to add something
+	if not missing:
+		return data
+	data = data.copy()
+
+	for attr in missing:
+		data[attr] = resolve_canonical_column(data, attr)
+
+	return data
+
+
+# Stream a sign data csv into the cache chunk by chunk
+# Each chunk gets its canonical columns (and categories) and is written out as
+# its own part, so memory stays bounded by the chunk size
+# Returns the cache entry directory, or None if the csv could not be read
+def stream_sign_data(path=SIGNDATA_PATH, cache_dir=CACHE_DIR, chunksize=DEFAULT_CHUNKSIZE,
+                     columns=None, categorical=False):
+
+	dtype = schema.read_dtypes(cache_dir) if categorical else None
+	reader = read_csv_chunks(path, chunksize, usecols=schema.projection(columns), dtype=dtype)
+	if reader is None:
+		return None
+
+	def prepared_chunks():
+		with reader:
+			for chunk in reader:
+				chunk = ensure_canonical_columns(chunk)
+				if categorical:
+					chunk = schema.apply_vocabulary(chunk, cache_dir)
+				yield chunk
+
+	try:
+		with profiling.stage("csv_stream", chunksize=chunksize):
+			return cache.store_parts(prepared_chunks(), path, cache_dir, schema.cache_tag(columns, categorical))
+	except Exception as e:
+		print(f"Cannot stream data: {path}. Error: {e}")
+		return None
+
+
+# Load a sign data csv with its canonical columns
+# Served from the on-disk cache while the csv is unchanged
+# columns     : only read these (plus what the canonical columns need), see schema.VIEWS
+# categorical : store low-cardinality string columns as Category with the shared vocabulary
+# chunksize   : stream the csv into the cache in chunks instead of parsing it in one go;
+#               the raw text frame is never held in memory as a whole
+# engine      : csv parser backend for a cold whole-file parse (see CSV_ENGINE)
+def load_sign_data(path=SIGNDATA_PATH, cache_dir=CACHE_DIR, use_cache=True,
+                   columns=None, categorical=False, chunksize=None, engine=None):
+
+	tag = schema.cache_tag(columns, categorical)
+
+	if use_cache and Path(path).exists():
+		with profiling.stage("cache_lookup"):
+			data = cache.load(path, cache_dir, tag)
+		profiling.event("cache", tag=tag, hit=data is not None)
+		if data is not None:
+			print(f"Loaded {path} from cache")
+			return data
+
+	# Streaming always goes through the cache: chunks are spilled, then read back
+	if chunksize is not None:
+		if stream_sign_data(path, cache_dir, chunksize, columns, categorical) is None:
+			return None
+		with profiling.stage("cache_read"):
+			return cache.load(path, cache_dir, tag)
+
+	dtype = schema.read_dtypes(cache_dir) if categorical else None
+	with profiling.stage("csv_parse"):
+		data = read_csv(path, usecols=schema.projection(columns), dtype=dtype, engine=engine)
+	if data is None:
+		return None
+
+	with profiling.stage("canonical_columns"):
+		data = ensure_canonical_columns(data)
+
+	if categorical:
+		with profiling.stage("categorical"):
+			data = schema.apply_vocabulary(data, cache_dir)
+
+	if use_cache:
+		with profiling.stage("cache_store"):
+			cache.store(data, path, cache_dir, tag)
+
+	return data
+
+
+'''
+	-------------
+	- Load Data -
+	-------------
+'''
+
+# Process-wide results of the lazy loaders below, keyed by what was loaded
+_memo = {}
+_memo_lock = threading.RLock()
+
+
+# Run loader() once per key and hand back the same result afterwards
+# Treat the returned frames as read-only: every consumer shares them
+def memoized(key, loader):
+	with _memo_lock:
+		hit = key in _memo
+		profiling.event("memo", key=key, hit=hit)
+		if not hit:
+			_memo[key] = loader()
+		return _memo[key]
+
+
+# Forget everything loaded so far, e.g. after the csv files changed
+def reset_loaded_data():
+	with _memo_lock:
+		_memo.clear()
+
+
+# Sign handshape and movement data, parsed (or read from the cache) by this process
+def _own_sign_frame(columns, categorical, chunksize):
+	return memoized(
+		("signData", columns, categorical),
+		lambda: load_sign_data(SIGNDATA_PATH, columns=columns, categorical=categorical,
+		                       chunksize=chunksize),
+	)
+
+
+# Sign handshape and movement data
+# view / columns pick a projection (see schema.VIEWS), categorical stores codes as Category
+# chunksize streams a cold load through the cache (the result is the same frame)
+# In a worker started for publish_sign_frame(), the published dataset is attached instead
+def get_sign_frame(view=None, columns=None, categorical=False, chunksize=None):
+	columns = schema.resolve_columns(view, columns)
+	directory = shared.attached_directory()
+	if directory is not None:
+		return memoized(
+			("sharedSignData", str(directory), columns, categorical),
+			lambda: _attach_sign_frame(directory, columns, categorical),
+		)
+	return _own_sign_frame(columns, categorical, chunksize)
+
+
+# Attach to a published dataset, refusing one loaded narrower than asked for:
+# a projection missing some of columns, or plain string codes when
+# categorical (shared-vocabulary) columns are wanted
+def _attach_sign_frame(directory, columns, categorical):
+	published = shared.read_meta(directory)["settings"]
+	if categorical and not published.get("categorical"):
+		msg = f"{directory} was published without categorical=True"
+		raise ValueError(msg)
+	projection = published.get("columns")
+	if projection is not None:
+		if columns is None:
+			msg = f"{directory} was published with a projection, not every column"
+			raise ValueError(msg)
+		missing = sorted(set(columns) - set(projection))
+		if missing:
+			msg = f"{directory} was published without {', '.join(missing)}"
+			raise ValueError(msg)
+	return shared.attach(directory, schema.projection(columns), SIGNDATA_PATH)
+
+
+# Publish the sign data once as memory-mapped column files for worker processes
+# Start the workers with shared.worker_env(directory) or the shared.use_in_worker
+# initializer; they then attach to it with get_sign_frame() / get_sign_data()
+# instead of parsing their own copy. This process keeps its own frame
+# The csv's cache key is stored with it, so workers refuse a stale dataset, and so
+# are the view and categorical flag, so workers refuse one narrower than they ask for
+# String columns come back as Category either way
+def publish_sign_frame(directory=SHARED_DIR, view=None, categorical=True):
+	columns = schema.resolve_columns(view)
+	data = _own_sign_frame(columns, categorical, None)
+	if data is None:
+		return None
+	with profiling.stage("shared_publish"):
+		source = shared.source_key(SIGNDATA_PATH, schema.cache_tag(columns, categorical))
+		settings = {"columns": columns and list(columns), "categorical": categorical}
+		return shared.publish(data, directory, source, settings)
+
+
+# Column key for signdata.csv
+def get_sign_key_frame():
+	return memoized("signDataKey", lambda: read_csv(SIGNDATA_KEY_PATH))
+
+
+# `prepareData.signData` and `prepareData.signDataKey` used to be read at import
+# They are still available as attributes, but only load when first accessed
+def __getattr__(name):
+	if name == "signData":
+		return get_sign_frame()
+	if name == "signDataKey":
+		return get_sign_key_frame()
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,201 @@
+"""
+profiling.py
+
+Opt-in timing and memory figures for the sign-data load path.
+
+The load functions mark their stages with ``stage("csv_parse")`` and their
+cache lookups with ``event(...)``; ``tag(...)`` adds details to the open
+stage once they are known (e.g. the csv engine that ran). Outside of
+``profile_load()`` these are no-ops; inside it, every stage is recorded with its wall time, the peak
+Python allocation during the stage (tracemalloc) and the process RSS
+afterwards, and the whole run comes out as one JSON-serializable record:
+
+    with profile_load() as profile:
+        signData = get_sign_data()
+    print(profile.to_json())
+"""
+
+import contextvars
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+_active = contextvars.ContextVar("load_profile", default=None)
+
+_MB = 1024 * 1024
+
+
+def current_rss_bytes():
+    """Resident set size of this process, or None where it is not available."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource  # not available on Windows
+    except ImportError:
+        return None
+    # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+class LoadProfile:
+    """Stages and events recorded while loading sign data."""
+
+    def __init__(self, label="get_sign_data"):
+        self.label = label
+        self.started = datetime.now(timezone.utc)
+        self.stages = []
+        self.events = []
+        self.total_seconds = None
+        self._depth = 0
+        # Details of the open stages, innermost last (see tag)
+        self._open = []
+
+    @contextmanager
+    def stage(self, name, **details):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+
+        self._depth += 1
+        self._open.append(details)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._depth -= 1
+            self._open.pop()
+
+            record = {"stage": name, "seconds": round(seconds, 6), "depth": self._depth}
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                record["peak_alloc_mb"] = round((peak - before) / _MB, 3)
+            rss = current_rss_bytes()
+            if rss is not None:
+                record["rss_mb"] = round(rss / _MB, 3)
+            record.update(details)
+            self.stages.append(record)
+
+    def tag(self, **details):
+        """Add details to the innermost open stage, e.g. once a stage knows how it ran."""
+        if self._open:
+            self._open[-1].update(details)
+
+    def event(self, name, **details):
+        self.events.append({"event": name, **details})
+
+    def as_dict(self):
+        return {
+            "label": self.label,
+            "started": self.started.isoformat(timespec="seconds"),
+            "total_seconds": self.total_seconds,
+            "stages": self.stages,
+            "events": self.events,
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), default=str)
+
+    def append_to(self, path):
+        """Append the record as one JSON line to ``path``."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.to_json() + "\n")
+
+    def report(self, show=True, log_path=None):
+        """Print the summary and/or append the JSON record to a log file."""
+        if show:
+            print(self.summary())
+        if log_path is not None:
+            self.append_to(log_path)
+            print(f"[profile] Appended load profile to {log_path}")
+
+    def summary(self):
+        """Short human-readable table of the stages."""
+        lines = [f"[profile] {self.label}: {self.total_seconds:.3f}s total"]
+        for s in self.stages:
+            mem = f" | peak +{s['peak_alloc_mb']:.1f} MB" if "peak_alloc_mb" in s else ""
+            rss = f" | rss {s['rss_mb']:.0f} MB" if "rss_mb" in s else ""
+            indent = "  " * s["depth"]
+            lines.append(f"[profile]   {indent}{s['stage']:<20} {s['seconds']:.4f}s{mem}{rss}")
+        for e in self.events:
+            details = ", ".join(f"{k}={v}" for k, v in e.items() if k != "event")
+            lines.append(f"[profile]   {e['event']}: {details}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_load(label="get_sign_data", trace_memory=True):
+    """
+    Record every instrumented load stage run inside the block.
+    trace_memory turns on tracemalloc for the duration (slower, but gives
+    per-stage peak allocations).
+    """
+    profile = LoadProfile(label)
+    token = _active.set(profile)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        profile.total_seconds = round(time.perf_counter() - start, 6)
+        if started_tracing:
+            tracemalloc.stop()
+        _active.reset(token)
+
+
+def profile_if(enabled, label="get_sign_data"):
+    """profile_load() when enabled, otherwise a block that yields None."""
+    return profile_load(label) if enabled else nullcontext(None)
+
+
+def run_profiled(load, show=False, log_path=None, label="get_sign_data"):
+    """
+    Return load(), profiled when show or log_path is set: the summary is
+    printed (show) and/or appended as a JSON line to log_path.
+
+        signData = run_profiled(lambda: get_sign_data(view=view), show=args.profile)
+    """
+    with profile_if(show or log_path, label) as profile:
+        result = load()
+    if profile is not None:
+        profile.report(show=show, log_path=log_path)
+    return result
+
+
+@contextmanager
+def stage(name, **details):
+    """Time a load stage if a profile is active; otherwise do nothing."""
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+    with profile.stage(name, **details):
+        yield
+
+
+def tag(**details):
+    """Add details to the innermost open stage if a profile is active."""
+    profile = _active.get()
+    if profile is not None:
+        profile.tag(**details)
+
+
+def event(name, **details):
+    """Record an event (e.g. a cache hit) if a profile is active."""
+    profile = _active.get()
+    if profile is not None:
+        profile.event(name, **details)
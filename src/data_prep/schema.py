@@ -0,0 +1,199 @@
+"""
+schema.py
+
+Column layout of signdata.csv and the load options built on it:
+
+- canonical attributes and the versioned columns they are resolved from
+- named column projections ("views") so consumers only read what they use
+- low-cardinality string columns stored as pandas Category, with one
+  vocabulary per attribute persisted next to the cache so category codes
+  stay the same across runs, views and cache entries
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+# Attributes resolved from their versioned columns into one canonical column
+CANONICAL_ATTRIBUTES = ["Movement", "MajorLocation", "MinorLocation", "Handshape"]
+
+# Named projections. Each view lists the columns it needs on top of the
+# canonical attributes (and the versioned columns they are built from);
+# None means every column.
+VIEWS = {
+    "full": None,
+    "canonical": ["LemmaID"],
+}
+
+# A string column becomes a Category when it has at most this many distinct
+# values and they make up at most this share of the rows
+CATEGORY_MAX_UNIQUE = 512
+CATEGORY_MAX_RATIO = 0.5
+
+VOCABULARY_NAME = "vocabulary.json"
+
+
+def canonical_candidates(prefix):
+    """Versioned column names for an attribute, in lookup order."""
+    return [f"{prefix}.2.0"] + [f"{prefix}M{i}.2.0" for i in range(2, 7)]
+
+
+# column name -> attribute it belongs to, for every versioned column
+_ATTRIBUTE_OF = {
+    candidate: attr
+    for attr in CANONICAL_ATTRIBUTES
+    for candidate in canonical_candidates(attr)
+}
+
+
+def resolve_columns(view=None, columns=None):
+    """
+    Turn a view name and/or explicit column list into the projected columns.
+
+    Returns a sorted tuple, or None when every column is wanted.
+    """
+    if view is not None and view not in VIEWS:
+        msg = f"Unknown view {view!r}, expected one of {sorted(VIEWS)}"
+        raise ValueError(msg)
+
+    view_columns = VIEWS.get(view)
+    if view_columns is None and columns is None:
+        return None
+
+    wanted = set(view_columns or []) | set(columns or [])
+    return tuple(sorted(wanted))
+
+
+def projection(columns):
+    """
+    usecols callable for read_csv that keeps ``columns`` plus everything the
+    canonical attributes are resolved from. None keeps every column.
+    """
+    if columns is None:
+        return None
+
+    keep = set(columns) | set(CANONICAL_ATTRIBUTES) | set(_ATTRIBUTE_OF)
+    return lambda name: name in keep
+
+
+def cache_tag(columns=None, categorical=False):
+    """Cache entry name for a projection / dtype variant of the data."""
+    tag = "canonical"
+    if categorical:
+        tag += "-cat"
+    if columns is not None:
+        digest = hashlib.blake2b("\0".join(columns).encode(), digest_size=6)
+        tag += "-" + digest.hexdigest()
+    return tag
+
+
+def vocabulary_key(column):
+    """Versioned columns share their attribute's vocabulary."""
+    return _ATTRIBUTE_OF.get(column, column)
+
+
+def _is_string_column(series):
+    return series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+
+
+def low_cardinality_columns(df):
+    """
+    String columns worth storing as Category. The canonical attributes and
+    their versioned columns always are; other columns are judged on their
+    number of distinct values.
+    """
+    n_rows = max(len(df), 1)
+    found = []
+    for col in df.columns:
+        series = df[col]
+        if not _is_string_column(series):
+            continue
+        if vocabulary_key(col) in CANONICAL_ATTRIBUTES:
+            found.append(col)
+            continue
+        n_unique = series.nunique(dropna=True)
+        if n_unique <= CATEGORY_MAX_UNIQUE and n_unique / n_rows <= CATEGORY_MAX_RATIO:
+            found.append(col)
+    return found
+
+
+def load_vocabulary(cache_dir):
+    """
+    Read the persisted vocabulary:
+    {"columns": {column: key}, "categories": {key: [values...]}}
+    """
+    try:
+        with open(Path(cache_dir) / VOCABULARY_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"columns": {}, "categories": {}}
+
+
+def save_vocabulary(cache_dir, vocabulary):
+    path = Path(cache_dir) / VOCABULARY_NAME
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(vocabulary, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[schema] Could not save vocabulary to {path}: {e}")
+
+
+def read_dtypes(cache_dir):
+    """
+    dtype mapping for read_csv: columns already known to be categorical are
+    parsed straight into Category instead of object strings.
+    """
+    vocabulary = load_vocabulary(cache_dir)
+    return {col: "category" for col in vocabulary["columns"]}
+
+
+def apply_vocabulary(df, cache_dir):
+    """
+    Store low-cardinality string columns as Category using the shared,
+    persisted vocabulary. New values are appended to the vocabulary, so the
+    codes of values seen before never change.
+    """
+    vocabulary = load_vocabulary(cache_dir)
+    known = vocabulary["columns"]
+    categories = vocabulary["categories"]
+
+    columns = [
+        c for c in df.columns
+        if c in known or isinstance(df[c].dtype, pd.CategoricalDtype)
+    ]
+    columns += [c for c in low_cardinality_columns(df) if c not in columns]
+
+    changed = False
+    converted = {}
+    for col in columns:
+        key = known.get(col) or vocabulary_key(col)
+        if col not in known:
+            known[col] = key
+            changed = True
+
+        # Vocabulary values are kept as strings so they round-trip through json
+        values = df[col]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.map(str, na_action="ignore").astype("category")
+
+        vocab = categories.setdefault(key, [])
+        new = sorted(set(map(str, values.cat.categories)) - set(vocab))
+        if new:
+            vocab.extend(new)
+            changed = True
+
+        converted[col] = values.cat.set_categories(vocab)
+
+    if changed:
+        save_vocabulary(cache_dir, vocabulary)
+
+    if not converted:
+        return df
+    return df.assign(**converted)
+
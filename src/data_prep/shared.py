@@ -0,0 +1,205 @@
+"""
+shared.py
+
+Read-only sign dataset shared between processes through memory-mapped
+NumPy files.
+
+``publish`` writes a frame once as one ``.npy`` file per column; string and
+Category columns are stored as integer codes with their categories in
+``meta.json``. ``attach`` maps the files back read-only and wraps them in a
+DataFrame without copying, so every process attached to the same directory
+reads the same pages from the OS page cache: memory grows with the size of
+the dataset, not with the number of workers.
+
+Worker processes find the published directory through the
+``ASL_SHARED_DATA`` environment variable. Only the workers get it, so the
+publishing process keeps its own frame:
+
+    directory = publish_sign_frame()      # in the parent, see prepareData
+    subprocess.run(cmd, env=worker_env(directory))
+    ProcessPoolExecutor(initializer=use_in_worker, initargs=(directory,))
+    # get_sign_data() in a worker now attaches to it
+
+``meta.json`` records the cache key of the csv the frame was parsed from
+(its size, mtime and content digest, and the cache tag); ``attach`` given
+that csv refuses a dataset published from an older version of it.
+
+Attached frames are read-only: writing to one of their columns raises.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_prep import cache
+
+SHARED_ENV = "ASL_SHARED_DATA"
+
+SHARED_VERSION = 1
+
+META_NAME = "meta.json"
+
+
+def attached_directory():
+    """The published dataset this process should attach to, if any."""
+    directory = os.environ.get(SHARED_ENV)
+    return Path(directory) if directory else None
+
+
+def worker_env(directory, env=None):
+    """Copy of env (default os.environ) pointing a child process at a published dataset."""
+    return {**(os.environ if env is None else env), SHARED_ENV: str(directory)}
+
+
+def use_in_worker(directory):
+    """Pool initializer: attach this worker process to a published dataset."""
+    os.environ[SHARED_ENV] = str(directory)
+
+
+def source_key(source_path, tag):
+    """Cache key of the csv a published frame was parsed from."""
+    return {"path": str(source_path), "tag": tag, **cache.source_fingerprint(source_path)}
+
+
+def is_stale(key, source_path):
+    """True if source_path no longer matches the source key stored at publish time."""
+    stat = cache.file_stat(source_path)
+    if stat["size"] != key["size"]:
+        return True
+    if stat["mtime_ns"] == key["mtime_ns"]:
+        return False
+    # The mtime moved; only a content change makes the dataset stale
+    return cache.file_digest(source_path) != key["digest"]
+
+
+def _json_value(value):
+    # numpy scalars -> python; anything json cannot hold becomes a string
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _write_column(series, path):
+    """Save one column; return its meta entry."""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        np.save(path, series.to_numpy())
+        return {"kind": "array"}
+
+    if not isinstance(dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    np.save(path, series.cat.codes.to_numpy())
+    return {
+        "kind": "categorical",
+        "categories": [_json_value(v) for v in series.cat.categories],
+        "ordered": bool(series.cat.ordered),
+    }
+
+
+def _read_column(entry, directory):
+    # Plain ndarray view of the read-only mapping (pandas does not need memmap)
+    values = np.load(Path(directory) / entry["file"], mmap_mode="r").view(np.ndarray)
+    if entry["kind"] == "array":
+        return values
+    dtype = pd.CategoricalDtype(entry["categories"], ordered=entry["ordered"])
+    return pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+
+
+def publish(frame, directory, source=None, settings=None):
+    """
+    Write ``frame`` as a shared dataset in ``directory`` (replacing any
+    earlier one) and return the directory.
+
+    source   : source_key() of the csv the frame was parsed from, if any
+    settings : JSON-serializable dict of how the frame was loaded (e.g. its
+               projection), kept in the meta for attaching processes to check
+    """
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=directory.name + ".", dir=directory.parent))
+
+    try:
+        columns = []
+        for i, name in enumerate(frame.columns):
+            file = f"col-{i:05d}.npy"
+            entry = _write_column(frame.iloc[:, i], staging / file)
+            columns.append({"name": name, "file": file, **entry})
+
+        index = None
+        if not frame.index.equals(pd.RangeIndex(len(frame))):
+            index = {"name": frame.index.name, "file": "index.npy",
+                     **_write_column(frame.index.to_series(), staging / "index.npy")}
+
+        with open(staging / META_NAME, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": SHARED_VERSION,
+                "rows": len(frame),
+                "columns": columns,
+                "index": index,
+                "source": source,
+                "settings": settings or {},
+            }, f)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(staging, directory)
+        return directory
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def read_meta(directory):
+    """The meta of a published dataset; ValueError if another version wrote it."""
+    directory = Path(directory)
+    with open(directory / META_NAME, encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != SHARED_VERSION:
+        msg = f"{directory} was published by an incompatible version"
+        raise ValueError(msg)
+    return meta
+
+
+def attach(directory, columns=None, source_path=None):
+    """
+    Map a published dataset read-only, without copying it.
+
+    columns     : list of column names to keep (ValueError if one of them was
+                  not published), or a usecols-style callable (see
+                  schema.projection) choosing among the published columns;
+                  None keeps every column
+    source_path : csv the dataset should have been published from; raises
+                  ValueError if it changed since (not checked when the file
+                  is not there or the dataset has no source key)
+    """
+    directory = Path(directory)
+    meta = read_meta(directory)
+    key = meta.get("source")
+    if key is not None and source_path is not None and Path(source_path).exists():
+        if is_stale(key, source_path):
+            msg = f"{directory} was published from an older {Path(source_path).name}; publish it again"
+            raise ValueError(msg)
+
+    entries = meta["columns"]
+    if callable(columns):
+        entries = [e for e in entries if columns(e["name"])]
+    elif columns is not None:
+        published = {e["name"] for e in entries}
+        missing = [name for name in columns if name not in published]
+        if missing:
+            msg = f"{directory} has no column {', '.join(map(repr, missing))}"
+            raise ValueError(msg)
+        wanted = set(columns)
+        entries = [e for e in entries if e["name"] in wanted]
+
+    index = pd.RangeIndex(meta["rows"])
+    if meta["index"] is not None:
+        index = pd.Index(_read_column(meta["index"], directory), name=meta["index"]["name"])
+
+    data = {e["name"]: _read_column(e, directory) for e in entries}
+    return pd.DataFrame(data, index=index, copy=False)
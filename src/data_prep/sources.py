@@ -0,0 +1,176 @@
+"""
+sources.py
+
+Optional ASL-LEX tables that can be joined onto signdata.csv by LemmaID:
+
+- frequency    : Frequency/ASLLEXR.csv          (one row per sign)
+- iconicity    : Iconicity/IconicityTrial.csv   (one row per trial)
+- iconicity_d  : Iconicity/IconD_trial.csv      (one row per trial)
+
+Phonology/NeigborPairs.csv is not a source: it has one row per pair of
+signs, not per sign, so neither join applies. The neighbor count per sign
+comes from sign_data.neighbors.neighborhood_density instead.
+
+Nothing is read unless a source is asked for. Trial-level tables are
+aggregated per sign (mean of every numeric column plus a row count) with a
+single groupby, and each aggregated table is cached next to signdata's
+cache, as are the joined columns, so the trial files are only parsed
+and aggregated again when they change. A warm call hashes the sign ids
+and, when a source file's size or mtime moved, that file.
+"""
+
+import hashlib
+from dataclasses import dataclass
+
+import pandas as pd
+
+from data_prep import cache, profiling
+from data_prep.prepareData import CACHE_DIR, DATA_DIR, memoized, read_csv
+
+
+@dataclass(frozen=True)
+class Source:
+    # Path relative to the Data directory
+    path: str
+    # Column holding the sign id the table is joined on
+    key: str = "LemmaID"
+    # True for tables with several rows per sign that must be aggregated
+    trials: bool = False
+
+
+SOURCES = {
+    "frequency": Source("Frequency/ASLLEXR.csv"),
+    "iconicity": Source("Iconicity/IconicityTrial.csv", trials=True),
+    "iconicity_d": Source("Iconicity/IconD_trial.csv", trials=True),
+}
+
+
+def _source(name):
+    if name not in SOURCES:
+        msg = f"Unknown source {name!r}, expected one of {sorted(SOURCES)}"
+        raise ValueError(msg)
+    return SOURCES[name]
+
+
+def aggregate_trials(table, key, prefix):
+    """
+    One row per sign: the mean of every numeric column and the number of
+    rows, computed with one vectorized groupby. Indexed by ``key``.
+    """
+    table = table.dropna(subset=[key])
+    numeric = [c for c in table.select_dtypes(include="number").columns if c != key]
+
+    grouped = table.groupby(key, sort=False)
+    aggregated = grouped[numeric].mean()
+    aggregated.columns = [f"{prefix}_{col}_mean" for col in numeric]
+    aggregated[f"{prefix}_n"] = grouped.size()
+    return aggregated
+
+
+def per_sign(table, key, prefix):
+    """Tables that already have one row per sign: first row wins, prefixed."""
+    table = table.dropna(subset=[key]).drop_duplicates(subset=[key])
+    table = table.set_index(key)
+    table.columns = [f"{prefix}_{col}" for col in table.columns]
+    return table
+
+
+def load_source(name, data_dir=DATA_DIR, cache_dir=CACHE_DIR, use_cache=True):
+    """
+    Per-sign table for an optional source, indexed by the sign id.
+    Returns None if the file is missing or unreadable.
+    """
+    source = _source(name)
+    path = data_dir / source.path
+    if not path.exists():
+        print(f"[sources] {name}: {path} not found")
+        return None
+
+    if use_cache:
+        cached = cache.load(path, cache_dir, "per-sign")
+        if cached is not None:
+            return cached.set_index(source.key)
+
+    table = read_csv(path)
+    if table is None:
+        return None
+    if source.key not in table.columns:
+        print(f"[sources] {name}: no {source.key} column in {path}, skipping")
+        return None
+
+    if source.trials:
+        table = aggregate_trials(table, source.key, name)
+    else:
+        table = per_sign(table, source.key, name)
+
+    if use_cache:
+        cache.store(table.reset_index(), path, cache_dir, "per-sign")
+    return table
+
+
+def join_sources(frame, tables, key="LemmaID"):
+    """
+    Left-join per-sign tables onto ``frame``. Each table is indexed by the
+    sign id, so every join is a hash lookup of frame[key] in that index.
+    """
+    for table in tables:
+        frame = frame.join(table, on=key)
+    return frame
+
+
+def merged_name(names):
+    """Cache name of the joined columns of a set of sources."""
+    return "merged-" + "+".join(sorted(names))
+
+
+def merged_digest(frame, names, data_dir=DATA_DIR, cache_dir=CACHE_DIR, key="LemmaID"):
+    """
+    Cache key of the joined columns: the sign ids of ``frame``, in order
+    (nothing else of the frame goes into the join), and every source file.
+    Source files are only re-hashed when their size or mtime changed
+    (see cache.known_digest).
+    """
+    h = hashlib.blake2b(digest_size=12)
+    h.update(cache.frame_digest(frame, [key]).encode())
+    for name in names:
+        path = data_dir / _source(name).path
+        h.update(name.encode())
+        h.update(cache.known_digest(path, cache_dir).encode() if path.exists() else b"-")
+    return h.hexdigest()
+
+
+def with_sources(frame, names, data_dir=DATA_DIR, cache_dir=CACHE_DIR,
+                 use_cache=True, key="LemmaID"):
+    """
+    ``frame`` with the requested optional sources joined on. The joined
+    columns are cached per set of sources under merged_digest; writing a
+    new entry removes the one it replaces.
+    """
+    names = sorted(set(names))
+    if not names:
+        return frame
+
+    joined = None
+    if use_cache:
+        with profiling.stage("sources_cache_lookup"):
+            digest = merged_digest(frame, names, data_dir, cache_dir, key)
+            joined = cache.load_derived(cache_dir, merged_name(names), digest)
+        profiling.event("cache", tag="merged", hit=joined is not None)
+
+    if joined is None:
+        tables = []
+        for name in names:
+            with profiling.stage("source_load", source=name):
+                table = memoized(("source", name, str(data_dir)), lambda name=name: load_source(
+                    name, data_dir, cache_dir, use_cache
+                ))
+            if table is not None:
+                tables.append(table)
+
+        with profiling.stage("sources_join"):
+            joined = join_sources(frame[[key]], tables, key).drop(columns=key)
+            joined = joined.reset_index(drop=True)
+        if use_cache:
+            cache.store_derived(joined, cache_dir, merged_name(names), digest, replace=True)
+
+    return pd.concat([frame, joined.set_axis(frame.index)], axis=1)
@@ -4,22 +4,190 @@ ml_runner.py
 runs the ml models to on the parsed data
 """
 
+import argparse
 import sys
 from pathlib import Path
+from data_prep.profiling import run_profiled
+from data_prep.schema import VIEWS
+from data_prep.sources import SOURCES
 from sign_data import get_sign_data
+from ml_scripts.comparison import compare_engines
+from ml_scripts.config import (
+    ARTIFACT_FORMATS,
+    DEFAULT_ARTIFACT_FORMAT,
+    DEFAULT_ENGINE,
+    DEFAULT_MAX_CATEGORIES,
+    DEFAULT_SEARCH_BUDGET,
+    ENGINES,
+)
+from ml_scripts.features import feature_report
+from ml_scripts.search import search_all_targets
 from ml_scripts.training import train_all_targets
 
 
-def main():
-    signData = get_sign_data()
-    results = train_all_targets(signData, models_dir=Path("models"))
+def main(view=None, categorical=False, sources=(), profile=False, profile_log=None, n_jobs=1,
+         max_categories=DEFAULT_MAX_CATEGORIES, report_features=False, engine=DEFAULT_ENGINE,
+         compare=False, artifact_format=DEFAULT_ARTIFACT_FORMAT, force=False, cv=None,
+         cv_repeats=1, search=False, search_budget=DEFAULT_SEARCH_BUDGET):
+    # Optional ASL-LEX tables (frequency, iconicity, ...) become extra features
+    signData = run_profiled(
+        lambda: get_sign_data(view=view, categorical=categorical, sources=sources),
+        show=profile, log_path=profile_log,
+    )
+
+    # Compare models with and without feature pruning instead of training
+    if report_features:
+        feature_report(signData, max_categories=max_categories)
+        return
+    # Train every engine on every target and compare them instead of training
+    if compare:
+        compare_engines(signData, max_categories=max_categories)
+        return
+    # Search for the Pareto-optimal model settings of every target instead of training
+    if search:
+        search_all_targets(signData, budget_seconds=search_budget,
+                           max_categories=max_categories, n_jobs=n_jobs)
+        return
+
+    # n_jobs cores are shared between targets trained at once and their trees
+    # Targets unchanged since their saved model was trained are skipped unless force
+    # With cv the targets are cross-validated instead, n_jobs folds at once
+    results = train_all_targets(
+        signData, models_dir=Path("models"), n_jobs=n_jobs, max_categories=max_categories,
+        engine=engine, artifact_format=artifact_format, force=force, cv=cv,
+        cv_repeats=cv_repeats,
+    )
 
     print("\n=== ML Training Summary ===")
     for r in results:
-        if r.get("status") == "ok":
-            print(f"{r['target']:20s} | acc={r['acc']:.3f} | f1={r['f1_macro']:.3f} | {r['path']}")
+        if r.get("status") == "ok" and "acc_std" in r:
+            print(f"{r['target']:20s} | acc={r['acc']:.3f}±{r['acc_std']:.3f} | "
+                  f"f1={r['f1_macro']:.3f}±{r['f1_std']:.3f} | {r['folds']} folds, "
+                  f"{sum(r['fold_seconds']):.1f}s")
+        elif r.get("status") == "ok":
+            cached = " (cached)" if r.get("cached") else ""
+            print(f"{r['target']:20s} | acc={r['acc']:.3f} | f1={r['f1_macro']:.3f} | {r['path']}{cached}")
         else:
             print(f"{r['target']:20s} | SKIP ({r.get('reason', 'no reason given')})")
 
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train tabular models on the ASL sign data.")
+    parser.add_argument(
+        "--view",
+        choices=sorted(VIEWS),
+        default=None,
+        help="Only load this projection of the columns (default: all columns).",
+    )
+    parser.add_argument(
+        "--categorical",
+        action="store_true",
+        help="Load low-cardinality string columns as pandas Category.",
+    )
+    parser.add_argument(
+        "--sources",
+        nargs="+",
+        choices=sorted(SOURCES),
+        default=(),
+        help="Optional ASL-LEX tables to join on by LemmaID as extra features.",
+    )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=1,
+        help="Cores to train with, split between targets and trees (-1 = all cores).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default=DEFAULT_ENGINE,
+        help="Model to train: rf (RandomForest, one-hot features) or hgb "
+             "(histogram gradient boosting, native categories).",
+    )
+    parser.add_argument(
+        "--compare-engines",
+        action="store_true",
+        help="Compare fit time, predict latency, size, accuracy and F1 of every engine.",
+    )
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="Search model settings by successive halving and print the Pareto-optimal "
+             "ones (F1, predict latency, model size) per target.",
+    )
+    parser.add_argument(
+        "--search-budget",
+        type=float,
+        default=DEFAULT_SEARCH_BUDGET,
+        metavar="SECONDS",
+        help=f"Wall-clock budget of --search over all targets (default {DEFAULT_SEARCH_BUDGET:.0f}).",
+    )
+    parser.add_argument(
+        "--cv",
+        type=int,
+        default=None,
+        metavar="K",
+        help="Cross-validate each target on K stratified folds instead of training it.",
+    )
+    parser.add_argument(
+        "--cv-repeats",
+        type=int,
+        default=1,
+        help="Repeat the K folds with different shuffles (repeated k-fold).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Retrain every target, even those unchanged since their saved model.",
+    )
+    parser.add_argument(
+        "--artifact-format",
+        choices=ARTIFACT_FORMATS,
+        default=DEFAULT_ARTIFACT_FORMAT,
+        help="How model files are written: plain pickle, compressed, or memory-mappable.",
+    )
+    parser.add_argument(
+        "--max-categories",
+        type=int,
+        default=DEFAULT_MAX_CATEGORIES,
+        help="Drop string feature columns with more distinct values than this.",
+    )
+    parser.add_argument(
+        "--feature-report",
+        action="store_true",
+        help="Compare width, fit time and size of models with and without feature pruning.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-stage load timings and memory (see data_prep.profiling).",
+    )
+    parser.add_argument(
+        "--profile-log",
+        default=None,
+        metavar="PATH",
+        help="Append the load profile as one JSON line to PATH.",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(
+        view=args.view,
+        categorical=args.categorical,
+        sources=args.sources,
+        n_jobs=args.n_jobs,
+        max_categories=args.max_categories,
+        report_features=args.feature_report,
+        engine=args.engine,
+        compare=args.compare_engines,
+        artifact_format=args.artifact_format,
+        force=args.force,
+        cv=args.cv,
+        cv_repeats=args.cv_repeats,
+        search=args.search,
+        search_budget=args.search_budget,
+        profile=args.profile,
+        profile_log=args.profile_log,
+    )
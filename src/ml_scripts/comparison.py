@@ -0,0 +1,116 @@
+"""
+comparison.py
+
+Compare the model engines (config.ENGINES) target by target.
+
+Every engine is trained on the same pruned features, the same train/test
+split and the same balanced class weights as in training.py, and measured
+on:
+
+- fit time of the whole pipeline (preprocessing included)
+- predict latency: one row at a time (median of repeats, what a caller
+  asking about a single sign waits) and per row over the whole test set
+- saved model size
+- accuracy and macro F1 on the test set
+"""
+
+import time
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from ml_scripts import model_pipeline
+from ml_scripts.config import DEFAULT_MAX_CATEGORIES, DEFAULT_TARGETS, ENGINES
+from ml_scripts.data_checker import validate_target_column
+from ml_scripts.features import feature_columns, prune_features
+
+# Single-row predictions timed per model
+LATENCY_REPEATS = 20
+
+
+def predict_latency_ms(pipe, X_test):
+    """(median single-row predict time, batch predict time per row), in ms."""
+    row = X_test.head(1)
+    times = []
+    for _ in range(LATENCY_REPEATS):
+        start = time.perf_counter()
+        pipe.predict(row)
+        times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pipe.predict(X_test)
+    batch = (time.perf_counter() - start) / len(X_test)
+    return float(np.median(times)) * 1e3, batch * 1e3
+
+
+def engine_stats(X_train, X_test, y_train, y_test, engine, class_weight=None, n_jobs=None):
+    """Fit one engine on a split and measure it (see the module docstring)."""
+    pipe = model_pipeline.build_pipeline(X_train, class_weight=class_weight,
+                                         n_jobs=n_jobs, engine=engine)
+    with threadpool_limits(limits=n_jobs or 1, user_api="openmp"):
+        start = time.perf_counter()
+        model_pipeline.fit_model(pipe, X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+
+        row_ms, batch_ms = predict_latency_ms(pipe, X_test)
+        metrics = model_pipeline.evaluate_model(pipe, X_test, y_test)
+
+    return {
+        "fit_seconds": fit_seconds,
+        "predict_row_ms": row_ms,
+        "predict_batch_ms": batch_ms,
+        "model_mb": model_pipeline.model_size_bytes(pipe) / 2**20,
+        "accuracy": metrics["accuracy"],
+        "f1_macro": metrics["f1_macro"],
+    }
+
+
+def compare_engines(signData, targets=None, engines=ENGINES,
+                    max_categories=DEFAULT_MAX_CATEGORIES, n_jobs=None):
+    """
+    Train every engine on every target and print the results side by side.
+    Returns one dict per target: {"target", "status", <engine>: stats, ...}.
+    """
+    if targets is None:
+        targets = DEFAULT_TARGETS
+    for engine in engines:
+        model_pipeline.check_engine(engine)
+
+    columns, _ = prune_features(signData, targets, max_categories)
+
+    results = []
+    for target_col in targets:
+        valid, msg = validate_target_column(signData, target_col)
+        if not valid:
+            print(f"[SKIP] {msg}")
+            results.append({"target": target_col, "status": "skip", "reason": msg})
+            continue
+
+        data = signData.dropna(subset=[target_col])
+        X = data[feature_columns(columns, target_col)]
+        y = data[target_col]
+        X_train, X_test, y_train, y_test = model_pipeline.train_test_split_data(X, y)
+        class_weight = model_pipeline.balanced_class_weights(y)
+
+        result = {"target": target_col, "status": "ok"}
+        for engine in engines:
+            print(f"[INFO] Fitting {engine} for {target_col} on {len(X_train)} rows...")
+            result[engine] = engine_stats(X_train, X_test, y_train, y_test, engine,
+                                          class_weight=class_weight, n_jobs=n_jobs)
+        results.append(result)
+
+    print("\n=== Engine Comparison ===")
+    print(f"{'target':<16} | {'engine':<6} | {'fit':>8} | {'1 row':>9} | {'per row':>9} | "
+          f"{'size':>9} | {'acc':>5} | {'f1':>5}")
+    for r in results:
+        if r["status"] != "ok":
+            print(f"{r['target']:<16} | SKIP ({r['reason']})")
+            continue
+        for engine in engines:
+            s = r[engine]
+            print(
+                f"{r['target']:<16} | {engine:<6} | {s['fit_seconds']:7.2f}s | "
+                f"{s['predict_row_ms']:7.2f}ms | {s['predict_batch_ms']:7.4f}ms | "
+                f"{s['model_mb']:7.2f}MB | {s['accuracy']:.3f} | {s['f1_macro']:.3f}"
+            )
+    return results
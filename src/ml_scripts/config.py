@@ -16,5 +16,43 @@ DEFAULT_TARGETS: List[str] = [
 ]
 
 
+# Model engines (see model_pipeline.build_model):
+# "rf"  = RandomForest on one-hot encoded features
+# "hgb" = HistGradientBoosting on integer-coded categories, no one-hot expansion
+ENGINES: List[str] = ["rf", "hgb"]
+DEFAULT_ENGINE: str = "rf"
+
+
+# Feature pruning (see features.py): string columns with more distinct
+# values than this are not one-hot encoded
+DEFAULT_MAX_CATEGORIES: int = 50
+
+# Columns that identify a sign rather than describe it
+ID_COLUMNS: List[str] = ["LemmaID", "EntryID", "Code"]
+
+
 # Default directory where models are stored
 DEFAULT_MODELS_DIR: Path = Path("models")
+
+# How save_model writes a model (see artifacts.py): "pickle" (plain),
+# "compressed" (smaller file, slower load) or "mmap" (arrays mapped on load)
+ARTIFACT_FORMATS: List[str] = ["pickle", "compressed", "mmap"]
+DEFAULT_ARTIFACT_FORMAT: str = "pickle"
+
+# Memory the loaded models of a ModelRegistry may take before the least
+# recently used ones are dropped (see registry.py)
+DEFAULT_MODEL_MEMORY_BUDGET: int = 2 * 1024**3
+
+# Rows predicted at a time by inference.py
+DEFAULT_PREDICT_CHUNKSIZE: int = 50_000
+
+# Random splits (and bootstrap resamples) the null baselines are computed over (see null.py)
+DEFAULT_NULL_RESAMPLES: int = 2000
+
+# Wall-clock seconds a hyperparameter search may take over all targets (see search.py)
+DEFAULT_SEARCH_BUDGET: float = 600.0
+
+
+# Cores used by train_all_targets: 1 trains targets one after another,
+# -1 uses every core (split between targets and trees, see training.py)
+DEFAULT_N_JOBS: int = 1
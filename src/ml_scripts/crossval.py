@@ -0,0 +1,190 @@
+"""
+crossval.py
+
+Stratified (repeated) k-fold cross-validation of one target.
+
+A single 80/20 split gives one noisy accuracy / F1 figure; here every
+fold is a train/test split of its own and the figures come back as a
+mean and standard deviation over the folds, with each fold's wall time.
+
+Several model variants can be scored on the same folds. Within a fold,
+the preprocessor an engine needs is fitted once on the fold's training
+rows, and the encoded train and test matrices are reused by every
+variant of that engine. Folds run in parallel with n_jobs.
+
+    variants = {"rf": model_variant("rf"), "hgb": model_variant("hgb")}
+    result = cross_validate(X, y, variants, n_splits=5, n_repeats=2)
+    result["rf"]["f1_mean"], result["rf"]["f1_std"]
+"""
+
+import time
+import warnings
+from functools import partial
+
+import numpy as np
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.dummy import DummyClassifier
+from sklearn.model_selection import RepeatedKFold, RepeatedStratifiedKFold
+from threadpoolctl import threadpool_limits
+
+from ml_scripts import model_pipeline
+from ml_scripts.processor import categorical_mask
+
+DEFAULT_FOLDS = 5
+
+
+def cv_splits(y, n_splits=DEFAULT_FOLDS, n_repeats=1, random_state=42):
+    """
+    (train rows, test rows) of each fold, stratified by y. Classes with
+    fewer than n_splits samples are missing from some folds' test rows;
+    folds are only unstratified when no class has n_splits samples.
+    """
+    counts = y.value_counts()
+    counts = counts[counts > 0]
+    if counts.max() < n_splits:
+        # Same fallback as get_stratify_arg for a single split
+        print(f"[WARN] Not stratifying folds because no class has {n_splits} samples")
+        splitter = RepeatedKFold(n_splits=n_splits, n_repeats=n_repeats,
+                                 random_state=random_state)
+        return list(splitter.split(np.zeros(len(y)), y))
+
+    if counts.min() < n_splits:
+        rare = ", ".join(str(c) for c in counts.index[counts < n_splits])
+        print(f"[WARN] Classes with <{n_splits} samples are not in every fold: {rare}")
+    splitter = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats,
+                                       random_state=random_state)
+    with warnings.catch_warnings():
+        # Reported above
+        warnings.filterwarnings("ignore", message="The least populated class", category=UserWarning)
+        return list(splitter.split(np.zeros(len(y)), y))
+
+
+def model_variant(engine, **params):
+    """
+    A variant scored by cross_validate: engine plus a function building its
+    unfitted model from the fold's class weights and categorical mask.
+    Extra params are set on the model.
+    """
+    return engine, partial(_build_variant, engine=engine, params=params)
+
+
+def _build_variant(class_weight, categorical_features, engine, params):
+    model = model_pipeline.build_model(class_weight=class_weight, engine=engine,
+                                       categorical_features=categorical_features)
+    return model.set_params(**params)
+
+
+def _majority(class_weight, categorical_features):
+    return DummyClassifier(strategy="most_frequent")
+
+
+def _stratified(class_weight, categorical_features):
+    return DummyClassifier(strategy="stratified", random_state=42)
+
+
+# Null baselines: they ignore the features, so nothing is encoded (engine None)
+NULL_VARIANTS = {
+    "majority": (None, _majority),
+    "stratified": (None, _stratified),
+}
+
+
+def encode_split(X_train, X_test, engine):
+    """
+    Fit the engine's preprocessor on the training rows and encode both sides.
+    Returns (fitted preprocessor, train matrix, test matrix, categorical mask
+    for "hgb" or None).
+    """
+    preprocessor = model_pipeline.build_preprocessor_for(X_train, engine)
+    train = preprocessor.fit_transform(X_train)
+    test = preprocessor.transform(X_test)
+    if engine == "hgb":
+        # Gradient boosting takes dense input
+        train = train.toarray() if sparse.issparse(train) else train
+        test = test.toarray() if sparse.issparse(test) else test
+    categorical = list(categorical_mask(preprocessor)) if engine == "hgb" else None
+    return preprocessor, train, test, categorical
+
+
+def _run_fold(X, y, train_rows, test_rows, variants, threads):
+    """Score every variant on one fold. Returns per-variant metrics and timings."""
+    start = time.perf_counter()
+    X_train, X_test = X.iloc[train_rows], X.iloc[test_rows]
+    y_train, y_test = y.iloc[train_rows], y.iloc[test_rows]
+    class_weight = model_pipeline.balanced_class_weights(y_train)
+
+    encoded = {}
+    encode_seconds = {}
+    scores = {}
+    with threadpool_limits(limits=threads, user_api="openmp"):
+        for name, (engine, build) in variants.items():
+            if engine is None:
+                train, test, categorical = X_train, X_test, None
+            else:
+                # Fitted once per fold and engine, shared by that engine's variants
+                if engine not in encoded:
+                    encode_start = time.perf_counter()
+                    encoded[engine] = encode_split(X_train, X_test, engine)[1:]
+                    encode_seconds[engine] = time.perf_counter() - encode_start
+                train, test, categorical = encoded[engine]
+
+            model = build(class_weight=class_weight, categorical_features=categorical)
+            fit_start = time.perf_counter()
+            model.fit(train, y_train)
+            metrics = model_pipeline.evaluate_model(model, test, y_test)
+            metrics["fit_seconds"] = time.perf_counter() - fit_start
+            scores[name] = metrics
+
+    return {
+        "scores": scores,
+        "encode_seconds": encode_seconds,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def cross_validate(X, y, variants, n_splits=DEFAULT_FOLDS, n_repeats=1, n_jobs=None,
+                   random_state=42):
+    """
+    Score each variant ({name: (engine, build)}, see model_variant and
+    NULL_VARIANTS) on the same n_splits x n_repeats folds of (X, y).
+
+    Returns {name: {"acc_mean", "acc_std", "f1_mean", "f1_std", "accuracy",
+    "f1_macro", "fit_seconds"}} with per-fold lists in the last three, plus
+    "folds" (number of folds), "fold_seconds" (wall time of each fold) and
+    "encode_seconds" (per fold, per engine).
+    """
+    X = X.reset_index(drop=True)
+    y = y.reset_index(drop=True)
+    splits = cv_splits(y, n_splits, n_repeats, random_state)
+
+    # Parallel folds get one boosting thread each, so folds x threads fits the cores
+    parallel = n_jobs is not None and n_jobs != 1
+    threads = 1 if parallel else None
+    if parallel:
+        folds = Parallel(n_jobs=n_jobs)(
+            delayed(_run_fold)(X, y, train_rows, test_rows, variants, threads)
+            for train_rows, test_rows in splits
+        )
+    else:
+        folds = [_run_fold(X, y, train_rows, test_rows, variants, threads)
+                 for train_rows, test_rows in splits]
+
+    result = {
+        "folds": len(folds),
+        "fold_seconds": [f["seconds"] for f in folds],
+        "encode_seconds": [f["encode_seconds"] for f in folds],
+    }
+    for name in variants:
+        acc = np.array([f["scores"][name]["accuracy"] for f in folds])
+        f1 = np.array([f["scores"][name]["f1_macro"] for f in folds])
+        result[name] = {
+            "acc_mean": float(acc.mean()),
+            "acc_std": float(acc.std(ddof=1)) if len(acc) > 1 else 0.0,
+            "f1_mean": float(f1.mean()),
+            "f1_std": float(f1.std(ddof=1)) if len(f1) > 1 else 0.0,
+            "accuracy": acc.tolist(),
+            "f1_macro": f1.tolist(),
+            "fit_seconds": [f["scores"][name]["fit_seconds"] for f in folds],
+        }
+    return result
@@ -0,0 +1,183 @@
+"""
+encoding.py
+
+Shared feature encoding for multi-target training.
+
+Every target is trained on the same wide frame minus its own column, so
+instead of building and fitting a preprocessor per target, the full
+frame is imputed, scaled and one-hot encoded once into a sparse matrix.
+Each target then takes its labeled rows and drops the output columns of
+its own input column (and of its versioned source columns, see
+features.py) by index, without copying the DataFrame.
+
+The saved model still takes a raw DataFrame: its "prep" step is an
+EncodedFeatures transformer holding the shared, already fitted
+preprocessor and the output columns the model was trained on.
+
+With engine="hgb" the shared matrix holds one integer code per
+categorical column instead of one-hot columns, and is kept dense.
+"""
+
+import uuid
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from ml_scripts import model_pipeline
+from ml_scripts.config import DEFAULT_ENGINE
+from ml_scripts.features import target_siblings
+from ml_scripts.processor import categorical_mask
+
+
+def output_columns(preprocessor):
+    """
+    Map each input column of a fitted ColumnTransformer (as built by
+    processor.build_preprocessor or build_native_preprocessor) to the
+    indices of its output columns.
+    Input columns the preprocessor drops (e.g. all-missing ones) map to
+    nothing.
+    """
+    layout = {}
+    for name, pipe, columns in preprocessor.transformers_:
+        if name == "remainder" or pipe == "drop":
+            continue
+        out = preprocessor.output_indices_[name]
+        if out.stop == out.start:
+            # Nothing came out (no columns of this kind, or all dropped)
+            continue
+
+        # Follow the columns through the steps: imputers may drop some,
+        # a one-hot encoder widens each one to its number of categories
+        kept, widths = list(columns), None
+        for step in getattr(pipe, "steps", [(name, pipe)]):
+            est = step[1]
+            if isinstance(est, OneHotEncoder):
+                widths = [len(c) for c in est.categories_]
+            elif hasattr(est, "get_feature_names_out"):
+                kept = list(est.get_feature_names_out(kept))
+        if widths is None:
+            widths = [1] * len(kept)
+
+        if sum(widths) != out.stop - out.start:
+            msg = f"Cannot map the outputs of transformer {name!r} back to its columns"
+            raise ValueError(msg)
+
+        start = out.start
+        for col, width in zip(kept, widths):
+            layout[col] = np.arange(start, start + width)
+            start += width
+    return layout
+
+
+def align_columns(X, columns, preprocessor):
+    """
+    X with exactly the given columns, in order; columns X lacks are filled
+    with missing values. A filled-in column of the fitted preprocessor's
+    "cat" transformer is made object dtype, so it does not look numeric
+    to the encoder.
+    """
+    missing = [c for c in columns if c not in X.columns]
+    X = X.reindex(columns=columns)
+    categorical = {
+        col for name, _, cols in preprocessor.transformers_ if name == "cat"
+        for col in cols
+    }
+    for col in categorical.intersection(missing):
+        X[col] = X[col].astype(object)
+    return X
+
+
+class EncodedFeatures(BaseEstimator, TransformerMixin):
+    """
+    Pipeline step applying a shared, already fitted preprocessor and
+    keeping the output columns a model was trained on. Input columns the
+    preprocessor expects but X lacks (e.g. the model's own target) are
+    filled with missing values; their outputs are not kept.
+    dense: return a NumPy array instead of a sparse matrix
+    encoding_id: the SharedEncoding it came from; models with the same id
+                 can share encode() (see inference.py)
+    """
+
+    def __init__(self, preprocessor, columns, keep, dense=False, encoding_id=None):
+        self.preprocessor = preprocessor
+        self.columns = columns
+        self.keep = keep
+        self.dense = dense
+        self.encoding_id = encoding_id
+
+    def fit(self, X, y=None):
+        # Fitted once for all targets by SharedEncoding
+        return self
+
+    def transform(self, X):
+        return self.encode(X)[:, self.keep]
+
+    def encode(self, X):
+        """Every output column of the shared preprocessor, before keep."""
+        X = align_columns(X, self.columns, self.preprocessor)
+        return _as_matrix(self.preprocessor.transform(X), self.dense)
+
+
+def _as_matrix(encoded, dense):
+    if dense:
+        return encoded.toarray() if sparse.issparse(encoded) else np.asarray(encoded)
+    return sparse.csr_matrix(encoded)
+
+
+class SharedEncoding:
+    """
+    The whole frame encoded once; per-target views into it.
+
+        encoding = SharedEncoding(signData)
+        X, y = encoding.target_data("Handshape")
+    """
+
+    def __init__(self, frame, engine=DEFAULT_ENGINE):
+        print(f"[INFO] Encoding {frame.shape[1]} columns once for all targets...")
+        self.columns = list(frame.columns)
+        self.id = uuid.uuid4().hex
+        self.engine = engine
+        # Gradient boosting takes dense integer codes, the forest sparse one-hot columns
+        self.dense = engine == "hgb"
+        self.preprocessor = model_pipeline.build_preprocessor_for(frame, engine)
+        self.matrix = _as_matrix(self.preprocessor.fit_transform(frame), self.dense)
+        self.layout = output_columns(self.preprocessor)
+        self.categorical = categorical_mask(self.preprocessor)
+        self.frame = frame
+        print(f"[INFO] Encoded matrix: {self.matrix.shape[0]} x {self.matrix.shape[1]}")
+
+    def keep_columns(self, target_col):
+        """Output columns for a model of target_col: everything but its own."""
+        keep = np.ones(self.matrix.shape[1], dtype=bool)
+        for col in [target_col, *target_siblings(target_col, self.columns)]:
+            keep[self.layout.get(col, [])] = False
+        return np.flatnonzero(keep)
+
+    def target_data(self, target_col):
+        """
+        (X, y) for one target: the labeled rows of the shared matrix without
+        the target's own outputs, and the labels as a Series.
+        """
+        labels = self.frame[target_col]
+        rows = np.flatnonzero(labels.notna().to_numpy())
+        X = self.matrix[rows][:, self.keep_columns(target_col)]
+        y = labels.iloc[rows].reset_index(drop=True)
+        return X, y
+
+    def build_model(self, target_col, class_weight=None, n_jobs=None):
+        """An unfitted model of this engine for target_data(target_col)."""
+        categorical = None
+        if self.engine == "hgb":
+            categorical = self.categorical[self.keep_columns(target_col)]
+        return model_pipeline.build_model(class_weight=class_weight, n_jobs=n_jobs,
+                                          engine=self.engine,
+                                          categorical_features=categorical)
+
+    def pipeline(self, target_col, model):
+        """A saved-model pipeline for a model fitted on target_data(target_col)."""
+        prep = EncodedFeatures(self.preprocessor, self.columns, self.keep_columns(target_col),
+                               dense=self.dense, encoding_id=self.id)
+        return Pipeline([("prep", prep), ("model", model)])
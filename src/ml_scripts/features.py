@@ -0,0 +1,140 @@
+"""
+features.py
+
+Choose the feature columns for ASL models before one-hot encoding.
+
+Using every other column as a feature lets a model read its answer from
+the versioned source columns of its own target (Handshape.2.0,
+HandshapeM2.2.0, ...) and makes the one-hot matrix very wide: ids, free
+text and other high-cardinality columns each add one column per distinct
+value. This module drops:
+
+- target siblings: the versioned columns a target is resolved from
+  (dropped per target, see feature_columns)
+- identifiers: known id columns and string columns unique on every row
+- constant columns: at most one distinct value
+- free text and high-cardinality categories: string columns with more
+  than max_categories distinct values
+
+feature_report() trains a model with and without pruning and compares
+the encoded width, fit time and saved model size.
+"""
+
+import time
+from collections import Counter
+
+import pandas as pd
+
+from data_prep.schema import vocabulary_key
+from ml_scripts import model_pipeline
+from ml_scripts.config import DEFAULT_MAX_CATEGORIES, DEFAULT_TARGETS, ID_COLUMNS
+
+
+def _is_categorical(series):
+    return (
+        series.dtype == object
+        or isinstance(series.dtype, (pd.StringDtype, pd.CategoricalDtype))
+    )
+
+
+def target_siblings(target_col, columns):
+    """Versioned source columns of target_col (e.g. HandshapeM2.2.0 for Handshape)."""
+    return [c for c in columns if c != target_col and vocabulary_key(c) == target_col]
+
+
+def prune_features(signData, targets=None, max_categories=DEFAULT_MAX_CATEGORIES,
+                   id_columns=ID_COLUMNS):
+    """
+    Columns worth encoding as features, and the reason each other column
+    was dropped.
+
+    Target columns are always kept: they are the labels, and each target
+    is a feature for the others.
+    Returns (kept_columns, {dropped_column: reason}).
+    """
+    if targets is None:
+        targets = DEFAULT_TARGETS
+
+    n_rows = len(signData)
+    kept, dropped = [], {}
+    for col in signData.columns:
+        if col in targets:
+            kept.append(col)
+            continue
+
+        series = signData[col]
+        n_unique = series.nunique(dropna=True)
+        if col in id_columns:
+            dropped[col] = "identifier"
+        elif n_unique <= 1:
+            dropped[col] = "constant"
+        elif _is_categorical(series) and n_unique == n_rows:
+            # A different string on every row names the row
+            dropped[col] = "identifier"
+        elif _is_categorical(series) and n_unique > max_categories:
+            dropped[col] = "high cardinality"
+        else:
+            kept.append(col)
+    return kept, dropped
+
+
+def feature_columns(columns, target_col):
+    """Features for one target: every column but the target and its siblings."""
+    drop = {target_col, *target_siblings(target_col, columns)}
+    return [c for c in columns if c not in drop]
+
+
+def _fit_stats(signData, target_col, columns):
+    """Encoded width, fit seconds and saved size of a model on `columns`."""
+    data = signData.dropna(subset=[target_col])
+    X, y = data[columns], data[target_col]
+    X_train, X_test, y_train, y_test = model_pipeline.train_test_split_data(X, y)
+
+    pipe = model_pipeline.build_pipeline(X)
+    start = time.perf_counter()
+    model_pipeline.fit_model(pipe, X_train, y_train)
+    seconds = time.perf_counter() - start
+
+    metrics = model_pipeline.evaluate_model(pipe, X_test, y_test)
+    return {
+        "n_columns": len(columns),
+        "width": pipe.named_steps["prep"].transform(X_test.head(1)).shape[1],
+        "fit_seconds": seconds,
+        "model_mb": model_pipeline.model_size_bytes(pipe) / 2**20,
+        "f1_macro": metrics["f1_macro"],
+    }
+
+
+def feature_report(signData, targets=None, max_categories=DEFAULT_MAX_CATEGORIES):
+    """
+    For each target, fit a model on every other column and on the pruned
+    feature set, and compare encoded width, fit time, model size and F1.
+    Returns one dict per target and prints a summary.
+    """
+    if targets is None:
+        targets = DEFAULT_TARGETS
+    targets = [t for t in targets if t in signData.columns]
+
+    kept, dropped = prune_features(signData, targets, max_categories)
+    print(f"[INFO] Pruned {len(dropped)} of {signData.shape[1]} columns:")
+    for reason, count in Counter(dropped.values()).most_common():
+        print(f"   {reason}: {count}")
+
+    report = []
+    for target_col in targets:
+        before = _fit_stats(
+            signData, target_col, [c for c in signData.columns if c != target_col]
+        )
+        after = _fit_stats(signData, target_col, feature_columns(kept, target_col))
+        report.append({"target": target_col, "before": before, "after": after})
+
+    print("\n=== Feature Pruning Report ===")
+    for r in report:
+        b, a = r["before"], r["after"]
+        print(
+            f"{r['target']:<16} | width {b['width']:>6} -> {a['width']:<6} | "
+            f"fit {b['fit_seconds']:6.2f}s -> {a['fit_seconds']:6.2f}s | "
+            f"size {b['model_mb']:7.1f}MB -> {a['model_mb']:7.1f}MB | "
+            f"f1 {b['f1_macro']:.3f} -> {a['f1_macro']:.3f}"
+        )
+    return report
@@ -0,0 +1,156 @@
+"""
+inference.py
+
+Predict every target for a batch of signs in one call.
+
+    result = predict_frame(signData)
+    result["Handshape"]                 # predicted labels
+    result["Handshape_proba_flat"]      # probability of one class
+
+The models come from a ModelRegistry (see registry.py), so they are
+loaded once per process. Models trained together on a SharedEncoding
+(see encoding.py) share its preprocessor, so each chunk of rows is
+encoded once for all of them, and each model only takes its columns of
+that matrix. Labels are read off the class probabilities rather than
+predicted separately.
+
+Inputs are processed in chunks of ``chunksize`` rows: predict_chunks
+takes any iterable of frames and predict_csv streams a csv file, so
+neither holds more than one chunk (and its result) in memory.
+"""
+
+from contextlib import contextmanager
+
+import pandas as pd
+from joblib import parallel_config
+from threadpoolctl import threadpool_limits
+
+import data_prep.prepareData
+from ml_scripts.config import DEFAULT_PREDICT_CHUNKSIZE, DEFAULT_TARGETS
+from ml_scripts.encoding import EncodedFeatures, align_columns
+from ml_scripts.registry import get_model_registry
+
+
+def proba_column(target_col, cls):
+    """Name of the result column with the probability of cls for target_col."""
+    return f"{target_col}_proba_{cls}"
+
+
+def load_models(targets=None, registry=None):
+    """{target: model} for the targets with a saved model in the registry."""
+    if targets is None:
+        targets = DEFAULT_TARGETS
+    if registry is None:
+        registry = get_model_registry()
+
+    # One rescan picks up every model saved since the registry last looked
+    if any(target_col not in registry for target_col in targets):
+        registry.refresh()
+
+    models = {}
+    for target_col in targets:
+        if target_col not in registry:
+            print(f"[SKIP] No saved model for {target_col}")
+            continue
+        models[target_col] = registry.get(target_col)
+    return models
+
+
+def _shared_prep(pipe):
+    """The EncodedFeatures step of a model trained on a SharedEncoding, else None."""
+    prep = pipe.named_steps.get("prep") if hasattr(pipe, "named_steps") else None
+    if isinstance(prep, EncodedFeatures) and getattr(prep, "encoding_id", None):
+        return prep
+    return None
+
+
+def predict_chunk(models, chunk):
+    """
+    Labels and class probabilities of every model for the rows of chunk,
+    as one frame on chunk's index.
+    """
+    columns = {}
+    encoded = {}
+    for target_col, pipe in models.items():
+        prep = _shared_prep(pipe)
+        if prep is not None:
+            # One encoding of the chunk per shared preprocessor
+            if prep.encoding_id not in encoded:
+                encoded[prep.encoding_id] = prep.encode(chunk)
+            proba = pipe.named_steps["model"].predict_proba(
+                encoded[prep.encoding_id][:, prep.keep]
+            )
+        else:
+            # Columns the model was trained on but the chunk lacks (e.g. the
+            # other targets) are filled with missing values
+            prep = pipe.named_steps["prep"]
+            proba = pipe.predict_proba(align_columns(chunk, prep.feature_names_in_, prep))
+
+        classes = pipe.classes_
+        columns[target_col] = pd.Categorical.from_codes(proba.argmax(axis=1), categories=classes)
+        for j, cls in enumerate(classes):
+            columns[proba_column(target_col, cls)] = proba[:, j]
+    return pd.DataFrame(columns, index=chunk.index)
+
+
+@contextmanager
+def _prediction_cores(n_jobs):
+    # Forests predict on joblib threads, gradient boosting on OpenMP threads
+    with parallel_config(n_jobs=n_jobs), threadpool_limits(limits=n_jobs, user_api="openmp"):
+        yield
+
+
+def predict_chunks(chunks, targets=None, registry=None, n_jobs=None):
+    """
+    Yield predict_chunk() for each frame of chunks, with the same models
+    throughout.
+    n_jobs: cores used per prediction (None = the libraries' defaults)
+    """
+    models = load_models(targets, registry)
+    if not models:
+        return
+    for chunk in chunks:
+        # Limits set per chunk, so they do not leak to the caller between chunks
+        with _prediction_cores(n_jobs):
+            result = predict_chunk(models, chunk)
+        yield result
+
+
+def _split(frame, chunksize):
+    for start in range(0, len(frame), chunksize):
+        yield frame.iloc[start:start + chunksize]
+
+
+def predict_frame(frame, targets=None, registry=None, chunksize=DEFAULT_PREDICT_CHUNKSIZE,
+                  n_jobs=None):
+    """Predictions for every row of frame (see predict_chunk), chunk by chunk."""
+    results = list(predict_chunks(_split(frame, chunksize), targets, registry, n_jobs))
+    if not results:
+        return pd.DataFrame(index=frame.index)
+    return pd.concat(results)
+
+
+def predict_csv(path, out_path, targets=None, registry=None,
+                chunksize=DEFAULT_PREDICT_CHUNKSIZE, n_jobs=None, id_column="LemmaID"):
+    """
+    Stream a sign data csv through the models and write the predictions
+    (with id_column, when the csv has it) to out_path, one chunk at a time.
+    Returns the number of rows written.
+    """
+    chunks = data_prep.prepareData.read_csv_chunks(path, chunksize)
+    models = load_models(targets, registry)
+    if chunks is None or not models:
+        return 0
+
+    n_rows = 0
+    with _prediction_cores(n_jobs):
+        for chunk in chunks:
+            # Same canonical columns as the training data
+            chunk = data_prep.prepareData.ensure_canonical_columns(chunk)
+            result = predict_chunk(models, chunk)
+            if id_column in chunk.columns:
+                result.insert(0, id_column, chunk[id_column])
+            result.to_csv(out_path, mode="w" if n_rows == 0 else "a",
+                          header=n_rows == 0, index=False)
+            n_rows += len(result)
+    return n_rows
@@ -4,16 +4,21 @@ model_pipeline.py
 Model building, training, evaluation, and saving utilities.
 """
 
+import io
 from pathlib import Path
 
 import joblib
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
 from sklearn.metrics import accuracy_score, f1_score
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
+from sklearn.utils.class_weight import compute_class_weight
 
-from ml_scripts.processor import build_preprocessor
+from ml_scripts import artifacts
+from ml_scripts.config import DEFAULT_ARTIFACT_FORMAT, DEFAULT_ENGINE, ENGINES
+from ml_scripts.processor import build_native_preprocessor, build_preprocessor
 
 
 def get_stratify_arg(y):
@@ -34,21 +39,91 @@ def get_stratify_arg(y):
     return None
 
 
-def build_pipeline(X, class_weight=None):
+def check_engine(engine):
+    """Raise ValueError for an engine name not in config.ENGINES."""
+    if engine not in ENGINES:
+        msg = f"Unknown engine {engine!r}; expected one of {ENGINES}"
+        raise ValueError(msg)
+
+
+def balanced_class_weights(y):
+    """
+    {class: weight} so that every class counts the same in training,
+    however few samples it has.
+    """
+    classes = np.unique(y)
+    weights = compute_class_weight(class_weight="balanced", classes=classes, y=y)
+    return {cls: w for cls, w in zip(classes, weights)}
+
+
+def build_preprocessor_for(X, engine=DEFAULT_ENGINE):
+    """
+    The preprocessor an engine expects: one-hot encoded features for "rf",
+    integer-coded categories with missing values left in for "hgb".
+    """
+    check_engine(engine)
+    if engine == "hgb":
+        return build_native_preprocessor(X)
+    return build_preprocessor(X)
+
+
+def build_model(class_weight=None, n_jobs=None, engine=DEFAULT_ENGINE, categorical_features=None):
+    """
+    Build the classifier used for every target.
+    class_weight: handle imbalanced classes
+    n_jobs: number of trees fitted in parallel (None = one at a time); "hgb"
+            has no such setting, its threads are limited in training.py
+    engine: "rf" or "hgb" (see config.ENGINES)
+    categorical_features: for "hgb", boolean mask of the integer-coded
+            categorical columns (see processor.categorical_mask)
+    """
+    check_engine(engine)
+    if engine == "hgb":
+        # HistGradientBoostingClassifier encodes the labels before looking
+        # up a class_weight dict, so string labels never match it; class
+        # weights here are always balanced_class_weights, which "balanced"
+        # computes the same way on the training labels
+        if class_weight is not None:
+            class_weight = "balanced"
+        # HistGradientBoostingClassifier = boosted trees on binned features;
+        # it splits categorical columns on sets of categories and sends
+        # missing values down their own branch, so no one-hot or imputing
+        # random_state: seed for the validation split used for early stopping
+        return HistGradientBoostingClassifier(
+            categorical_features=categorical_features,
+            class_weight=class_weight,
+            random_state=42,
+        )
+
+    # RandomForestClassifier = a model that builds many decision trees and combines their predictions
+    # n_estimator: number of trees in the forest
+    # random_state: seed for reproducibility
+    # n_jobs: trees fitted in parallel; the fitted trees are the same either way
+    return RandomForestClassifier(n_estimators=300, random_state=42, class_weight=class_weight,
+                                  n_jobs=n_jobs)
+
+
+def build_pipeline(X, class_weight=None, n_jobs=None, engine=DEFAULT_ENGINE):
     """
     Build preprocessing + model pipeline
     Preprocess the input features (X) using build_preprocessor
     Train a Random Forest classifier on the processed data 
+    (or gradient boosting on integer-coded categories with engine="hgb")
+    n_jobs: number of trees fitted in parallel (None = one at a time)
     """
     
     # handles all data preprocessing steps
-    preprocessor = build_preprocessor(X)
-    
-    # RandomForestClassifier = a model that builds many decision trees and combines their predictions
-    model = RandomForestClassifier(n_estimators=300, random_state=42, class_weight=class_weight)
-    # n_estimator: number of trees in the forest
-    # random_state: seed for reproducibility
-    # class_weight: handle imbalanced classes
+    preprocessor = build_preprocessor_for(X, engine)
+
+    # The categorical columns come first in the native preprocessor's output
+    categorical = None
+    if engine == "hgb":
+        n_cat = len(preprocessor.transformers[0][2])
+        n_num = len(preprocessor.transformers[1][2])
+        categorical = [True] * n_cat + [False] * n_num
+
+    model = build_model(class_weight=class_weight, n_jobs=n_jobs, engine=engine,
+                        categorical_features=categorical)
 
 
     # Create the pipeline: first preprocess, then model
@@ -95,17 +170,26 @@ def evaluate_model(pipe, X_test, y_test):
     }
 
 
-def save_model(pipe, models_dir, target_col):
+def model_size_bytes(pipe):
+    """Size of a pipeline as save_model would write it."""
+    buffer = io.BytesIO()
+    joblib.dump(pipe, buffer)
+    return buffer.getbuffer().nbytes
+
+
+def save_model(pipe, models_dir, target_col, artifact_format=DEFAULT_ARTIFACT_FORMAT,
+               features=None, stats=None, fingerprint=None):
     """
-    Save the trained models as a .pkl file
+    Save the trained models as a .pkl file, with a .json metadata sidecar
+    artifact_format: "pickle", "compressed" or "mmap" (see artifacts.py)
+    features / stats / fingerprint: input columns, training figures and
+    training fingerprint (see training.py) for the sidecar
     """
     # Make sure the folder exists
     models_dir.mkdir(exist_ok=True)
-    # Replace '.' in column names so the filename is safe
-    safe_target = target_col.replace(".", "_")
-    # Build full path
-    model_path = models_dir / f"model_{safe_target}.pkl"
+    # Build full path (model_<Target>.pkl, with '.' replaced so the filename is safe)
+    model_path = artifacts.model_path(models_dir, target_col)
     # Save the pipeline using joblib
-    joblib.dump(pipe, model_path)
-    return model_path
-
+    return artifacts.write_artifact(pipe, model_path, target_col, artifact_format,
+                                    features=features, stats=stats,
+                                    fingerprint=fingerprint)
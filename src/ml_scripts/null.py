@@ -2,32 +2,201 @@
 null_baseline.py
 
 Compute null baselines (majority + stratified) for ASL targets.
-This mirrors the training flow but uses DummyClassifier instead of real ML.
+
+Neither baseline looks at the features, so their scores depend only on
+how many signs of each class land in the train and test sets. Instead of
+fitting DummyClassifiers on one split, the scores are computed from the
+class counts (value_counts) of each target, over many random 80/20
+splits at once:
+
+- a split allocates the test set's class counts the way
+  model_pipeline.train_test_split_data does: stratified (sklearn's
+  approximate mode, ties broken at random) when every class has at least
+  2 signs, else a random multivariate hypergeometric draw; the rest is
+  the training set
+- majority: predicts the most common training class, so its accuracy
+  and macro F1 follow directly from the test counts
+- stratified: predicts classes at random in the training proportions,
+  so each class's hits and predictions are binomial draws
+
+The reported scores are the means over the random splits. Their
+confidence intervals come from bootstrapping: the labels are resampled
+with replacement (a multinomial draw of the class counts) before each
+split. cv= instead scores DummyClassifiers on cross-validation folds,
+the same folds as the real model (see crossval.py).
 """
 
+import math
 import warnings
 
-import pandas as pd
-from sklearn.dummy import DummyClassifier
+import numpy as np
 
-from ml_scripts.config import DEFAULT_TARGETS
+from ml_scripts.config import DEFAULT_NULL_RESAMPLES, DEFAULT_TARGETS
+from ml_scripts.crossval import NULL_VARIANTS, cross_validate
 from ml_scripts.data_checker import validate_target_column
-from ml_scripts.model_pipeline import train_test_split_data, evaluate_model
 
-# Hide noisy warnings 
+# Hide noisy warnings
 warnings.filterwarnings(
     "ignore",
     message="Skipping features without any observed values*",
 )
 
+# Same test share as model_pipeline.train_test_split_data (which also
+# stratifies the same way, see _split_scores)
+TEST_SIZE = 0.2
+
+SCORES = ["acc_majority", "f1_majority", "acc_stratified", "f1_stratified"]
+
+
+def class_counts(y):
+    """Counts of the classes present in y, ordered like DummyClassifier's classes_."""
+    counts = y.value_counts(sort=False)
+    counts = counts[counts > 0]
+    # Ties for the majority go to the first class, as in DummyClassifier
+    return counts.iloc[np.argsort(counts.index.to_numpy(dtype=object), kind="stable")].to_numpy()
+
+
+def split_counts(counts, n_test, rng):
+    """
+    Test set class counts of a random split of each row of counts (R x K)
+    into n_test test signs and the rest: one class at a time, the test
+    signs of class k are a hypergeometric draw from what is left.
+    """
+    test = np.zeros_like(counts)
+    left = np.full(len(counts), n_test, dtype=counts.dtype)
+    remaining = counts.sum(axis=1)
+    for k in range(counts.shape[1] - 1):
+        test[:, k] = rng.hypergeometric(counts[:, k], remaining - counts[:, k], left)
+        left -= test[:, k]
+        remaining -= counts[:, k]
+    test[:, -1] = left
+    return test
+
+
+def _approximate_mode(counts, n_draws, rng):
+    """
+    sklearn's _approximate_mode for each row of counts (R x K): n_draws[r]
+    signs shared out in proportion to the counts, the leftover ones going
+    to the largest remainders, ties broken at random.
+    """
+    continuous = counts / counts.sum(axis=1, keepdims=True) * n_draws[:, None]
+    floored = np.floor(continuous)
+    need = n_draws - floored.sum(axis=1)
+    # Rank of each class by remainder, largest first, ties in random order
+    order = np.lexsort((rng.random(counts.shape), floored - continuous))
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.broadcast_to(np.arange(counts.shape[1]), order.shape),
+                      axis=1)
+    return (floored + (rank < need[:, None])).astype(counts.dtype)
+
+
+def stratified_split_counts(counts, n_test, rng):
+    """
+    Test set class counts of a stratified split of each row of counts
+    (R x K), as train_test_split(stratify=y): the training share is
+    allocated first and the test set gets the rest.
+    """
+    n_train = counts.sum(axis=1) - n_test
+    return counts - _approximate_mode(counts, n_train, rng)
+
+
+def majority_scores(train, test):
+    """Accuracy and macro F1 of predicting each split's most common training class."""
+    n_test = test.sum(axis=1)
+    hits = test[np.arange(len(test)), train.argmax(axis=1)]
+    # Only the predicted class has a non-zero F1; macro F1 averages over
+    # the classes that are in the test set or predicted
+    labels = (test > 0).sum(axis=1) + (hits == 0)
+    return hits / n_test, 2 * hits / (n_test + hits) / labels
+
 
-def null_one_target(signData, target_col):
+def stratified_scores(train, test, rng):
+    """
+    Accuracy and macro F1 of predicting at random in each split's training
+    proportions p. The test signs of class k are predicted as k
+    Binomial(test_k, p_k) times (its hits), the other test signs
+    Binomial(n_test - test_k, p_k) times, independently; that is exact for
+    each class on its own and for accuracy, and only leaves out the small
+    negative correlation between the prediction counts of different classes.
+    """
+    n_test = test.sum(axis=1)
+    proportions = train / train.sum(axis=1, keepdims=True)
+    hits = rng.binomial(test, proportions)
+    support = test + hits + rng.binomial(n_test[:, None] - test, proportions)
+    f1_class = np.divide(2 * hits, support, out=np.zeros(hits.shape), where=support > 0)
+    return hits.sum(axis=1) / n_test, f1_class.sum(axis=1) / (support > 0).sum(axis=1)
+
+
+def _split_scores(counts, n_test, rng):
+    """{score: one value per row of counts}, each row split at random once."""
+    # Stratified like get_stratify_arg: every present class has 2+ signs
+    # (and, as sklearn requires, both sides have room for every class)
+    present = counts > 0
+    n_classes = present.sum(axis=1)
+    stratify = (
+        (np.where(present, counts, 2).min(axis=1) >= 2)
+        & (n_classes <= n_test)
+        & (n_classes <= counts.sum(axis=1) - n_test)
+    )
+    test = np.empty_like(counts)
+    test[stratify] = stratified_split_counts(counts[stratify], n_test, rng)
+    test[~stratify] = split_counts(counts[~stratify], n_test, rng)
+    train = counts - test
+    acc_majority, f1_majority = majority_scores(train, test)
+    acc_stratified, f1_stratified = stratified_scores(train, test, rng)
+    return dict(zip(SCORES, (acc_majority, f1_majority, acc_stratified, f1_stratified)))
+
+
+def null_scores(counts, n_resamples=DEFAULT_NULL_RESAMPLES, confidence=0.95, test_size=TEST_SIZE,
+                random_state=42):
+    """
+    Null baseline scores of a target with the given class counts.
+    Returns {score: mean over n_resamples random splits (stratified when
+    train_test_split_data would stratify)} plus
+    {score + "_ci": (low, high)}, the bootstrap confidence interval.
+    """
+    rng = np.random.default_rng(random_state)
+    counts = np.asarray(counts, dtype=np.int64)
+    n = int(counts.sum())
+    n_test = math.ceil(test_size * n)
+
+    # Random splits of the data as it is
+    splits = _split_scores(np.broadcast_to(counts, (n_resamples, len(counts))), n_test, rng)
+    # The same, each on a bootstrap resample of the labels
+    resampled = rng.multinomial(n, counts / n, size=n_resamples)
+    bootstrap = _split_scores(resampled, n_test, rng)
+
+    tail = (1 - confidence) / 2 * 100
+    result = {}
+    for score in SCORES:
+        result[score] = float(splits[score].mean())
+        low, high = np.percentile(bootstrap[score], [tail, 100 - tail])
+        result[f"{score}_ci"] = (float(low), float(high))
+    return result
+
+
+def _print_ci(name, result, acc, f1):
+    acc_low, acc_high = result[f"{acc}_ci"]
+    f1_low, f1_high = result[f"{f1}_ci"]
+    print(f"[BASELINE] {name:<10} | acc={result[acc]:.3f} [{acc_low:.3f}, {acc_high:.3f}] | "
+          f"f1_macro={result[f1]:.3f} [{f1_low:.3f}, {f1_high:.3f}]")
+
+
+def null_one_target(signData, target_col, cv=None, cv_repeats=1, n_jobs=None,
+                    n_resamples=DEFAULT_NULL_RESAMPLES, confidence=0.95):
     """
     Compute null baselines (majority + stratified) for a single target.
 
     Major: Always predicts the most common class
     Stratified random model: redicts classes at random uses
     the same class proportions as in the training data.
+
+    n_resamples: random splits the scores are averaged over, and
+                 bootstrap resamples of their confidence intervals
+    confidence: level of the intervals (the "_ci" keys)
+    cv: number of folds to cross-validate on instead (cv_repeats times,
+        n_jobs folds at once, see crossval.py); the figures are then
+        fold means, with their standard deviations
     """
     valid, msg = validate_target_column(signData, target_col)
     if not valid:
@@ -39,65 +208,67 @@ def null_one_target(signData, target_col):
     print("=" * 40)
 
     # Drop rows with missing labels for this target
-    data_trained = signData.dropna(subset=[target_col]).copy()
-    if data_trained.empty:
+    y = signData[target_col].dropna()
+    if y.empty:
         msg = f"No data for {target_col}"
         print(f"[SKIP] {msg}")
         return {"target": target_col, "status": "skip", "reason": msg}
 
-    # Separate features and target
-    y = data_trained[target_col]
-    X = data_trained.drop(columns=[target_col])
-
     """
     #show class distribution
     # helps understand class imbalance
-    
+
     class_counts = y.value_counts()
     print("[INFO] Class distribution:")
     print(class_counts.to_string())
     """
-    # Use the SAME train/test split logic as our real model
-    X_train, X_test, y_train, y_test = train_test_split_data(X, y)
-
-    # --- Null model 1: Majority-class baseline ---
-    maj_clf = DummyClassifier(strategy="most_frequent")
-    maj_clf.fit(X_train, y_train)
-    maj_metrics = evaluate_model(maj_clf, X_test, y_test)
-    maj_acc = maj_metrics["accuracy"]
-    maj_f1 = maj_metrics["f1_macro"]
-
-    print(f"[BASELINE] Majority   | acc={maj_acc:.3f} | f1_macro={maj_f1:.3f}")
-
-    # --- Null model 2: Stratified random baseline ---
-    strat_clf = DummyClassifier(strategy="stratified", random_state=42)
-    strat_clf.fit(X_train, y_train)
-    strat_metrics = evaluate_model(strat_clf, X_test, y_test)
-    strat_acc = strat_metrics["accuracy"]
-    strat_f1 = strat_metrics["f1_macro"]
+    if cv:
+        # Same folds as cross-validating the real model
+        X = signData.loc[y.index].drop(columns=[target_col])
+        result = cross_validate(X, y, NULL_VARIANTS, n_splits=cv, n_repeats=cv_repeats,
+                                n_jobs=n_jobs)
+        maj, strat = result["majority"], result["stratified"]
+        print(f"[BASELINE] Majority   | acc={maj['acc_mean']:.3f} ± {maj['acc_std']:.3f} | "
+              f"f1_macro={maj['f1_mean']:.3f} ± {maj['f1_std']:.3f}")
+        print(f"[BASELINE] Stratified | acc={strat['acc_mean']:.3f} ± {strat['acc_std']:.3f} | "
+              f"f1_macro={strat['f1_mean']:.3f} ± {strat['f1_std']:.3f}")
+        return {
+            "target": target_col,
+            "status": "ok",
+            "acc_majority": maj["acc_mean"],
+            "f1_majority": maj["f1_mean"],
+            "acc_stratified": strat["acc_mean"],
+            "f1_stratified": strat["f1_mean"],
+            "acc_majority_std": maj["acc_std"],
+            "f1_majority_std": maj["f1_std"],
+            "acc_stratified_std": strat["acc_std"],
+            "f1_stratified_std": strat["f1_std"],
+            "folds": result["folds"],
+            "fold_seconds": result["fold_seconds"],
+        }
 
-    print(f"[BASELINE] Stratified | acc={strat_acc:.3f} | f1_macro={strat_f1:.3f}")
+    # Only the class counts matter, not the features
+    result = null_scores(class_counts(y), n_resamples=n_resamples, confidence=confidence)
+    _print_ci("Majority", result, "acc_majority", "f1_majority")
+    _print_ci("Stratified", result, "acc_stratified", "f1_stratified")
 
-    return {
-        "target": target_col,
-        "status": "ok",
-        "acc_majority": maj_acc,
-        "f1_majority": maj_f1,
-        "acc_stratified": strat_acc,
-        "f1_stratified": strat_f1,
-    }
+    return {"target": target_col, "status": "ok", **result, "n_resamples": n_resamples}
 
 
-def null_all_targets(signData, targets=None):
+def null_all_targets(signData, targets=None, cv=None, cv_repeats=1, n_jobs=None,
+                     n_resamples=DEFAULT_NULL_RESAMPLES, confidence=0.95):
     """
     Run null baselines for multiple targets, similar to train_all_targets.
+    n_resamples / confidence: see null_one_target
+    cv / cv_repeats / n_jobs: cross-validate instead (see null_one_target)
     """
     if targets is None:
         targets = DEFAULT_TARGETS
 
     results = []
     for target_col in targets:
-        res = null_one_target(signData, target_col)
+        res = null_one_target(signData, target_col, cv=cv, cv_repeats=cv_repeats, n_jobs=n_jobs,
+                              n_resamples=n_resamples, confidence=confidence)
         results.append(res)
 
     return results
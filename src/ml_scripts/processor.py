@@ -4,9 +4,10 @@ processor.py
 Build sklearn preprocessors for numeric + categorical columns.
 """
 
+import numpy as np
 import pandas as pd
 from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 
@@ -61,3 +62,49 @@ def build_preprocessor(X: pd.DataFrame) -> ColumnTransformer:
 
     # Return the full preprocessing object so it can be used in a model pipeline
     return preprocessor
+
+
+# Histogram gradient boosting bins each feature into at most this many
+# values, categories included
+MAX_NATIVE_CATEGORIES = 255
+
+
+def build_native_preprocessor(X: pd.DataFrame) -> ColumnTransformer:
+    """
+    Build a ColumnTransformer for models that handle categories and missing
+    values themselves (HistGradientBoostingClassifier).
+    Categorical columns come first, one integer code per column, and numeric
+    columns are passed through, so nothing is imputed or one-hot expanded.
+    """
+
+    num_cols = X.select_dtypes(include=["int64", "float64"]).columns.tolist()
+    cat_cols = X.select_dtypes(include=["object", "category"]).columns.tolist()
+
+    # Each category becomes an integer code; missing and unseen values stay
+    # NaN, which the model sends down its own branch.
+    # Rare categories beyond MAX_NATIVE_CATEGORIES share one code.
+    ordinal = OrdinalEncoder(
+        handle_unknown="use_encoded_value",
+        unknown_value=np.nan,
+        encoded_missing_value=np.nan,
+        max_categories=MAX_NATIVE_CATEGORIES,
+    )
+
+    # The categorical columns are the first outputs (see categorical_mask)
+    return ColumnTransformer(
+        transformers=[
+            ("cat", ordinal, cat_cols),
+            ("num", "passthrough", num_cols),
+        ]
+    )
+
+
+def categorical_mask(preprocessor: ColumnTransformer) -> np.ndarray:
+    """
+    Boolean mask over the outputs of a fitted preprocessor, True for the
+    outputs of its "cat" transformer.
+    """
+    width = max((s.stop for s in preprocessor.output_indices_.values()), default=0)
+    mask = np.zeros(width, dtype=bool)
+    mask[preprocessor.output_indices_.get("cat", slice(0, 0))] = True
+    return mask
@@ -0,0 +1,194 @@
+"""
+registry.py
+
+Serve the saved models of a models directory from one long-running process.
+
+ModelRegistry finds the model_<Target>.pkl files (see artifacts.py) and
+loads each model the first time it is asked for. Loaded models are kept
+in least-recently-used order within a memory budget: when a load goes
+over the budget, the models unused for longest are dropped (the one just
+loaded is always kept). Every lookup checks the model file, so a model
+retrained on disk is reloaded on its next use.
+
+    registry = get_model_registry()
+    registry.predict("Handshape", frame)
+
+A model's memory is estimated by its file size; compressed models are
+counted at the resident memory their load added, not at their
+compressed size.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from ml_scripts import artifacts
+from ml_scripts.config import DEFAULT_MODEL_MEMORY_BUDGET, DEFAULT_MODELS_DIR
+
+_MB = 1024 * 1024
+
+
+def _file_state(path):
+    """(mtime_ns, size) of a model file; changes when it is rewritten."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _memory_estimate(file_bytes, info):
+    """
+    Bytes a loaded model is counted at: its file size, which an
+    uncompressed pickle matches closely; a compressed one is counted at
+    the resident memory its load added when that is larger.
+    """
+    if info.get("format") == "compressed":
+        return max(file_bytes, info.get("rss_bytes") or 0)
+    return file_bytes
+
+
+class _Loaded:
+    def __init__(self, pipe, info, state, nbytes):
+        self.pipe = pipe
+        self.info = info
+        self.state = state
+        self.nbytes = nbytes
+
+
+class ModelRegistry:
+    """
+    Lazily loaded, LRU-cached models of one models directory, by target.
+
+        registry = ModelRegistry("models", memory_budget=1024**3)
+        registry.targets()              # ['Handshape', 'MajorLocation', ...]
+        pipe = registry.get("Handshape")
+    """
+
+    def __init__(self, models_dir=None, memory_budget=DEFAULT_MODEL_MEMORY_BUDGET,
+                 verbose=False):
+        self.models_dir = Path(models_dir if models_dir is not None else DEFAULT_MODELS_DIR)
+        self.memory_budget = memory_budget
+        self.verbose = verbose
+        self._paths = {}
+        self._loaded = OrderedDict()
+        self._lock = threading.RLock()
+        self.counts = {"hits": 0, "loads": 0, "reloads": 0, "evictions": 0}
+        self.refresh()
+
+    def refresh(self):
+        """Rescan models_dir for model files; returns the known targets."""
+        paths = {}
+        for path in sorted(self.models_dir.glob("model_*.pkl")):
+            # The sidecar knows the real target name ("Handshape.2.0" is saved
+            # as model_Handshape_2_0.pkl); without one, go by the file name
+            target = artifacts.read_metadata(path).get("target") or path.stem[len("model_"):]
+            paths[target] = path
+        with self._lock:
+            self._paths = paths
+            for target in [t for t in self._loaded if t not in paths]:
+                del self._loaded[target]
+        return sorted(paths)
+
+    def targets(self):
+        """Targets with a saved model, loaded or not."""
+        return sorted(self._paths)
+
+    def loaded(self):
+        """Targets currently in memory, least recently used first."""
+        with self._lock:
+            return list(self._loaded)
+
+    def memory_used(self):
+        """Estimated bytes held by the loaded models."""
+        with self._lock:
+            return sum(entry.nbytes for entry in self._loaded.values())
+
+    def __contains__(self, target):
+        return target in self._paths
+
+    def path(self, target):
+        """Model file of target; KeyError if there is none."""
+        if target not in self._paths:
+            self.refresh()
+        try:
+            return self._paths[target]
+        except KeyError:
+            msg = f"No saved model for target {target!r} in {self.models_dir}"
+            raise KeyError(msg) from None
+
+    def get(self, target):
+        """The model of target, loaded now if it is not in memory or its file changed."""
+        with self._lock:
+            path = self.path(target)
+            try:
+                state = _file_state(path)
+            except FileNotFoundError:
+                self._loaded.pop(target, None)
+                self.refresh()
+                msg = f"Model file {path} for target {target!r} was removed"
+                raise KeyError(msg) from None
+
+            entry = self._loaded.get(target)
+            if entry is not None and entry.state == state:
+                self._loaded.move_to_end(target)
+                self.counts["hits"] += 1
+                return entry.pipe
+
+            if entry is not None:
+                # Retrained since it was loaded: drop the old one before loading
+                del self._loaded[target]
+                self.counts["reloads"] += 1
+            self.counts["loads"] += 1
+
+            pipe, info = artifacts.load_artifact(path, verbose=self.verbose)
+            nbytes = _memory_estimate(state[1], info)
+            self._loaded[target] = _Loaded(pipe, info, state, nbytes)
+            self._evict()
+            return pipe
+
+    def info(self, target):
+        """Metadata of target's model (the sidecar, plus load figures once loaded)."""
+        with self._lock:
+            entry = self._loaded.get(target)
+            if entry is not None:
+                return dict(entry.info, memory_bytes=entry.nbytes)
+        return artifacts.read_metadata(self.path(target))
+
+    def predict(self, target, X):
+        """Predictions of target's model for the rows of X."""
+        return self.get(target).predict(X)
+
+    def evict(self, target):
+        """Drop target's model from memory; it is loaded again on next use."""
+        with self._lock:
+            return self._loaded.pop(target, None) is not None
+
+    def clear(self):
+        """Drop every loaded model."""
+        with self._lock:
+            self._loaded.clear()
+
+    def _evict(self):
+        # Oldest first, never the model just loaded (the last one)
+        while len(self._loaded) > 1 and self.memory_used() > self.memory_budget:
+            target, entry = self._loaded.popitem(last=False)
+            self.counts["evictions"] += 1
+            if self.verbose:
+                print(f"[INFO] Evicted model for {target} ({entry.nbytes / _MB:.1f}MB)")
+        if self.memory_used() > self.memory_budget:
+            target = next(iter(self._loaded))
+            print(f"[WARN] Model for {target} alone exceeds the memory budget "
+                  f"({self.memory_used() / _MB:.1f}MB > {self.memory_budget / _MB:.1f}MB)")
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(models_dir=None, memory_budget=DEFAULT_MODEL_MEMORY_BUDGET):
+    """The process-wide ModelRegistry of models_dir, created on first use."""
+    models_dir = Path(models_dir if models_dir is not None else DEFAULT_MODELS_DIR).resolve()
+    with _registries_lock:
+        registry = _registries.get(models_dir)
+        if registry is None:
+            registry = _registries[models_dir] = ModelRegistry(models_dir, memory_budget)
+        return registry
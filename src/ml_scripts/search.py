@@ -0,0 +1,295 @@
+"""
+search.py
+
+Budgeted hyperparameter search with successive halving.
+
+build_model's defaults (300 trees of unlimited depth) are one point of a
+trade-off: a much smaller model may score almost as well while
+predicting faster and taking a fraction of the disk and memory. The
+search looks for the configurations on that trade-off.
+
+Every configuration of SEARCH_SPACE starts on a small share of the
+training rows with the same share of its trees (or boosting
+iterations). After each round ("rung") the best 1/eta of them go on to
+eta times the rows and trees, until the survivors run at full size.
+Candidates are measured on
+
+- macro F1 on a held-out validation split (higher is better)
+- predict latency of the whole pipeline, per row of the validation set
+  predicted in one batch (lower is better)
+- saved model size (lower is better)
+
+and promoted by Pareto front first and F1 second, so a small, fast
+model that is nearly as good goes on alongside the most accurate one.
+No new fit is started once the wall-clock budget is spent; the result
+is the Pareto front of the highest rung reached.
+
+Latency and size are compared within a relative tolerance (TOLERANCES),
+so timing noise between near-identical models does not make each look
+better than the other on some objective.
+
+    result = search_target(signData, "Handshape", budget_seconds=120)
+    for c in result["pareto"]:
+        print(c["engine"], c["params"], c["f1_macro"], c["predict_batch_ms"], c["model_mb"])
+"""
+
+import math
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import effective_n_jobs
+from sklearn.model_selection import ParameterGrid
+from sklearn.pipeline import Pipeline
+from threadpoolctl import threadpool_limits
+
+from ml_scripts import model_pipeline
+from ml_scripts.comparison import predict_latency_ms
+from ml_scripts.config import DEFAULT_MAX_CATEGORIES, DEFAULT_SEARCH_BUDGET, DEFAULT_TARGETS, ENGINES
+from ml_scripts.crossval import encode_split, model_variant
+from ml_scripts.data_checker import validate_target_column
+from ml_scripts.features import feature_columns, prune_features
+
+# Configurations tried per engine
+SEARCH_SPACE = {
+    "rf": {"n_estimators": [50, 150, 300], "max_depth": [None, 12], "min_samples_leaf": [1, 4]},
+    "hgb": {"max_iter": [50, 100, 200], "max_leaf_nodes": [15, 31]},
+}
+
+# The parameter scaled down with the rows on the early rungs
+SIZE_PARAMS = {"rf": "n_estimators", "hgb": "max_iter"}
+MIN_TREES = 10
+
+# Share of the candidates kept per rung is 1/ETA; the first rung uses
+# ETA**-(N_RUNGS-1) of the rows
+ETA = 2
+N_RUNGS = 3
+
+# Objectives: +1 higher is better, -1 lower is better. Batch latency per
+# row is far steadier than timing single sub-millisecond predictions
+OBJECTIVES = {"f1_macro": 1, "predict_batch_ms": -1, "model_mb": -1}
+
+# Relative differences within which two candidates tie on an objective
+TOLERANCES = {"f1_macro": 0.0, "predict_batch_ms": 0.1, "model_mb": 0.05}
+
+
+def candidates(engines=ENGINES, space=None):
+    """[(engine, params)] for every configuration in the search space of engines."""
+    if space is None:
+        space = SEARCH_SPACE
+    pool = []
+    for engine in engines:
+        model_pipeline.check_engine(engine)
+        pool.extend((engine, params) for params in ParameterGrid(space[engine]))
+    return pool
+
+
+def _compare(a, b, key):
+    """1 if record a beats b on objective key by more than its tolerance, -1 if b beats a, else 0."""
+    margin = TOLERANCES[key] * max(abs(a[key]), abs(b[key]))
+    diff = OBJECTIVES[key] * (a[key] - b[key])
+    if diff > margin:
+        return 1
+    if diff < -margin:
+        return -1
+    return 0
+
+
+def dominates(a, b):
+    """
+    True if record a is no worse than b on every objective and better on
+    one, differences within TOLERANCES counting as ties.
+    """
+    outcomes = [_compare(a, b, key) for key in OBJECTIVES]
+    return -1 not in outcomes and 1 in outcomes
+
+
+def pareto_ranks(records):
+    """Front of each record: 0 for the non-dominated ones, 1 once those are removed, ..."""
+    ranks = [None] * len(records)
+    remaining = set(range(len(records)))
+    rank = 0
+    while remaining:
+        front = {i for i in remaining
+                 if not any(dominates(records[j], records[i]) for j in remaining if j != i)}
+        for i in front:
+            ranks[i] = rank
+        remaining -= front
+        rank += 1
+    return ranks
+
+
+def pareto_front(records):
+    """The records no other record dominates, best F1 first."""
+    ranks = pareto_ranks(records)
+    front = [r for r, rank in zip(records, ranks) if rank == 0]
+    return sorted(front, key=lambda r: -r["f1_macro"])
+
+
+def row_order(y, random_state=42):
+    """
+    Positions of y in an order whose every prefix keeps about the class
+    proportions of y (each class's first row comes before any class's
+    second), so a rung's rows include the previous rung's.
+    """
+    shuffled = np.random.default_rng(random_state).permutation(len(y))
+    codes = pd.factorize(y.iloc[shuffled])[0]
+    within = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+    share = within / np.bincount(codes)[codes]
+    return shuffled[np.argsort(share, kind="stable")]
+
+
+def _scaled(engine, params, fraction):
+    """params with the engine's tree count cut to fraction of it."""
+    key = SIZE_PARAMS[engine]
+    return dict(params, **{key: max(MIN_TREES, math.ceil(params[key] * fraction))})
+
+
+def _evaluate(engine, params, encoded, X_val, y_train, y_val, rows, n_jobs):
+    """Fit one candidate on the given training rows and measure it."""
+    preprocessor, train, val, categorical = encoded
+    y_fit = y_train.iloc[rows]
+    _, build = model_variant(engine, **params)
+    model = build(class_weight=model_pipeline.balanced_class_weights(y_fit),
+                  categorical_features=categorical)
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=n_jobs)
+
+    with threadpool_limits(limits=n_jobs, user_api="openmp"):
+        start = time.perf_counter()
+        model.fit(train[rows], y_fit)
+        fit_seconds = time.perf_counter() - start
+
+        metrics = model_pipeline.evaluate_model(model, val, y_val)
+        # Latency and size of the pipeline as it would be saved and served
+        pipe = Pipeline([("prep", preprocessor), ("model", model)])
+        row_ms, batch_ms = predict_latency_ms(pipe, X_val)
+
+    return {
+        "fit_seconds": fit_seconds,
+        "predict_row_ms": row_ms,
+        "predict_batch_ms": batch_ms,
+        "model_mb": model_pipeline.model_size_bytes(pipe) / 2**20,
+        "accuracy": metrics["accuracy"],
+        "f1_macro": metrics["f1_macro"],
+    }
+
+
+def search_target(signData, target_col, budget_seconds=DEFAULT_SEARCH_BUDGET, engines=ENGINES,
+                  eta=ETA, n_rungs=N_RUNGS, max_categories=DEFAULT_MAX_CATEGORIES, n_jobs=None,
+                  columns=None, space=None):
+    """
+    Successive-halving search of one target (see the module docstring).
+    columns: pruned feature columns (see features.prune_features); pruned
+             for this target alone when None
+    n_jobs: cores per fit (None = one)
+
+    Returns {"target", "status", "candidates", "pareto", "rung",
+    "budget_exhausted", "seconds"}: every measured (candidate, rung) as a
+    dict with "engine", "params", "rung", "n_rows", "trees" and the
+    measurements of _evaluate, the Pareto front of the highest rung
+    reached, and that rung.
+    """
+    valid, msg = validate_target_column(signData, target_col)
+    if not valid:
+        print(f"[SKIP] {msg}")
+        return {"target": target_col, "status": "skip", "reason": msg}
+
+    start = time.perf_counter()
+    deadline = start + budget_seconds
+    n_jobs = effective_n_jobs(n_jobs) if n_jobs is not None else 1
+    if columns is None:
+        columns, _ = prune_features(signData, [target_col], max_categories)
+
+    data = signData.dropna(subset=[target_col])
+    X = data[feature_columns(columns, target_col)]
+    y = data[target_col]
+    X_train, X_val, y_train, y_val = model_pipeline.train_test_split_data(X, y)
+    order = row_order(y_train)
+
+    pool = candidates(engines, space)
+    encoded = {}
+    records = []
+    reached = []
+    rung = -1
+    exhausted = False
+    for step in range(n_rungs):
+        fraction = float(eta) ** (step - n_rungs + 1)
+        rows = order[:max(y_train.nunique(), math.ceil(fraction * len(order)))]
+        print(f"[INFO] {target_col}: rung {step}, {len(pool)} candidates on {len(rows)} rows")
+
+        evaluated = []
+        for engine, params in pool:
+            if time.perf_counter() >= deadline:
+                exhausted = True
+                break
+            # One preprocessor per engine, fitted on all the training rows
+            if engine not in encoded:
+                encoded[engine] = encode_split(X_train, X_val, engine)
+            fit_params = _scaled(engine, params, fraction)
+            record = {"engine": engine, "params": params, "rung": step, "n_rows": len(rows),
+                      "trees": fit_params[SIZE_PARAMS[engine]]}
+            record.update(_evaluate(engine, fit_params, encoded[engine], X_val, y_train, y_val,
+                                    rows, n_jobs))
+            evaluated.append(record)
+
+        records.extend(evaluated)
+        if evaluated:
+            reached, rung = evaluated, step
+        if exhausted:
+            print(f"[WARN] Search budget spent for {target_col} during rung {step}")
+            break
+
+        # Best fronts first, F1 within a front
+        ranks = pareto_ranks(evaluated)
+        best = sorted(range(len(evaluated)), key=lambda i: (ranks[i], -evaluated[i]["f1_macro"]))
+        keep = max(1, math.ceil(len(evaluated) / eta))
+        pool = [(evaluated[i]["engine"], evaluated[i]["params"]) for i in best[:keep]]
+
+    return {
+        "target": target_col,
+        "status": "ok",
+        "candidates": records,
+        "pareto": pareto_front(reached),
+        "rung": rung,
+        "budget_exhausted": exhausted,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _describe(params):
+    return ", ".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+
+def search_all_targets(signData, targets=None, budget_seconds=DEFAULT_SEARCH_BUDGET,
+                       engines=ENGINES, max_categories=DEFAULT_MAX_CATEGORIES, n_jobs=None):
+    """
+    search_target for every target, sharing budget_seconds between them
+    (what one target leaves unused goes to the next), and print the
+    Pareto-optimal configurations of each.
+    """
+    if targets is None:
+        targets = DEFAULT_TARGETS
+    columns, _ = prune_features(signData, targets, max_categories)
+
+    deadline = time.perf_counter() + budget_seconds
+    results = []
+    for i, target_col in enumerate(targets):
+        share = max(0.0, deadline - time.perf_counter()) / (len(targets) - i)
+        results.append(search_target(signData, target_col, budget_seconds=share, engines=engines,
+                                     n_jobs=n_jobs, columns=columns))
+
+    print("\n=== Pareto-optimal configurations ===")
+    print(f"{'target':<16} | {'engine':<6} | {'f1':>5} | {'per row':>9} | {'size':>9} | params")
+    for r in results:
+        if r["status"] != "ok":
+            print(f"{r['target']:<16} | SKIP ({r['reason']})")
+            continue
+        if not r["pareto"]:
+            print(f"{r['target']:<16} | no candidate measured within the budget")
+        for c in r["pareto"]:
+            print(
+                f"{r['target']:<16} | {c['engine']:<6} | {c['f1_macro']:.3f} | "
+                f"{c['predict_batch_ms']:7.4f}ms | {c['model_mb']:7.2f}MB | {_describe(c['params'])}"
+            )
+    return results
@@ -4,15 +4,34 @@ trainer.py
 High-level training orchestration for ASL models.
 """
 
+import hashlib
+import json
+import time
 from pathlib import Path
 import pandas as pd
+import sklearn
 import warnings
-from sklearn.utils.class_weight import compute_class_weight
-import numpy as np
+from joblib import Parallel, cpu_count, delayed
+from threadpoolctl import threadpool_limits
 
-from ml_scripts.config import DEFAULT_TARGETS, DEFAULT_MODELS_DIR
+from data_prep import cache
+from ml_scripts import artifacts, processor
+
+from ml_scripts.config import (
+    DEFAULT_ARTIFACT_FORMAT,
+    DEFAULT_ENGINE,
+    DEFAULT_MAX_CATEGORIES,
+    DEFAULT_MODELS_DIR,
+    DEFAULT_N_JOBS,
+    DEFAULT_TARGETS,
+)
+from ml_scripts.crossval import cross_validate, model_variant
 from ml_scripts.data_checker import validate_target_column
+from ml_scripts.encoding import SharedEncoding
+from ml_scripts.features import feature_columns, prune_features
 from ml_scripts.model_pipeline import (
+    balanced_class_weights,
+    build_model,
     build_pipeline,
     train_test_split_data,
     fit_model,
@@ -24,10 +43,22 @@ from ml_scripts.model_pipeline import (
 warnings.filterwarnings("ignore", message="Skipping features without any observed values*",)
 
 
-def train_one_target(signData, target_col, models_dir):
+def train_one_target(signData, target_col, models_dir, n_jobs=None, encoding=None,
+                     engine=DEFAULT_ENGINE, artifact_format=DEFAULT_ARTIFACT_FORMAT,
+                     fingerprint=None, cv=None, cv_repeats=1):
     """
     Train a model for a single target column.
-    
+    n_jobs: cores used to fit the forest's trees, or the boosting threads (None = one)
+    encoding: a SharedEncoding of signData to take the features from
+              instead of fitting a preprocessor for this target
+              (its engine is used then)
+    engine: "rf" or "hgb" (see config.ENGINES)
+    artifact_format: how the model file is written (see artifacts.py)
+    fingerprint: training_fingerprint() of this target, kept in the
+                 model's sidecar so an unchanged target is not retrained
+    cv: number of folds to cross-validate on instead of a single split
+        (cv_repeats times, see crossval.py); n_jobs then runs folds in
+        parallel. Nothing is saved: acc and f1_macro are fold means.
 
     """
     # make sure that there is a model dir
@@ -44,28 +75,50 @@ def train_one_target(signData, target_col, models_dir):
     print(f"[INFO] Training for target: {target_col}")
     print("==============================")
 
-    # Remove rows that have no label for this target to ensure we are only training on the target we want
-    data_trained = signData.dropna(subset=[target_col]).copy()
+    if encoding is not None and not cv:
+        # Labeled rows of the shared encoded matrix, minus this target's own columns
+        X, y = encoding.target_data(target_col)
+        engine = encoding.engine
+        features = feature_columns(encoding.columns, target_col)
+    else:
+        # Remove rows that have no label for this target to ensure we are only training on the target we want
+        data_trained = signData.dropna(subset=[target_col]).copy()
+        # y the data the model tries to learn
+        # X is all other info that helps predict y, except the target's own source columns
+        y = data_trained[target_col]
+        features = feature_columns(list(data_trained.columns), target_col)
+        X = data_trained[features]
+
     # if the target we are training on is empty skip ove it
-    if data_trained.empty:
+    if y.empty:
         msg = f"No data for {target_col}"
         print(f"[SKIP] {msg}")
         return {"target": target_col, "status": "skip", "reason": msg}
 
-    # y the data the model tries to learn
-    # X is all other info that helps predict y
-    y = data_trained[target_col]
-    X = data_trained.drop(columns=[target_col])
+    if cv:
+        # Each fold fits its own preprocessor, so the raw features are used
+        print(f"[INFO] Cross-validating {target_col}: {cv} folds x {cv_repeats} "
+              f"on {len(y)} rows...")
+        result = cross_validate(X, y, {engine: model_variant(engine)},
+                                n_splits=cv, n_repeats=cv_repeats, n_jobs=n_jobs)
+        scores = result[engine]
+        print(f"[INFO] {target_col:20s} | acc: {scores['acc_mean']:.3f} ± {scores['acc_std']:.3f}"
+              f" | f1: {scores['f1_mean']:.3f} ± {scores['f1_std']:.3f}")
+        return {
+            "target": target_col,
+            "status": "ok",
+            "acc": scores["acc_mean"],
+            "acc_std": scores["acc_std"],
+            "f1_macro": scores["f1_mean"],
+            "f1_std": scores["f1_std"],
+            "folds": result["folds"],
+            "fold_seconds": result["fold_seconds"],
+            "path": None,
+            "cached": False,
+        }
 
     #Compute class weights using sklearn
-    
-    classes = np.unique(y)
-    class_weights = compute_class_weight(
-        class_weight="balanced",
-        classes=classes,
-        y=y
-        )
-    class_weight_dict = {cls: w for cls, w in zip(classes, class_weights)}
+    class_weight_dict = balanced_class_weights(y)
 
 
     print("[WEIGHTS] Using class weights:")
@@ -82,22 +135,53 @@ def train_one_target(signData, target_col, models_dir):
     # test set: data used to check how well the model learned
     X_train, X_test, y_train, y_test = train_test_split_data(X, y)
 
-    # Build and fit pipeline with weights included
-    pipe = build_pipeline(X, class_weight=class_weight_dict)
-    print(f"[INFO] Fitting model for {target_col} on {len(X_train)} rows...")
-    pipe = fit_model(pipe, X_train, y_train)
+    # Gradient boosting runs on OpenMP threads rather than n_jobs; keep
+    # them within this target's share of the cores too
+    start = time.perf_counter()
+    with threadpool_limits(limits=n_jobs or 1, user_api="openmp"):
+        if encoding is not None:
+            # The features are already encoded: fit the model alone, then save
+            # it behind the shared preprocessor so it still takes a DataFrame
+            model = encoding.build_model(target_col, class_weight=class_weight_dict,
+                                         n_jobs=n_jobs)
+            print(f"[INFO] Fitting model for {target_col} on {X_train.shape[0]} rows...")
+            model = fit_model(model, X_train, y_train)
+            pipe = encoding.pipeline(target_col, model)
+        else:
+            # Build and fit pipeline with weights included
+            pipe = build_pipeline(X, class_weight=class_weight_dict, n_jobs=n_jobs,
+                                  engine=engine)
+            print(f"[INFO] Fitting model for {target_col} on {X_train.shape[0]} rows...")
+            pipe = fit_model(pipe, X_train, y_train)
+    fit_seconds = time.perf_counter() - start
     print("[INFO] Done fitting.")
 
-    # Evaluate
-    metrics = evaluate_model(pipe, X_test, y_test)
+    # The core budget only applies to training; the saved model is the same
+    # as a sequentially trained one and predicts on a single core
+    model = pipe.named_steps["model"]
+    if n_jobs is not None and "n_jobs" in model.get_params():
+        model.set_params(n_jobs=None)
+
+    # Evaluate; with a shared encoding X_test is already encoded, so only the model runs
+    scorer = pipe.named_steps["model"] if encoding is not None else pipe
+    metrics = evaluate_model(scorer, X_test, y_test)
     # accuracy: how many predictions are correct
     acc = metrics["accuracy"]
     # F1_score: how well the model handles all classes fairly
     f1m = metrics["f1_macro"]
     print(f"[INFO] {target_col:20s} | acc: {acc:.3f} | f1: {f1m:.3f}")
 
-    # Save model to a file
-    model_path = save_model(pipe, models_dir, target_col)
+    # Save model to a file, with what it was trained on in the metadata sidecar
+    stats = {
+        "engine": engine,
+        "n_train": len(y_train),
+        "n_test": len(y_test),
+        "accuracy": acc,
+        "f1_macro": f1m,
+        "fit_seconds": fit_seconds,
+    }
+    model_path = save_model(pipe, models_dir, target_col, artifact_format,
+                            features=features, stats=stats, fingerprint=fingerprint)
 
     return {
         "target": target_col,
@@ -105,18 +189,122 @@ def train_one_target(signData, target_col, models_dir):
         "acc": acc,
         "f1_macro": f1m,
         "path": str(model_path),
+        "cached": False,
+    }
+
+
+def _model_settings(X, engine, shared_encoding):
+    """Everything besides the data that decides what a trained model looks like."""
+    # Described from processor.py directly: building it here is not a fit
+    builder = (processor.build_native_preprocessor if engine == "hgb"
+               else processor.build_preprocessor)
+    preprocessor = builder(X.head(0))
+    model = build_model(engine=engine)
+    return {
+        "engine": engine,
+        "shared_encoding": shared_encoding,
+        # Steps and their settings; the columns are part of the feature list
+        "preprocessor": [(name, repr(est)) for name, est, _ in preprocessor.transformers],
+        # n_jobs does not change the fitted model
+        "model": {k: v for k, v in model.get_params().items() if k != "n_jobs"},
+        "sklearn": sklearn.__version__,
+    }
+
+
+def training_fingerprint(column_digests, target_col, features, settings):
+    """
+    Hash of what a target's model is trained from: the content of its
+    target and feature columns, the feature list and the model settings.
+    column_digests: {column: cache.frame_digest of that column}
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps({
+        "target": target_col,
+        "features": list(features),
+        "data": [column_digests[c] for c in [target_col, *features]],
+        "settings": settings,
+    }, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def cached_result(models_dir, target_col, fingerprint, artifact_format):
+    """
+    The result of an earlier training run of target_col with the same
+    fingerprint (and artifact format), read from its sidecar; None if the
+    model has to be trained.
+    """
+    path = artifacts.model_path(models_dir, target_col)
+    metadata = artifacts.read_metadata(path)
+    if (not path.exists() or metadata.get("fingerprint") != fingerprint
+            or metadata.get("format") != artifact_format):
+        return None
+    stats = metadata.get("stats", {})
+    return {
+        "target": target_col,
+        "status": "ok",
+        "acc": stats.get("accuracy"),
+        "f1_macro": stats.get("f1_macro"),
+        "path": str(path),
+        "cached": True,
     }
 
 
-def train_all_targets(signData, targets=None, models_dir=None):
+def split_core_budget(n_jobs, n_targets):
+    """
+    Split a core budget between targets trained at the same time and the
+    trees fitted in parallel within each target, so that
+    target_jobs * tree_jobs never exceeds the budget.
+
+    n_jobs: cores to use (-1 = all cores, -2 = all but one, ...); all
+            cores are the ones this process may use (CPU affinity and
+            container limits included), as joblib counts them
+    Returns (target_jobs, tree_jobs).
+    """
+    cores = cpu_count()
+    if n_jobs is None:
+        n_jobs = 1
+    elif n_jobs < 0:
+        n_jobs = max(1, cores + 1 + n_jobs)
+
+    target_jobs = max(1, min(n_jobs, n_targets))
+    tree_jobs = max(1, n_jobs // target_jobs)
+    return target_jobs, tree_jobs
+
+
+def train_all_targets(signData, targets=None, models_dir=None, n_jobs=DEFAULT_N_JOBS,
+                      shared_encoding=True, prune=True, max_categories=DEFAULT_MAX_CATEGORIES,
+                      engine=DEFAULT_ENGINE, artifact_format=DEFAULT_ARTIFACT_FORMAT,
+                      force=False, cv=None, cv_repeats=1):
     """
     Train models for a list of target columns on the given dataset.
 
     Steps:
     - Use default targets if none are given
     - Make sure the models folder exists
-    - Train each target one-by-one
-    - Collect results and return them
+    - Train each target one-by-one, or with n_jobs > 1 (or -1 for all
+      cores) several targets at once in worker processes
+    - Collect results and return them (always in the order of targets)
+
+    With shared_encoding (the default) the features of the whole frame are
+    encoded once and every target trains on a view of that matrix; without
+    it each target fits its own preprocessor.
+
+    With prune (the default) identifiers, constant columns and string
+    columns with more than max_categories values are left out of the
+    features (see features.py).
+
+    engine picks the model: "rf" (RandomForest on one-hot features, the
+    default) or "hgb" (gradient boosting on integer-coded categories).
+    artifact_format picks how models are written (see artifacts.py).
+
+    A target whose data, features and model settings are unchanged since
+    its saved model was trained (same training_fingerprint) is not trained
+    again: its saved metrics are returned with "cached": True. force=True
+    retrains every target anyway.
+
+    With cv (a number of folds) every target is cross-validated instead
+    (see train_one_target), one after another with n_jobs folds at once;
+    no model is saved.
     """
 
     # Use default folder if none is provided
@@ -132,12 +320,72 @@ def train_all_targets(signData, targets=None, models_dir=None):
     if targets is None:
         targets = DEFAULT_TARGETS
 
-    results = []
-    # Train each target one at a time
-    for target_col in targets:
-        res = train_one_target(signData, target_col, models_dir)
-        results.append(res)
+    # Leave ids, constant and high-cardinality columns out before encoding
+    if prune:
+        columns, dropped = prune_features(signData, targets, max_categories)
+        print(f"[INFO] Using {len(columns)} of {signData.shape[1]} columns "
+              f"({len(dropped)} pruned)")
+        signData = signData[columns]
+
+    # Cross-validation only scores the targets; nothing to cache or save
+    if cv:
+        return [
+            train_one_target(signData, target_col, models_dir, n_jobs=n_jobs, engine=engine,
+                             cv=cv, cv_repeats=cv_repeats)
+            for target_col in targets
+        ]
+
+    # Targets whose saved model was trained on the same data and settings
+    # are served from models_dir
+    results = {}
+    fingerprints = {}
+    present = [t for t in targets if t in signData.columns]
+    if present:
+        column_digests = {c: cache.frame_digest(signData, [c]) for c in signData.columns}
+        settings = _model_settings(signData, engine, shared_encoding)
+        for target_col in present:
+            features = feature_columns(list(signData.columns), target_col)
+            fingerprints[target_col] = training_fingerprint(
+                column_digests, target_col, features, settings
+            )
+            cached = None if force else cached_result(
+                models_dir, target_col, fingerprints[target_col], artifact_format
+            )
+            if cached is not None:
+                print(f"[CACHE] {target_col}: unchanged since {cached['path']} was trained")
+                results[target_col] = cached
+
+    to_train = [t for t in targets if t not in results]
+    if not to_train:
+        return [results[t] for t in targets]
+
+    target_jobs, tree_jobs = split_core_budget(n_jobs, len(to_train))
 
-    return results
+    # Impute, scale and one-hot encode (or integer-code, for "hgb") every
+    # column once for all targets
+    encoding = SharedEncoding(signData, engine=engine) if shared_encoding else None
 
+    if target_jobs == 1:
+        # Train each target one at a time
+        for target_col in to_train:
+            results[target_col] = train_one_target(
+                signData, target_col, models_dir,
+                n_jobs=tree_jobs if tree_jobs > 1 else None,
+                encoding=encoding, engine=engine, artifact_format=artifact_format,
+                fingerprint=fingerprints.get(target_col),
+            )
+        return [results[t] for t in targets]
 
+    # Train targets in parallel processes; each one fits its trees on its
+    # share of the cores so the machine is not oversubscribed
+    print(f"[INFO] Training {len(to_train)} targets on {target_jobs} processes "
+          f"x {tree_jobs} tree jobs")
+    trained = Parallel(n_jobs=target_jobs)(
+        delayed(train_one_target)(signData, target_col, models_dir, n_jobs=tree_jobs,
+                                  encoding=encoding, engine=engine,
+                                  artifact_format=artifact_format,
+                                  fingerprint=fingerprints.get(target_col))
+        for target_col in to_train
+    )
+    results.update(zip(to_train, trained))
+    return [results[t] for t in targets]
@@ -4,17 +4,30 @@ null_runner.py
 Run null (baseline) models on the ASL dataset and print a summary.
 """
 
+import argparse
+
+from data_prep.profiling import run_profiled
+from data_prep.schema import VIEWS
 from sign_data import get_sign_data
+from ml_scripts.config import DEFAULT_NULL_RESAMPLES
 from ml_scripts.null import null_all_targets
 
 
-def main():
+def main(view="canonical", categorical=False, profile=False, profile_log=None, cv=None,
+         cv_repeats=1, n_jobs=None, n_resamples=DEFAULT_NULL_RESAMPLES):
     print("Loading data...")
-    signData = get_sign_data()
+    # Null baselines only look at the targets, so by default only the
+    # canonical columns are read
+    signData = run_profiled(
+        lambda: get_sign_data(view=view, categorical=categorical),
+        show=profile, log_path=profile_log,
+    )
     print(f"[INFO] Data shape: {signData.shape}")
 
-    # Run null baselines for all default targets
-    results = null_all_targets(signData)
+    # Run null baselines for all default targets, over n_resamples random splits
+    # With cv, on cross-validation folds (n_jobs folds at once)
+    results = null_all_targets(signData, cv=cv, cv_repeats=cv_repeats, n_jobs=n_jobs,
+                               n_resamples=n_resamples)
 
     # Pretty summary
     print("\n=== Null Baseline Summary ===")
@@ -23,14 +36,85 @@ def main():
         if r.get("status") != "ok":
             reason = r.get("reason", "")
             print(f"{target:<18} | SKIPPED | {reason}")
-        else:
+        elif "folds" in r:
             print(
                 f"{target:<18} | "
-                f"maj_acc={r['acc_majority']:.3f} | maj_f1={r['f1_majority']:.3f} | "
-                f"strat_acc={r['acc_stratified']:.3f} | strat_f1={r['f1_stratified']:.3f}"
+                f"maj_acc={r['acc_majority']:.3f}±{r['acc_majority_std']:.3f} | "
+                f"maj_f1={r['f1_majority']:.3f}±{r['f1_majority_std']:.3f} | "
+                f"strat_acc={r['acc_stratified']:.3f}±{r['acc_stratified_std']:.3f} | "
+                f"strat_f1={r['f1_stratified']:.3f}±{r['f1_stratified_std']:.3f}"
             )
+        else:
+            # Score with its bootstrap confidence interval
+            scores = [
+                f"{name}={r[key]:.3f} [{r[key + '_ci'][0]:.3f}, {r[key + '_ci'][1]:.3f}]"
+                for name, key in [("maj_acc", "acc_majority"), ("maj_f1", "f1_majority"),
+                                  ("strat_acc", "acc_stratified"), ("strat_f1", "f1_stratified")]
+            ]
+            print(f"{target:<18} | " + " | ".join(scores))
 
 
-if __name__ == "__main__":
-    main()
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run null baselines on the ASL sign data.")
+    parser.add_argument(
+        "--view",
+        choices=sorted(VIEWS),
+        default="canonical",
+        help="Projection of the columns to load (default: canonical).",
+    )
+    parser.add_argument(
+        "--categorical",
+        action="store_true",
+        help="Load low-cardinality string columns as pandas Category.",
+    )
+    parser.add_argument(
+        "--resamples",
+        type=int,
+        default=DEFAULT_NULL_RESAMPLES,
+        help="Random splits (and bootstrap resamples) the baselines are computed over.",
+    )
+    parser.add_argument(
+        "--cv",
+        type=int,
+        default=None,
+        metavar="K",
+        help="Score the baselines on K stratified folds instead of one split.",
+    )
+    parser.add_argument(
+        "--cv-repeats",
+        type=int,
+        default=1,
+        help="Repeat the K folds with different shuffles (repeated k-fold).",
+    )
+    parser.add_argument(
+        "--n-jobs",
+        type=int,
+        default=None,
+        help="Folds scored at once with --cv (-1 = all cores).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-stage load timings and memory (see data_prep.profiling).",
+    )
+    parser.add_argument(
+        "--profile-log",
+        default=None,
+        metavar="PATH",
+        help="Append the load profile as one JSON line to PATH.",
+    )
+    return parser.parse_args()
+
 
+if __name__ == "__main__":
+    args = parse_args()
+    main(
+        view=args.view,
+        categorical=args.categorical,
+        profile=args.profile,
+        profile_log=args.profile_log,
+        cv=args.cv,
+        cv_repeats=args.cv_repeats,
+        n_jobs=args.n_jobs,
+        n_resamples=args.resamples,
+    )
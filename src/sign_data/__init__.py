@@ -1,3 +1,18 @@
-from .sign_data import get_sign_data
+from .sign_data import get_sign_data, publish_sign_data
+from .index import SignIndex, get_sign_index
+from .neighbors import find_minimal_pairs, get_neighborhood
+from .similarity import SignKNN, get_sign_knn
+from .search import SignSearch, get_sign_search
 
-__all__ = ["get_sign_data"]
+__all__ = [
+    "get_sign_data",
+    "publish_sign_data",
+    "SignIndex",
+    "get_sign_index",
+    "find_minimal_pairs",
+    "get_neighborhood",
+    "SignKNN",
+    "get_sign_knn",
+    "SignSearch",
+    "get_sign_search",
+]
@@ -12,6 +12,7 @@ import numpy as np
 import os
 import re
 
+from collections.abc import Mapping
 from pathlib import Path
 from dataclasses import dataclass
 
@@ -24,12 +25,18 @@ from dataclasses import dataclass
 
 # Class for storing parsed sign data
 # Data : Movement, Major Location, Minor Location, Handshape
+# attrs is anything with a dict-like .get(), e.g. a dict or a SignRow
 class Sign:
+	__slots__ = ("name", "attrs")
+
 	# Constructor
 	def __init__(self, name, attrs):
 		self.name  = name
 		self.attrs = attrs
 
+	def __repr__(self):
+		return f"Sign({self.name!r})"
+
 	# Property getter function
 	def get(self, field, default=None):
 		return self.attrs.get(field, default)
@@ -49,4 +56,81 @@ class Sign:
 		return self.attrs.get("Handshape")
 
 
+'''
+	---------------------
+	- Define Sign Table -
+	---------------------
+'''
+
+# One row of a SignTable, read straight from the table's column arrays
+class SignRow:
+	__slots__ = ("_table", "_pos")
+
+	def __init__(self, table, pos):
+		self._table = table
+		self._pos   = pos
+
+	def get(self, field, default=None):
+		values = self._table.column(field)
+		if values is None:
+			return default
+		return values[self._pos]
+
+	def __getitem__(self, field):
+		values = self._table.column(field)
+		if values is None:
+			raise KeyError(field)
+		return values[self._pos]
+
+	def __contains__(self, field):
+		return field in self._table.frame.columns
+
+	def keys(self):
+		return self._table.frame.columns
+
+	def to_dict(self):
+		return {field: self[field] for field in self.keys()}
+
+
+# All signs in a dataset, backed by the columnar frame
+# Lookup by name is a dict hit; Sign views are only created when accessed
+# Like the old dict of signs, a repeated name maps to its last row
+class SignTable(Mapping):
+	__slots__ = ("frame", "key", "_index", "_columns")
+
+	def __init__(self, frame: pd.DataFrame, key="LemmaID"):
+		self.frame    = frame
+		self.key      = key
+		self._index   = {name: pos for pos, name in enumerate(frame[key].to_numpy())}
+		# column name -> numpy array, filled on first access
+		self._columns = {}
+
+	# Column values as a numpy array, or None if the column does not exist
+	def column(self, field):
+		values = self._columns.get(field)
+		if values is None and field in self.frame.columns:
+			values = self._columns[field] = self.frame[field].to_numpy()
+		return values
+
+	# Row position of a sign in the frame
+	def position(self, name):
+		return self._index[name]
+
+	# Sign view for a row position, e.g. from an index query
+	def sign_at(self, pos):
+		return Sign(self.column(self.key)[pos], SignRow(self, pos))
+
+	def __getitem__(self, name):
+		return Sign(name, SignRow(self, self._index[name]))
+
+	def __contains__(self, name):
+		return name in self._index
+
+	def __iter__(self):
+		return iter(self._index)
+
+	def __len__(self):
+		return len(self._index)
 
+	def __repr__(self):
+		return f"SignTable({len(self)} signs)"
@@ -0,0 +1,146 @@
+"""
+index.py
+
+Inverted index over the canonical sign attributes.
+
+Each attribute value maps to the sorted row ids of the signs that have it
+(stored in the smallest unsigned integer dtype that fits), so a query like
+"Handshape 5 at MajorLocation Head with a straight Movement" is a few set
+intersections instead of a boolean scan of the whole DataFrame.
+"""
+
+import time
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+import data_prep.prepareData
+from data_prep.schema import CANONICAL_ATTRIBUTES
+from sign_data.classes import SignTable
+from sign_data.sign_data import get_sign_data
+
+
+def _row_dtype(n_rows):
+    for dtype in (np.uint16, np.uint32):
+        if n_rows <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+
+def _postings(values, dtype):
+    """value -> sorted array of the rows holding it (missing values skipped)."""
+    codes, uniques = pd.factorize(values, sort=False)
+    order = np.argsort(codes, kind="stable").astype(dtype)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+    # Rows with a missing value (code -1) sort first; skip past them
+    start = int((codes < 0).sum())
+    bounds = start + np.concatenate([[0], np.cumsum(counts)])
+    return {
+        value: order[bounds[i]:bounds[i + 1]]
+        for i, value in enumerate(uniques)
+    }
+
+
+class SignIndex:
+    """
+    Attribute value -> row id sets for a sign DataFrame.
+
+    Criteria are passed as keyword arguments, one per attribute. All
+    attributes must match (AND); a list of values for one attribute
+    matches any of them (OR):
+
+        index.query(Handshape="5", MajorLocation=["Head", "Neutral"])
+
+    ``any_of`` takes several such criteria dicts and ORs them together.
+    """
+
+    def __init__(self, frame, attributes=None, key="LemmaID"):
+        if attributes is None:
+            attributes = CANONICAL_ATTRIBUTES
+
+        self.table = SignTable(frame, key=key)
+        self.attributes = list(attributes)
+        self.n_rows = len(frame)
+
+        dtype = _row_dtype(self.n_rows)
+        self._all = np.arange(self.n_rows, dtype=dtype)
+        self._empty = np.empty(0, dtype=dtype)
+        self._postings = {
+            attr: _postings(frame[attr].to_numpy(), dtype)
+            for attr in self.attributes
+        }
+
+    def values(self, attribute):
+        """Distinct values of an attribute and how many signs have each."""
+        return {value: len(rows) for value, rows in self._postings[attribute].items()}
+
+    def _rows_for(self, attribute, value):
+        postings = self._postings.get(attribute)
+        if postings is None:
+            msg = f"{attribute} is not indexed (indexed: {self.attributes})"
+            raise KeyError(msg)
+
+        if isinstance(value, (list, tuple, set, frozenset)):
+            lists = [postings.get(v, self._empty) for v in value]
+            if not lists:
+                return self._empty
+            return reduce(np.union1d, lists)
+        return postings.get(value, self._empty)
+
+    def rows(self, **criteria):
+        """Sorted row ids of the signs matching every criterion."""
+        if not criteria:
+            return self._all
+
+        # Intersect starting from the smallest set to keep the work small
+        sets = sorted(
+            (self._rows_for(attr, value) for attr, value in criteria.items()),
+            key=len,
+        )
+        result = sets[0]
+        for rows in sets[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, rows, assume_unique=True)
+        return result
+
+    def any_rows(self, *clauses):
+        """Sorted row ids matching at least one of the criteria dicts."""
+        lists = [self.rows(**clause) for clause in clauses]
+        if not lists:
+            return self._empty
+        return reduce(np.union1d, lists)
+
+    def signs(self, rows):
+        """Sign views for a set of row ids."""
+        return [self.table.sign_at(int(pos)) for pos in rows]
+
+    def query(self, **criteria):
+        """Signs matching every criterion (see class docstring)."""
+        return self.signs(self.rows(**criteria))
+
+    def any_of(self, *clauses):
+        """Signs matching at least one of the criteria dicts."""
+        return self.signs(self.any_rows(*clauses))
+
+    def count(self, **criteria):
+        return len(self.rows(**criteria))
+
+    def timed_query(self, **criteria):
+        """Run ``query`` and return (signs, latency in microseconds)."""
+        start = time.perf_counter()
+        signs = self.query(**criteria)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+        return signs, elapsed_us
+
+
+def get_sign_index():
+    """
+    SignIndex over get_sign_data(), built on first use and shared for the
+    rest of the process.
+    """
+    return data_prep.prepareData.memoized(
+        "sign_index", lambda: SignIndex(get_sign_data())
+    )
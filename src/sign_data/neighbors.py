@@ -0,0 +1,170 @@
+"""
+neighbors.py
+
+Minimal pairs (phonological neighbors): pairs of signs that differ in
+exactly one of Handshape, Movement, MajorLocation and MinorLocation.
+
+Instead of comparing every sign with every other sign, each feature is
+masked in turn and the signs are grouped on the remaining features. Two
+signs in the same group that differ in the masked feature are a minimal
+pair, so the work is one sort per feature plus the size of the output.
+"""
+
+import numpy as np
+import pandas as pd
+
+import data_prep.prepareData
+from data_prep import cache
+from sign_data.sign_data import get_sign_data
+
+PAIR_FEATURES = ["Handshape", "Movement", "MajorLocation", "MinorLocation"]
+
+
+def _expand_ranges(starts, ends):
+    """
+    For each i, every position in [starts[i], ends[i]).
+    Returns (owner, position) arrays with one entry per pair.
+    """
+    lengths = ends - starts
+    total = int(lengths.sum())
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return owner, offsets + np.arange(total)
+
+
+def _run_ends(change):
+    """Exclusive end position of the run each sorted position belongs to."""
+    n = len(change)
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], n)
+    return np.repeat(ends, np.diff(np.append(starts, n)))
+
+
+def find_minimal_pairs(frame, features=None, key="LemmaID"):
+    """
+    All pairs of signs differing in exactly one feature.
+
+    Signs with a missing value in any feature are left out. Returns a
+    DataFrame with one row per pair: sign_a, sign_b (in frame order),
+    feature, value_a, value_b, plus row_a / row_b positions in ``frame``.
+    """
+    if features is None:
+        features = PAIR_FEATURES
+
+    complete = frame[features].notna().all(axis=1).to_numpy()
+    rows = np.flatnonzero(complete)
+
+    codes = np.empty((len(features), len(rows)), dtype=np.int64)
+    for i, feature in enumerate(features):
+        codes[i], _ = pd.factorize(frame[feature].to_numpy()[rows])
+
+    pair_a, pair_b, masked = [], [], []
+    for i in range(len(features)):
+        others = [j for j in range(len(features)) if j != i]
+
+        # Sort by the other features, then by the masked one
+        order = np.lexsort([codes[i]] + [codes[j] for j in reversed(others)])
+        rest = codes[others][:, order]
+        own = codes[i][order]
+
+        n = len(order)
+        if n < 2:
+            continue
+        new_group = np.ones(n, dtype=bool)
+        new_group[1:] = (rest[:, 1:] != rest[:, :-1]).any(axis=0)
+        new_block = new_group.copy()
+        new_block[1:] |= own[1:] != own[:-1]
+
+        # Partners of a sign: later signs in its group with another value
+        owner, partner = _expand_ranges(_run_ends(new_block), _run_ends(new_group))
+        a, b = rows[order[owner]], rows[order[partner]]
+        pair_a.append(np.minimum(a, b))
+        pair_b.append(np.maximum(a, b))
+        masked.append(np.full(len(a), i, dtype=np.int8))
+
+    if pair_a:
+        row_a, row_b = np.concatenate(pair_a), np.concatenate(pair_b)
+        feature_ids = np.concatenate(masked)
+    else:
+        row_a = row_b = np.empty(0, dtype=np.int64)
+        feature_ids = np.empty(0, dtype=np.int8)
+
+    order = np.lexsort([row_b, row_a])
+    row_a, row_b, feature_ids = row_a[order], row_b[order], feature_ids[order]
+
+    names = frame[key].to_numpy()
+    feature_names = np.asarray(features, dtype=object)[feature_ids]
+    value_a = np.empty(len(row_a), dtype=object)
+    value_b = np.empty(len(row_a), dtype=object)
+    for i, feature in enumerate(features):
+        hit = feature_ids == i
+        values = frame[feature].to_numpy()
+        value_a[hit] = values[row_a[hit]]
+        value_b[hit] = values[row_b[hit]]
+
+    return pd.DataFrame({
+        "sign_a": names[row_a],
+        "sign_b": names[row_b],
+        "feature": feature_names,
+        "value_a": value_a,
+        "value_b": value_b,
+        "row_a": row_a,
+        "row_b": row_b,
+    })
+
+
+def neighborhood_density(pairs, frame, features=None, key="LemmaID"):
+    """
+    Number of minimal-pair neighbors per sign, aligned with ``frame``.
+    Signs missing one of the features get NaN.
+    """
+    if features is None:
+        features = PAIR_FEATURES
+
+    counts = np.bincount(
+        np.concatenate([pairs["row_a"].to_numpy(), pairs["row_b"].to_numpy()]),
+        minlength=len(frame),
+    ).astype(float)
+    counts[~frame[features].notna().all(axis=1).to_numpy()] = np.nan
+
+    return pd.DataFrame({
+        key: frame[key].to_numpy(),
+        "NeighborhoodDensity": counts,
+    })
+
+
+def load_neighborhood(frame, features=None, key="LemmaID",
+                      cache_dir=None, use_cache=True):
+    """
+    Minimal pairs and neighborhood density for ``frame``, cached on disk
+    under a digest of the columns they were computed from.
+
+    Returns {"pairs": DataFrame, "density": DataFrame}.
+    """
+    if features is None:
+        features = PAIR_FEATURES
+    if cache_dir is None:
+        cache_dir = data_prep.prepareData.CACHE_DIR
+
+    digest = cache.frame_digest(frame, [key, *features])
+    if use_cache:
+        cached = cache.load_derived(cache_dir, "neighborhood", digest)
+        if cached is not None:
+            return cached
+
+    pairs = find_minimal_pairs(frame, features, key)
+    result = {
+        "pairs": pairs,
+        "density": neighborhood_density(pairs, frame, features, key),
+    }
+
+    if use_cache:
+        cache.store_derived(result, cache_dir, "neighborhood", digest)
+    return result
+
+
+def get_neighborhood():
+    """Minimal pairs and density for get_sign_data(), loaded once per process."""
+    return data_prep.prepareData.memoized(
+        "neighborhood", lambda: load_neighborhood(get_sign_data())
+    )
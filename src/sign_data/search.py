@@ -0,0 +1,164 @@
+"""
+search.py
+
+Type-ahead search over sign names (LemmaID, plus EntryID when the data has
+it) for the annotation tools.
+
+- Prefix search keeps the case-folded names in one sorted list, so a
+  lookup is a binary search plus a walk over the matches.
+- Fuzzy search uses symmetric deletes (as in SymSpell): every name is
+  stored under each string obtained by deleting up to ``max_distance``
+  characters, and a query only looks up its own deletes. The few
+  candidates this yields are then checked with a bounded edit distance,
+  so no query scans the whole lexicon.
+"""
+
+from bisect import bisect_left
+from itertools import combinations
+
+import data_prep.parseData
+import data_prep.prepareData
+
+DEFAULT_LIMIT = 20
+DEFAULT_MAX_DISTANCE = 2
+
+# Name columns searched besides the table key, when present
+ALIAS_COLUMNS = ("EntryID",)
+
+
+def _fold(name):
+    return str(name).casefold()
+
+
+def _deletes(word, max_distance):
+    """Every string obtained by deleting up to max_distance characters."""
+    found = {word}
+    for n in range(1, min(max_distance, len(word)) + 1):
+        for drop in combinations(range(len(word)), n):
+            found.add("".join(c for i, c in enumerate(word) if i not in drop))
+    return found
+
+
+def bounded_edit_distance(a, b, max_distance):
+    """
+    Levenshtein distance between a and b, or None if it exceeds
+    max_distance (the computation stops as soon as that is certain).
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > max_distance:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+class SignSearch:
+    """
+    Prefix and fuzzy lookup of signs by name, case-insensitive.
+
+        search = SignSearch(signs)
+        search.prefix("boo")       # [Sign, ...] in name order
+        search.fuzzy("bok")        # [(Sign, distance), ...] closest first
+        search.lookup("bok")       # prefix matches, then fuzzy ones
+    """
+
+    def __init__(self, table, aliases=ALIAS_COLUMNS, max_distance=DEFAULT_MAX_DISTANCE):
+        self.table = table
+        self.max_distance = max_distance
+
+        # folded search term -> sign names it stands for
+        names = {}
+        for name in table:
+            if isinstance(name, str):
+                names.setdefault(_fold(name), []).append(name)
+        keys = table.column(table.key)
+        for column in aliases:
+            values = table.column(column)
+            if values is None:
+                continue
+            for key, alias in zip(keys, values):
+                if isinstance(key, str) and isinstance(alias, str) and alias:
+                    names.setdefault(_fold(alias), []).append(key)
+        self._names = {term: list(dict.fromkeys(found)) for term, found in names.items()}
+
+        self._sorted = sorted(self._names)
+        self._deletes = {}
+        for term in self._sorted:
+            for deleted in _deletes(term, max_distance):
+                self._deletes.setdefault(deleted, []).append(term)
+
+    def _signs(self, names):
+        return [self.table[name] for name in names]
+
+    def prefix_names(self, query, limit=DEFAULT_LIMIT):
+        """Sign names with a name or alias starting with ``query``."""
+        query = _fold(query)
+        found = {}
+        i = bisect_left(self._sorted, query)
+        while i < len(self._sorted) and self._sorted[i].startswith(query):
+            found.update(dict.fromkeys(self._names[self._sorted[i]]))
+            if len(found) >= limit:
+                break
+            i += 1
+        return list(found)[:limit]
+
+    def prefix(self, query, limit=DEFAULT_LIMIT):
+        """Signs with a name or alias starting with ``query``, in name order."""
+        return self._signs(self.prefix_names(query, limit))
+
+    def fuzzy_names(self, query, max_distance=None, limit=DEFAULT_LIMIT):
+        """(sign name, edit distance) within max_distance, closest first."""
+        if max_distance is None:
+            max_distance = self.max_distance
+        if max_distance > self.max_distance:
+            msg = f"max_distance {max_distance} exceeds the index's {self.max_distance}"
+            raise ValueError(msg)
+
+        query = _fold(query)
+        candidates = set()
+        for deleted in _deletes(query, max_distance):
+            candidates.update(self._deletes.get(deleted, ()))
+
+        scored = []
+        for term in candidates:
+            distance = bounded_edit_distance(query, term, max_distance)
+            if distance is not None:
+                scored.append((distance, term))
+        scored.sort()
+
+        found = {}
+        for distance, term in scored:
+            for name in self._names[term]:
+                found.setdefault(name, distance)
+        return list(found.items())[:limit]
+
+    def fuzzy(self, query, max_distance=None, limit=DEFAULT_LIMIT):
+        """Signs within ``max_distance`` edits of ``query``, closest first."""
+        return [
+            (self.table[name], distance)
+            for name, distance in self.fuzzy_names(query, max_distance, limit)
+        ]
+
+    def lookup(self, query, limit=DEFAULT_LIMIT):
+        """What a type-ahead box shows: prefix matches, then fuzzy matches."""
+        names = dict.fromkeys(self.prefix_names(query, limit))
+        if len(names) < limit:
+            for name, _ in self.fuzzy_names(query, limit=limit):
+                names.setdefault(name)
+        return self._signs(list(names)[:limit])
+
+
+def get_sign_search():
+    """SignSearch over parseData.signs, built on first use."""
+    return data_prep.prepareData.memoized(
+        "sign_search", lambda: SignSearch(data_prep.parseData.get_signs())
+    )
@@ -5,7 +5,10 @@ Helpers for loading ASL sign data.
 """
 
 import pandas as pd
-import data_prep.parseData
+import data_prep.prepareData
+import data_prep.profiling
+import data_prep.schema
+import data_prep.sources
 
 
 def _ensure_canonical_columns(signData: pd.DataFrame) -> pd.DataFrame:
@@ -13,55 +16,79 @@ def _ensure_canonical_columns(signData: pd.DataFrame) -> pd.DataFrame:
     Make sure the DataFrame has canonical columns:
     Movement, MajorLocation, MinorLocation, Handshape.
 
-    Uses parseData.attemptRowGet on each row if they are missing.
+    Frames loaded through prepareData.load_sign_data already carry them;
+    anything else is resolved with prepareData.ensure_canonical_columns.
     """
-    df = signData
+    return data_prep.prepareData.ensure_canonical_columns(signData)
 
-    # Only make a copy if we actually need to add something
-    needs_copy = any(
-        col not in df.columns
-        for col in ["Movement", "MajorLocation", "MinorLocation", "Handshape"]
-    )
-    if needs_copy:
-        df = df.copy()
-
-    # Add each canonical column only if it doesn't already exist
-    if "Movement" not in df.columns:
-        df["Movement"] = df.apply(
-            lambda row: data_prep.parseData.attemptRowGet(row, "Movement"), axis=1
-        )
 
-    if "MajorLocation" not in df.columns:
-        df["MajorLocation"] = df.apply(
-            lambda row: data_prep.parseData.attemptRowGet(row, "MajorLocation"), axis=1
+def _load_sign_data(columns=None, categorical=False, chunksize=None,
+                    sources=()) -> pd.DataFrame:
+    signData = data_prep.prepareData.get_sign_frame(
+        columns=columns, categorical=categorical, chunksize=chunksize
+    )
+    if signData is None:
+        raise RuntimeError(
+            "Data not loaded. Make sure parseData.py can see ../Data/... "
+            "and signdata.csv exists."
         )
 
-    if "MinorLocation" not in df.columns:
-        df["MinorLocation"] = df.apply(
-            lambda row: data_prep.parseData.attemptRowGet(row, "MinorLocation"), axis=1
-        )
+    signData = _ensure_canonical_columns(signData)
 
-    if "Handshape" not in df.columns:
-        df["Handshape"] = df.apply(
-            lambda row: data_prep.parseData.attemptRowGet(row, "Handshape"), axis=1
-        )
+    if sources:
+        signData = data_prep.sources.with_sources(signData, sources)
 
-    return df
+    print(f"[INFO] Data shape: {signData.shape}")
+    return signData
 
 
-def get_sign_data() -> pd.DataFrame:
+def get_sign_data(view=None, columns=None, categorical=False,
+                  chunksize=None, sources=(), profile=False):
     """
     Return the parsed ASL sign DataFrame, enriched with canonical columns:
     Movement, MajorLocation, MinorLocation, Handshape.
+
+    Nothing is read until the first call; later calls in the same process
+    return the same frame, so treat it as read-only. In worker processes
+    started for publish_sign_data(), the frame is attached zero-copy from
+    the published files instead (string columns come back as Category).
+
+    view / columns  : only load a projection of the columns
+                      (see data_prep.schema.VIEWS, e.g. view="canonical")
+    categorical     : store low-cardinality string codes as pandas Category
+    chunksize       : on a cold cache, stream the csv in chunks of this many
+                      rows into the cache instead of parsing it in one go
+    sources         : optional ASL-LEX tables to join on by LemmaID, e.g.
+                      ("frequency", "iconicity"); see data_prep.sources
+    profile         : return (frame, record) where record is a dict of
+                      per-stage timings, memory figures and cache hits
+                      (see data_prep.profiling)
     """
-    signData = data_prep.parseData.signData
-    if signData is None:
-        raise RuntimeError(
-            "Data not loaded. Make sure parseData.py can see ../Data/... "
-            "and signdata.csv exists."
-        )
+    if profile:
+        with data_prep.profiling.profile_load() as record:
+            signData = get_sign_data(view, columns, categorical, chunksize, sources)
+        return signData, record.as_dict()
 
-    signData = _ensure_canonical_columns(signData)
+    sources = tuple(sorted(set(sources)))
+    if sources and columns is not None:
+        # Sources are joined on LemmaID, so a projection has to keep it
+        columns = [*columns, "LemmaID"]
+    columns = data_prep.schema.resolve_columns(view, columns)
+    return data_prep.prepareData.memoized(
+        ("get_sign_data", columns, categorical, sources),
+        lambda: _load_sign_data(columns, categorical, chunksize, sources),
+    )
 
-    print(f"[INFO] Data shape: {signData.shape}")
-    return signData
+
+def publish_sign_data(directory=None, view=None):
+    """
+    Publish the sign data as read-only memory-mapped files for worker
+    processes (training workers, DataLoader workers, ...), so they share one
+    copy instead of each loading their own. Start them with
+    data_prep.shared.worker_env(directory) as their environment, or with
+    data_prep.shared.use_in_worker as a pool initializer.
+    Returns the directory, or None if the data could not be loaded.
+    """
+    if directory is None:
+        directory = data_prep.prepareData.SHARED_DIR
+    return data_prep.prepareData.publish_sign_frame(directory, view=view)
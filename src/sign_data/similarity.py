@@ -0,0 +1,221 @@
+"""
+similarity.py
+
+k nearest neighbors of every sign under a weighted phonological distance.
+
+Each feature is integer-encoded once; the distance between two signs is
+the sum of the weights of the features they differ in (a weighted Hamming
+distance), with a feature missing on either side counting half its weight.
+The matching part is a matrix product of one-hot encoded features, and
+all distances are computed block by block with NumPy, so memory stays
+bounded by ``block_bytes`` however large the lexicon, and only the top-k
+list of each sign is kept. The lists are saved as an ``.npz`` file in the
+cache, so a query is a dictionary lookup plus an array slice.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import data_prep.prepareData
+from data_prep import cache
+from sign_data.classes import SignTable
+from sign_data.sign_data import get_sign_data
+
+# Feature -> weight. The canonical attributes count fully, the other coded
+# ASL-LEX columns half; features missing from the frame are skipped.
+DEFAULT_WEIGHTS = {
+    "Handshape": 1.0,
+    "Movement": 1.0,
+    "MajorLocation": 1.0,
+    "MinorLocation": 1.0,
+    "SignType.2.0": 0.5,
+    "SecondMinorLocation.2.0": 0.5,
+    "SelectedFingers.2.0": 0.5,
+    "Flexion.2.0": 0.5,
+    "FlexionChange.2.0": 0.5,
+    "Spread.2.0": 0.5,
+    "SpreadChange.2.0": 0.5,
+    "ThumbPosition.2.0": 0.5,
+    "ThumbContact.2.0": 0.5,
+    "Contact.2.0": 0.5,
+    "RepeatedMovement.2.0": 0.5,
+    "NonDominantHandshape.2.0": 0.5,
+    "UlnarRotation.2.0": 0.5,
+}
+
+DEFAULT_K = 10
+
+# Memory for one block of the distance matrix and its temporaries
+DEFAULT_BLOCK_BYTES = 64 * 2**20
+
+
+def encode_features(frame, features):
+    """(n_signs, n_features) int32 codes, -1 where a value is missing."""
+    codes = np.empty((len(frame), len(features)), dtype=np.int32)
+    for j, feature in enumerate(features):
+        codes[:, j], _ = pd.factorize(frame[feature].to_numpy())
+    return codes
+
+
+def _one_hot(codes, weights):
+    """
+    Weighted one-hot matrix of the codes and the weighted missing-value
+    matrix, so that matching features become a matrix product.
+    """
+    n, n_features = codes.shape
+    offsets = np.concatenate([[0], np.cumsum(codes.max(axis=0, initial=-1) + 1)])
+    one_hot = np.zeros((n, int(offsets[-1])), dtype=np.float32)
+    missing = (codes < 0).astype(np.float32)
+    for j in range(n_features):
+        present = codes[:, j] >= 0
+        one_hot[np.flatnonzero(present), offsets[j] + codes[present, j]] = weights[j]
+    return one_hot, missing
+
+
+def _block_distances(block, one_hot, missing, weights):
+    """
+    Weighted Hamming distances from the rows ``block`` to every sign:
+    total weight, minus the weight of matching features (a matrix
+    product of the one-hot codes), minus half the weight of features
+    missing on either side.
+    """
+    weighted_missing = missing * weights
+    a_missing = weighted_missing[block].sum(axis=1, keepdims=True)
+    b_missing = weighted_missing.sum(axis=1)[None, :]
+    both_missing = weighted_missing[block] @ missing.T
+
+    matched = (one_hot[block] > 0) @ one_hot.T
+    return weights.sum() - matched - (a_missing + b_missing - both_missing) / 2
+
+
+def _top_k(dist, k):
+    """
+    Column ids and distances of the k smallest entries per row, nearest
+    first. Ties are broken by the lower column id, so results do not
+    depend on the block size.
+    """
+    kth = np.partition(dist, k - 1, axis=1)[:, k - 1, None]
+    below = dist < kth
+    # Fill up with the first columns exactly at the k-th distance
+    need = k - below.sum(axis=1, keepdims=True)
+    at = dist == kth
+    chosen = below | (at & (np.cumsum(at, axis=1) <= need))
+
+    cols = np.nonzero(chosen)[1].reshape(len(dist), k)
+    picked = np.take_along_axis(dist, cols, axis=1)
+    order = np.argsort(picked, axis=1, kind="stable")
+    return np.take_along_axis(cols, order, axis=1), np.take_along_axis(picked, order, axis=1)
+
+
+def nearest_neighbors(codes, weights, k=DEFAULT_K, block_bytes=DEFAULT_BLOCK_BYTES):
+    """
+    Top-k neighbors of every row of ``codes`` (the row itself excluded).
+    Returns (neighbors, distances), both shaped (n, k).
+    """
+    n = len(codes)
+    k = min(k, n - 1)
+    weights = np.asarray(weights, dtype=np.float32)
+    neighbors = np.empty((n, max(k, 0)), dtype=np.int32)
+    distances = np.empty((n, max(k, 0)), dtype=np.float32)
+    if k <= 0:
+        return neighbors, distances
+
+    one_hot, missing = _one_hot(codes, weights)
+
+    # float32 distances plus bool and int64 temporaries per cell
+    block_rows = max(1, block_bytes // (n * 16))
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        dist = _block_distances(slice(start, stop), one_hot, missing, weights)
+        dist[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        neighbors[start:stop], distances[start:stop] = _top_k(dist, k)
+    return neighbors, distances
+
+
+class SignKNN:
+    """
+    Precomputed k nearest neighbors per sign.
+
+        knn.similar("book")          # [(Sign, distance), ...] nearest first
+        knn.similar("book", k=3)
+    """
+
+    def __init__(self, frame, neighbors, distances, features, weights, key="LemmaID"):
+        self.table = SignTable(frame, key=key)
+        self.neighbors = neighbors
+        self.distances = distances
+        self.features = list(features)
+        self.weights = list(weights)
+        self.k = neighbors.shape[1]
+
+    def neighbor_rows(self, name, k=None):
+        """Row ids and distances of the nearest signs to ``name``."""
+        pos = self.table.position(name)
+        k = self.k if k is None else min(k, self.k)
+        return self.neighbors[pos, :k], self.distances[pos, :k]
+
+    def similar(self, name, k=None):
+        """The signs nearest to ``name`` with their distances, nearest first."""
+        rows, dist = self.neighbor_rows(name, k)
+        return [(self.table.sign_at(int(r)), float(d)) for r, d in zip(rows, dist)]
+
+
+def _digest(frame, features, weights, k, key):
+    h = hashlib.blake2b(digest_size=12)
+    h.update(cache.frame_digest(frame, [key, *features]).encode())
+    h.update(json.dumps([list(weights), k]).encode())
+    return h.hexdigest()
+
+
+def build_knn(frame, weights=None, k=DEFAULT_K, key="LemmaID",
+              cache_dir=None, use_cache=True, block_bytes=DEFAULT_BLOCK_BYTES):
+    """
+    SignKNN over ``frame``. The neighbor lists are saved in the cache under
+    a digest of the features, weights and k, and read back while those stay
+    the same.
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    if cache_dir is None:
+        cache_dir = data_prep.prepareData.CACHE_DIR
+
+    features = [f for f in weights if f in frame.columns]
+    if not features:
+        msg = f"None of the weighted features {list(weights)} are in the frame"
+        raise ValueError(msg)
+    feature_weights = [float(weights[f]) for f in features]
+
+    path = Path(cache_dir) / f"knn-{_digest(frame, features, feature_weights, k, key)}.npz"
+    if use_cache and path.exists():
+        try:
+            with np.load(path) as saved:
+                return SignKNN(frame, saved["neighbors"], saved["distances"],
+                               features, feature_weights, key)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[cache] Ignoring unreadable cache file {path}: {e}")
+
+    codes = encode_features(frame, features)
+    neighbors, distances = nearest_neighbors(codes, feature_weights, k, block_bytes)
+
+    if use_cache:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp.npz")
+            np.savez(tmp, neighbors=neighbors, distances=distances)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[cache] Failed to write {path}: {e}")
+
+    return SignKNN(frame, neighbors, distances, features, feature_weights, key)
+
+
+def get_sign_knn():
+    """SignKNN over get_sign_data(), built or read on first use."""
+    return data_prep.prepareData.memoized(
+        "sign_knn", lambda: build_knn(get_sign_data())
+    )
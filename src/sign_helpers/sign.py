@@ -1,52 +1,13 @@
 '''
 
-classes.py
+sign.py
 
-PURPOSE : Repository for general-use classes.
+PURPOSE : Sign classes, kept here for older imports.
 
-'''
-
-# Import packages
-import pandas as pd
-import numpy as np
-import os
-import re
-
-from pathlib import Path
-from dataclasses import dataclass
+The classes live in sign_data/classes.py.
 
-
-'''
-	---------------------
-	- Define Sign Class -
-	---------------------
 '''
 
-# Class for storing parsed sign data
-# Data : Movement, Major Location, Minor Location, Handshape
-class Sign:
-	# Constructor
-	def __init__(self, name, attrs):
-		self.name  = name
-		self.attrs = attrs
-
-	# Property getter function
-	def get(self, field, default=None):
-		return self.attrs.get(field, default)
-
-	# Define sign properties
-	@property
-	def movement(self):  
-		return self.attrs.get("Movement")
-	@property
-	def majorLocation(self):  
-		return self.attrs.get("MajorLocation")
-	@property
-	def minorLocation(self):
-		return self.attrs.get("MinorLocation")
-	@property
-	def handshape(self): 
-		return self.attrs.get("Handshape")
-
-
+from sign_data.classes import Sign, SignRow, SignTable
 
+__all__ = ["Sign", "SignRow", "SignTable"]
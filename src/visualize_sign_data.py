@@ -2,6 +2,10 @@
 Entry point for running visualizations on parsed sign data.
 """
 
+import argparse
+
+from data_prep.profiling import run_profiled
+from data_prep.schema import VIEWS
 from sign_helpers.sign_data import get_sign_data
 
 # Apply global plot styling (Seaborn + Matplotlib)
@@ -16,12 +20,15 @@ from visualization import (
     save_summary_stats,
 )
 
-def main():
+def main(view=None, categorical=False, profile=False, profile_log=None):
     # Initialize global plotting settings (only runs once)
     configure_plots()
 
     # Load processed DataFrame with canonical ASL features
-    signData = get_sign_data()
+    signData = run_profiled(
+        lambda: get_sign_data(view=view, categorical=categorical),
+        show=profile, log_path=profile_log,
+    )
     if signData is None or signData.empty:
         raise RuntimeError("Sign data not available or empty")
 
@@ -48,5 +55,38 @@ def main():
 
     print(f"[runner] All visualizations saved in: {output_folder}")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Create figures for the ASL sign data.")
+    parser.add_argument(
+        "--view",
+        choices=sorted(VIEWS),
+        default=None,
+        help="Only load this projection of the columns (default: all columns).",
+    )
+    parser.add_argument(
+        "--categorical",
+        action="store_true",
+        help="Load low-cardinality string columns as pandas Category.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-stage load timings and memory (see data_prep.profiling).",
+    )
+    parser.add_argument(
+        "--profile-log",
+        default=None,
+        metavar="PATH",
+        help="Append the load profile as one JSON line to PATH.",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(
+        view=args.view,
+        categorical=args.categorical,
+        profile=args.profile,
+        profile_log=args.profile_log,
+    )
@@ -0,0 +1,109 @@
+import os
+
+import pandas as pd
+import pytest
+
+from data_prep import cache
+from data_prep.prepareData import load_sign_data
+
+
+def write_sign_csv(path, handshape="5"):
+    pd.DataFrame({
+        "LemmaID": ["hello", "bye"],
+        "Movement.2.0": ["straight", "curved"],
+        "MajorLocation.2.0": ["Head", "Neutral"],
+        "MinorLocation.2.0": ["Forehead", "Neutral"],
+        "Handshape.2.0": [handshape, "B"],
+    }).to_csv(path, index=False)
+
+
+def test_miss_then_hit(tmp_path):
+    csv_path = tmp_path / "signdata.csv"
+    cache_dir = tmp_path / "cache"
+    write_sign_csv(csv_path)
+
+    # Nothing cached yet
+    assert cache.load(csv_path, cache_dir, "canonical") is None
+
+    df = pd.read_csv(csv_path)
+    entry = cache.store(df, csv_path, cache_dir, "canonical")
+    assert (entry / cache.META_NAME).exists()
+
+    cached = cache.load(csv_path, cache_dir, "canonical")
+    pd.testing.assert_frame_equal(cached, df)
+
+
+def test_touched_file_is_still_a_hit(tmp_path):
+    csv_path = tmp_path / "signdata.csv"
+    cache_dir = tmp_path / "cache"
+    write_sign_csv(csv_path)
+    cache.store(pd.read_csv(csv_path), csv_path, cache_dir, "canonical")
+
+    # Same content, new mtime: the content hash keeps the entry valid
+    st = csv_path.stat()
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    assert cache.load(csv_path, cache_dir, "canonical") is not None
+
+
+def test_edited_file_invalidates_entry(tmp_path):
+    csv_path = tmp_path / "signdata.csv"
+    cache_dir = tmp_path / "cache"
+    write_sign_csv(csv_path, handshape="5")
+    cache.store(pd.read_csv(csv_path), csv_path, cache_dir, "canonical")
+
+    # Same size, different content
+    write_sign_csv(csv_path, handshape="A")
+
+    assert cache.load(csv_path, cache_dir, "canonical") is None
+
+
+def _age(path, seconds=60):
+    # Old enough that its mtime is outside the racy window
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+def test_known_digest_reads_the_file_only_when_it_changed(tmp_path, monkeypatch):
+    csv_path = tmp_path / "signdata.csv"
+    write_sign_csv(csv_path)
+    _age(csv_path)
+    digest = cache.known_digest(csv_path, tmp_path / "cache")
+    assert digest == cache.file_digest(csv_path)
+
+    with monkeypatch.context() as m:
+        m.setattr(cache, "file_digest", lambda *a, **k: pytest.fail("re-hashed"))
+        assert cache.known_digest(csv_path, tmp_path / "cache") == digest
+
+    write_sign_csv(csv_path, handshape="A")
+    assert cache.known_digest(csv_path, tmp_path / "cache") == cache.file_digest(csv_path) != digest
+
+
+def test_store_derived_replaces_only_its_own_older_entries(tmp_path):
+    cache.store_derived([1], tmp_path, "merged-frequency", "aaa")
+    cache.store_derived([2], tmp_path, "merged-frequency+iconicity", "bbb")
+    cache.store_derived([3], tmp_path, "merged-frequency", "ccc", replace=True)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "merged-frequency+iconicity-bbb.pkl",
+        "merged-frequency-ccc.pkl",
+    ]
+    assert cache.load_derived(tmp_path, "merged-frequency", "ccc") == [3]
+
+
+def test_load_sign_data_caches_canonical_columns(tmp_path, capsys):
+    csv_path = tmp_path / "signdata.csv"
+    cache_dir = tmp_path / "cache"
+    write_sign_csv(csv_path)
+
+    first = load_sign_data(csv_path, cache_dir=cache_dir)
+    assert list(first["Handshape"]) == ["5", "B"]
+    assert "from cache" not in capsys.readouterr().out
+
+    second = load_sign_data(csv_path, cache_dir=cache_dir)
+    assert "from cache" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_load_sign_data_missing_file(tmp_path):
+    assert load_sign_data(tmp_path / "missing.csv", cache_dir=tmp_path) is None
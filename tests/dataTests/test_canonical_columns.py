@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_prep.prepareData import (
+    CANONICAL_ATTRIBUTES,
+    attemptRowGet,
+    ensure_canonical_columns,
+    resolve_canonical_column,
+)
+
+
+def row_wise(df, prefix):
+    # The original per-row resolution the vectorized version must match
+    return df.apply(lambda row: attemptRowGet(row, prefix), axis=1)
+
+
+@pytest.fixture
+def versioned_df():
+    return pd.DataFrame({
+        "Movement.2.0": ["straight", np.nan, None, "arc"],
+        "MovementM2.2.0": ["x", "y", None, "z"],
+        "MovementM4.2.0": ["p", "q", "r", "s"],
+        "HandshapeM3.2.0": [np.nan, "B", "5", np.nan],
+        "MajorLocation.2.0": [1.0, np.nan, 3.0, 4.0],
+        "other": [1, 2, 3, 4],
+    }, dtype=object).astype({"MajorLocation.2.0": float, "other": int})
+
+
+@pytest.mark.parametrize("prefix", ["Movement", "Handshape", "MajorLocation"])
+def test_matches_attemptRowGet(versioned_df, prefix):
+    expected = row_wise(versioned_df, prefix)
+    result = resolve_canonical_column(versioned_df, prefix)
+
+    pd.testing.assert_series_equal(result, expected, check_dtype=False)
+
+
+def test_none_falls_through_but_nan_does_not(versioned_df):
+    result = resolve_canonical_column(versioned_df, "Movement")
+
+    # NaN in the first column is kept, None falls through two columns
+    assert result.tolist()[:1] == ["straight"]
+    assert pd.isna(result.iloc[1])
+    assert result.iloc[2] == "r"
+
+
+def test_missing_attribute_gives_none(versioned_df, capfd):
+    result = resolve_canonical_column(versioned_df, "MinorLocation")
+
+    assert result.tolist() == [None] * 4
+    out, _ = capfd.readouterr()
+    # Reported once for the column, not once per row
+    assert out.count("MinorLocation attribute does not exist") == 1
+
+
+def test_ensure_canonical_columns_adds_all(versioned_df):
+    df = ensure_canonical_columns(versioned_df)
+
+    for attr in CANONICAL_ATTRIBUTES:
+        assert attr in df.columns
+    assert "Movement" not in versioned_df.columns
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from data_prep import prepareData, profiling
+from data_prep.prepareData import read_csv, resolve_csv_engine
+
+
+@pytest.fixture
+def latin1_csv(tmp_path):
+    path = tmp_path / "signdata.csv"
+    # A latin1 character, a short row, which is padded, and a row with too
+    # many fields, which is skipped unless usecols leaves its extra field out
+    path.write_bytes(
+        "LemmaID,Handshape.2.0,Trial\n"
+        "caf\xe9,5,1\n"
+        "short,B\n"
+        "bad,B,2,extra\n"
+        "book,A,3\n".encode("latin1")
+    )
+    return path
+
+
+@pytest.fixture
+def clean_csv(tmp_path):
+    path = tmp_path / "clean.csv"
+    path.write_bytes("LemmaID,Handshape.2.0,Trial\ncaf\xe9,5,1\nbook,A,3\n".encode("latin1"))
+    return path
+
+
+def test_unknown_engine_raises():
+    with pytest.raises(ValueError, match="csv engine"):
+        resolve_csv_engine("polars")
+
+
+def test_auto_uses_c_parser_without_pyarrow(monkeypatch):
+    monkeypatch.setattr(prepareData, "has_pyarrow", lambda: False)
+    assert resolve_csv_engine("auto") == "c"
+
+
+def test_pyarrow_engine_falls_back_when_not_installed(latin1_csv, monkeypatch):
+    monkeypatch.setattr(prepareData, "has_pyarrow", lambda: False)
+
+    data = read_csv(latin1_csv, engine="pyarrow")
+    pd.testing.assert_frame_equal(data, read_csv(latin1_csv, engine="c"))
+    assert data["LemmaID"].tolist() == ["café", "short", "book"]
+    assert data["Trial"].isna().tolist() == [False, True, False]
+
+
+def test_pyarrow_engine_falls_back_when_arrow_fails(latin1_csv, monkeypatch):
+    def fail(*args, **kwargs):
+        raise ValueError("arrow failure")
+
+    monkeypatch.setattr(prepareData, "has_pyarrow", lambda: True)
+    monkeypatch.setattr(prepareData, "_read_csv_arrow", fail)
+
+    data = read_csv(latin1_csv, engine="pyarrow")
+    assert data["LemmaID"].tolist() == ["café", "short", "book"]
+
+
+def test_usecols_callable_is_resolved_against_the_header(latin1_csv):
+    usecols = prepareData._usecols_list(latin1_csv, lambda name: name != "Trial")
+    assert usecols == ["LemmaID", "Handshape.2.0"]
+
+
+@pytest.mark.parametrize("usecols", [None, lambda name: name != "Trial"], ids=["all", "callable"])
+@pytest.mark.parametrize(("csv", "used"), [("clean_csv", "pyarrow"), ("latin1_csv", "c")])
+def test_pyarrow_engine_matches_c_parser(csv, used, usecols, request):
+    pytest.importorskip("pyarrow")
+    path = request.getfixturevalue(csv)
+
+    with profiling.profile_load(trace_memory=False) as profile:
+        arrow = read_csv(path, usecols=usecols, engine="pyarrow")
+    c = read_csv(path, usecols=usecols, engine="c")
+    pd.testing.assert_frame_equal(arrow, c, check_dtype=False)
+    # Rows with the wrong number of fields send the whole file to the C parser
+    assert profile.events[-1]["used"] == used
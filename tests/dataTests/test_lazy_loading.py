@@ -0,0 +1,72 @@
+import importlib
+
+import pandas as pd
+import pytest
+
+from data_prep import parseData, prepareData
+import sign_data.sign_data
+import sign_helpers.sign_data
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo():
+    # Every test starts (and leaves) with nothing loaded
+    prepareData.reset_loaded_data()
+    yield
+    prepareData.reset_loaded_data()
+
+
+@pytest.fixture
+def counted_loader(monkeypatch):
+    calls = {"n": 0}
+    df = pd.DataFrame({
+        "LemmaID": ["hello"],
+        "Movement.2.0": ["straight"],
+        "MajorLocation.2.0": ["Neutral"],
+        "MinorLocation.2.0": ["Neutral"],
+        "Handshape.2.0": ["5"],
+    })
+
+    def fake_load_sign_data(*args, **kwargs):
+        calls["n"] += 1
+        return prepareData.ensure_canonical_columns(df)
+
+    monkeypatch.setattr(prepareData, "load_sign_data", fake_load_sign_data)
+    return calls
+
+
+def test_import_does_not_read_csv(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("csv read at import time")
+
+    monkeypatch.setattr(prepareData, "read_csv", fail)
+    monkeypatch.setattr(prepareData, "load_sign_data", fail)
+
+    importlib.reload(parseData)
+    importlib.reload(sign_data.sign_data)
+
+
+def test_get_sign_data_loads_once(counted_loader):
+    first = sign_data.sign_data.get_sign_data()
+    second = sign_helpers.sign_data.get_sign_data()
+
+    assert first is second
+    assert counted_loader["n"] == 1
+    assert first["Handshape"].tolist() == ["5"]
+
+
+def test_signs_attribute_is_lazy_and_shared(counted_loader):
+    assert counted_loader["n"] == 0
+
+    signs = parseData.signs
+    assert parseData.signs is signs
+    assert parseData.signData is prepareData.signData
+    assert "hello" in signs
+    assert counted_loader["n"] == 1
+
+
+def test_missing_data_raises_on_use_not_import(monkeypatch):
+    monkeypatch.setattr(prepareData, "load_sign_data", lambda *a, **k: None)
+
+    with pytest.raises(RuntimeError):
+        sign_data.sign_data.get_sign_data()
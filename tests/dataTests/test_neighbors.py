@@ -0,0 +1,75 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sign_data.neighbors import (
+    PAIR_FEATURES,
+    find_minimal_pairs,
+    load_neighborhood,
+)
+
+
+def brute_force_pairs(df):
+    # The nested loop this module replaces
+    pairs = set()
+    complete = df.dropna(subset=PAIR_FEATURES)
+    for (i, a), (j, b) in itertools.combinations(complete.iterrows(), 2):
+        diff = [f for f in PAIR_FEATURES if a[f] != b[f]]
+        if len(diff) == 1:
+            pairs.add((i, j, diff[0]))
+    return pairs
+
+
+@pytest.fixture
+def lexicon():
+    rng = np.random.default_rng(0)
+    n = 120
+    df = pd.DataFrame({
+        "LemmaID": [f"sign_{i}" for i in range(n)],
+        "Handshape": rng.choice(["5", "B", "A"], size=n),
+        "Movement": rng.choice(["straight", "arc"], size=n),
+        "MajorLocation": rng.choice(["Head", "Neutral", "Body"], size=n),
+        "MinorLocation": rng.choice(["Chin", "Forehead"], size=n),
+    })
+    df.loc[[3, 17], "Movement"] = np.nan
+    return df
+
+
+def test_matches_brute_force(lexicon):
+    pairs = find_minimal_pairs(lexicon)
+    found = set(zip(pairs["row_a"], pairs["row_b"], pairs["feature"]))
+
+    assert found == brute_force_pairs(lexicon)
+    assert len(found) == len(pairs)
+
+
+def test_pair_values_differ_in_named_feature():
+    df = pd.DataFrame({
+        "LemmaID": ["mother", "father", "fine", "twin"],
+        "Handshape": ["5", "5", "5", "5"],
+        "Movement": ["tap", "tap", "tap", "tap"],
+        "MajorLocation": ["Head", "Head", "Body", "Head"],
+        "MinorLocation": ["Chin", "Forehead", "Chest", "Chin"],
+    })
+    pairs = find_minimal_pairs(df)
+
+    # twin is an exact duplicate of mother, so they are not a pair
+    assert pairs[["sign_a", "sign_b", "feature", "value_a", "value_b"]].values.tolist() == [
+        ["mother", "father", "MinorLocation", "Chin", "Forehead"],
+        ["father", "twin", "MinorLocation", "Forehead", "Chin"],
+    ]
+
+
+def test_density_is_cached(lexicon, tmp_path):
+    result = load_neighborhood(lexicon, cache_dir=tmp_path)
+    density = result["density"].set_index("LemmaID")["NeighborhoodDensity"]
+
+    assert np.isnan(density["sign_3"])
+    expected = pd.concat([result["pairs"]["sign_a"], result["pairs"]["sign_b"]]).value_counts()
+    assert density["sign_0"] == expected.get("sign_0", 0)
+
+    assert list(tmp_path.glob("neighborhood-*.pkl"))
+    again = load_neighborhood(lexicon, cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(again["pairs"], result["pairs"])
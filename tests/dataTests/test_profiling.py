@@ -0,0 +1,81 @@
+import json
+
+import pandas as pd
+import pytest
+
+from data_prep import prepareData, profiling
+from data_prep.prepareData import load_sign_data
+
+
+@pytest.fixture
+def sign_csv(tmp_path):
+    path = tmp_path / "signdata.csv"
+    pd.DataFrame({
+        "LemmaID": ["a", "b", "c"],
+        "Handshape.2.0": ["5", "B", "5"],
+    }).to_csv(path, index=False)
+    return path
+
+
+def _stage_names(profile):
+    return [s["stage"] for s in profile.stages]
+
+
+def test_stages_are_noops_without_a_profile():
+    with profiling.stage("csv_parse"):
+        pass
+    profiling.event("cache", hit=True)
+
+
+def test_cold_then_warm_load_records_stages_and_cache_hits(sign_csv, tmp_path):
+    cache_dir = tmp_path / "cache"
+
+    with profiling.profile_load() as cold:
+        load_sign_data(sign_csv, cache_dir=cache_dir)
+    with profiling.profile_load() as warm:
+        load_sign_data(sign_csv, cache_dir=cache_dir)
+
+    assert _stage_names(cold) == ["cache_lookup", "csv_parse", "canonical_columns", "cache_store"]
+    assert _stage_names(warm) == ["cache_lookup"]
+    cache_events = [e for e in cold.events + warm.events if e["event"] == "cache"]
+    assert [e["hit"] for e in cache_events] == [False, True]
+    assert all("peak_alloc_mb" in s for s in cold.stages)
+
+
+def test_csv_parse_is_tagged_with_the_engine_that_ran(sign_csv, monkeypatch):
+    monkeypatch.setattr(prepareData, "has_pyarrow", lambda: False)
+    with profiling.profile_load(trace_memory=False) as profile:
+        load_sign_data(sign_csv, use_cache=False, engine="pyarrow")
+
+    parse = next(s for s in profile.stages if s["stage"] == "csv_parse")
+    assert parse["engine"] == "c"
+    assert {"event": "csv_engine", "requested": "pyarrow", "used": "c"} in profile.events
+
+
+def test_record_is_json_and_appends_one_line(sign_csv, tmp_path):
+    log = tmp_path / "logs" / "load.jsonl"
+    for _ in range(2):
+        with profiling.profile_load(trace_memory=False) as profile:
+            load_sign_data(sign_csv, use_cache=False)
+        profile.append_to(log)
+
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    assert len(records) == 2
+    assert records[0]["total_seconds"] >= 0
+    assert "csv_parse" in [s["stage"] for s in records[0]["stages"]]
+    assert "peak_alloc_mb" not in records[0]["stages"][0]
+
+
+def test_profile_if_disabled_yields_none():
+    with profiling.profile_if(False) as profile:
+        assert profile is None
+
+
+def test_run_profiled_reports_only_when_asked(tmp_path, capsys):
+    assert profiling.run_profiled(lambda: 42) == 42
+    assert "[profile]" not in capsys.readouterr().out
+
+    log = tmp_path / "profile.jsonl"
+    assert profiling.run_profiled(lambda: 42, show=True, log_path=log) == 42
+    assert "[profile] get_sign_data" in capsys.readouterr().out
+    assert json.loads(log.read_text().splitlines()[0])["label"] == "get_sign_data"
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from data_prep import schema
+from data_prep.prepareData import load_sign_data
+
+
+@pytest.fixture
+def sign_csv(tmp_path):
+    path = tmp_path / "signdata.csv"
+    pd.DataFrame({
+        "LemmaID": [f"sign_{i}" for i in range(8)],
+        "EntryID": [f"entry_{i}" for i in range(8)],
+        "Handshape.2.0": ["5", "B", "5", "A", "B", "5", "A", "5"],
+        "HandshapeM2.2.0": ["B", "B", "C", "A", "B", "B", "A", "C"],
+        "Movement.2.0": ["straight", "arc"] * 4,
+        "Frequency": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_resolve_columns():
+    assert schema.resolve_columns() is None
+    assert schema.resolve_columns("full") is None
+    assert schema.resolve_columns("canonical") == ("LemmaID",)
+    assert schema.resolve_columns("canonical", ["Frequency"]) == ("Frequency", "LemmaID")
+
+    with pytest.raises(ValueError, match="Unknown view"):
+        schema.resolve_columns("nope")
+
+
+def test_projection_reads_only_needed_columns(sign_csv, tmp_path):
+    df = load_sign_data(sign_csv, cache_dir=tmp_path / "cache", columns=("LemmaID",))
+
+    assert "EntryID" not in df.columns
+    assert "Frequency" not in df.columns
+    # Canonical columns are still resolved from their versioned sources
+    assert df["Handshape"].tolist()[:2] == ["5", "B"]
+
+
+def test_categorical_uses_shared_vocabulary(sign_csv, tmp_path):
+    cache_dir = tmp_path / "cache"
+    df = load_sign_data(sign_csv, cache_dir=cache_dir, categorical=True)
+
+    assert isinstance(df["Handshape"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["HandshapeM2.2.0"].dtype, pd.CategoricalDtype)
+    # Identifiers and numbers stay as they are
+    assert not isinstance(df["LemmaID"].dtype, pd.CategoricalDtype)
+    assert df["Frequency"].dtype == float
+
+    # Versioned columns and the canonical column share one vocabulary
+    vocabulary = schema.load_vocabulary(cache_dir)
+    assert vocabulary["columns"]["HandshapeM2.2.0"] == "Handshape"
+    assert list(df["HandshapeM2.2.0"].cat.categories) == vocabulary["categories"]["Handshape"]
+
+
+def test_vocabulary_codes_are_stable(sign_csv, tmp_path):
+    cache_dir = tmp_path / "cache"
+    first = load_sign_data(sign_csv, cache_dir=cache_dir, categorical=True)
+
+    # A new value later on is appended, existing codes do not move
+    other = tmp_path / "other.csv"
+    pd.DataFrame({
+        "LemmaID": [f"x{i}" for i in range(4)],
+        "Handshape.2.0": ["0", "5", "0", "5"],
+    }).to_csv(other, index=False)
+    second = load_sign_data(other, cache_dir=cache_dir, categorical=True)
+
+    codes_first = dict(zip(first["Handshape"], first["Handshape"].cat.codes))
+    codes_second = dict(zip(second["Handshape"], second["Handshape"].cat.codes))
+    assert codes_second["5"] == codes_first["5"]
+    assert "0" not in codes_first
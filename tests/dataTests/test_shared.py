@@ -0,0 +1,139 @@
+import mmap
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_prep import prepareData, shared
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo(monkeypatch):
+    monkeypatch.delenv(shared.SHARED_ENV, raising=False)
+    prepareData.reset_loaded_data()
+    yield
+    prepareData.reset_loaded_data()
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "LemmaID": ["a", "b", "c", "d"],
+        "Handshape": pd.Categorical(["5", "B", None, "5"]),
+        "Movement": ["arc", "straight", "arc", None],
+        "MajorLocation": ["Head", "Head", "Neutral", "Arm"],
+        "MinorLocation": ["Chin", "Eye", None, "Wrist"],
+        "Trial": [1, 2, 3, 4],
+        "Score": [0.5, np.nan, 1.5, 2.0],
+    })
+
+
+def _is_mapped(values):
+    base = values
+    while base is not None and not isinstance(base, mmap.mmap):
+        base = getattr(base, "base", None)
+    return base is not None
+
+
+def test_attach_round_trips_values(frame, tmp_path):
+    directory = shared.publish(frame, tmp_path / "shared")
+    attached = shared.attach(directory)
+
+    strings = ["LemmaID", "Movement", "MajorLocation", "MinorLocation"]
+    expected = frame.astype(dict.fromkeys(strings, "category"))
+    pd.testing.assert_frame_equal(attached, expected, check_categorical=False)
+
+
+def test_attach_maps_columns_without_copying(frame, tmp_path):
+    attached = shared.attach(shared.publish(frame, tmp_path / "shared"))
+
+    trial = attached["Trial"].to_numpy()
+    codes = attached["Handshape"].array.codes
+    for values in (trial, codes):
+        assert not values.flags.writeable
+        assert _is_mapped(values)
+
+
+def test_attach_keeps_only_requested_columns(frame, tmp_path):
+    directory = shared.publish(frame, tmp_path / "shared")
+    attached = shared.attach(directory, ["LemmaID", "Score"])
+    assert attached.columns.tolist() == ["LemmaID", "Score"]
+
+
+def test_publish_keeps_a_non_default_index(frame, tmp_path):
+    indexed = frame.set_index("LemmaID")
+    attached = shared.attach(shared.publish(indexed, tmp_path / "shared"))
+    assert attached.index.tolist() == ["a", "b", "c", "d"]
+    assert attached.index.name == "LemmaID"
+
+
+@pytest.fixture
+def published(frame, tmp_path, monkeypatch):
+    """publish_sign_frame() of frame, parsed from a stand-in signdata.csv."""
+    csv = tmp_path / "signdata.csv"
+    frame.to_csv(csv, index=False)
+    monkeypatch.setattr(prepareData, "SIGNDATA_PATH", csv)
+    monkeypatch.setattr(prepareData, "load_sign_data", lambda *a, **k: frame)
+    return prepareData.publish_sign_frame(tmp_path / "shared")
+
+
+def test_publishing_process_keeps_its_own_frame(frame, published):
+    assert shared.SHARED_ENV not in os.environ
+    assert prepareData.get_sign_frame() is frame
+    assert shared.worker_env(published, {})[shared.SHARED_ENV] == str(published)
+
+
+def test_worker_refuses_a_dataset_published_from_an_older_csv(published, monkeypatch):
+    csv = prepareData.SIGNDATA_PATH
+    csv.write_text(csv.read_text() + "e,5,arc,Head,Chin,5,3.0\n")
+    with pytest.raises(ValueError, match="older signdata.csv"):
+        shared.attach(published, source_path=csv)
+
+    monkeypatch.setenv(shared.SHARED_ENV, "")  # so the worker setting is undone
+    shared.use_in_worker(published)
+    with pytest.raises(ValueError, match="publish it again"):
+        prepareData.get_sign_frame()
+
+
+def test_attach_refuses_columns_that_were_not_published(frame, tmp_path):
+    directory = shared.publish(frame, tmp_path / "shared")
+    with pytest.raises(ValueError, match="no column 'Gloss'"):
+        shared.attach(directory, ["LemmaID", "Gloss"])
+
+
+def test_worker_refuses_a_narrower_publish(frame, published, monkeypatch):
+    monkeypatch.setenv(shared.SHARED_ENV, str(published))
+    shared.publish(frame, published)  # no settings: not categorical
+    with pytest.raises(ValueError, match="without categorical=True"):
+        prepareData.get_sign_frame(categorical=True)
+
+    prepareData.publish_sign_frame(published, view="canonical")
+    assert "LemmaID" in prepareData.get_sign_frame(view="canonical")
+    with pytest.raises(ValueError, match="not every column"):
+        prepareData.get_sign_frame()
+    with pytest.raises(ValueError, match="without Gloss"):
+        prepareData.get_sign_frame(columns=["Gloss"])
+
+
+def test_worker_process_attaches_through_get_sign_data(published):
+    directory = published
+
+    # The worker has no csv to read: it can only get the data from the files
+    code = (
+        "from data_prep import prepareData\n"
+        "prepareData.load_sign_data = None\n"
+        "from sign_data import get_sign_data\n"
+        "df = get_sign_data()\n"
+        "print(df.shape, df['Trial'].sum())\n"
+    )
+    env = shared.worker_env(directory, {**os.environ, "PYTHONPATH": str(SRC)})
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    assert "(4, 7) 10" in out
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sign_data.index import SignIndex
+
+
+@pytest.fixture
+def index():
+    df = pd.DataFrame({
+        "LemmaID": ["hello", "bye", "yes", "no", "maybe"],
+        "Handshape": ["5", "B", "5", "5", np.nan],
+        "MajorLocation": ["Head", "Neutral", "Head", "Neutral", "Head"],
+        "MinorLocation": ["Forehead", "Neutral", "Chin", "Neutral", "Chin"],
+        "Movement": ["straight", "curved", "straight", "arc", "straight"],
+    })
+    return SignIndex(df)
+
+
+def names(signs):
+    return sorted(s.name for s in signs)
+
+
+def test_conjunctive_query(index):
+    signs = index.query(Handshape="5", MajorLocation="Head", Movement="straight")
+    assert names(signs) == ["hello", "yes"]
+    assert signs[0].handshape == "5"
+
+
+def test_disjunctive_values(index):
+    signs = index.query(Handshape="5", Movement=["arc", "curved"])
+    assert names(signs) == ["no"]
+
+    assert names(index.any_of({"Handshape": "B"}, {"Movement": "arc"})) == ["bye", "no"]
+
+
+def test_matches_boolean_scan(index):
+    df = index.table.frame
+    mask = (df["MajorLocation"] == "Head") & (df["Movement"] == "straight")
+    expected = sorted(df.loc[mask, "LemmaID"])
+    assert names(index.query(MajorLocation="Head", Movement="straight")) == expected
+
+
+def test_missing_values_and_unknowns(index):
+    # NaN is not indexed as a value
+    assert index.values("Handshape") == {"5": 3, "B": 1}
+    assert index.query(Handshape="Z") == []
+    assert index.count() == 5
+
+    with pytest.raises(KeyError, match="not indexed"):
+        index.query(Orientation="up")
+
+
+def test_timed_query_reports_microseconds(index):
+    signs, latency_us = index.timed_query(Handshape="5")
+    assert len(signs) == 3
+    assert latency_us > 0
+    assert index.rows(Handshape="5").dtype == np.uint16
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from sign_data.classes import SignTable
+from sign_data.search import SignSearch, bounded_edit_distance
+
+
+@pytest.fixture
+def search():
+    frame = pd.DataFrame({
+        "LemmaID": ["book", "booklet", "boot", "cook", "Bicycle", "apple_1"],
+        "EntryID": ["book", "booklet", "boot", "cook", "bicycle", "apple"],
+        "Handshape": ["B", "B", "S", "C", "S", "A"],
+    })
+    return SignSearch(SignTable(frame))
+
+
+def test_prefix_is_case_insensitive_and_sorted(search):
+    assert [s.name for s in search.prefix("BOO")] == ["book", "booklet", "boot"]
+    assert [s.name for s in search.prefix("bi")] == ["Bicycle"]
+    assert search.prefix("zebra") == []
+
+
+def test_prefix_matches_aliases(search):
+    assert [s.name for s in search.prefix("apple")] == ["apple_1"]
+
+
+def test_prefix_respects_limit(search):
+    assert len(search.prefix("b", limit=2)) == 2
+
+
+def test_fuzzy_finds_names_within_distance(search):
+    found = [(s.name, d) for s, d in search.fuzzy("bok")]
+    assert found[0] == ("book", 1)
+    assert ("boot", 2) in found
+    assert all(d <= 2 for _, d in found)
+    assert "Bicycle" not in dict(found)
+
+
+def test_fuzzy_rejects_distance_beyond_index(search):
+    with pytest.raises(ValueError):
+        search.fuzzy("bok", max_distance=3)
+
+
+def test_lookup_returns_signs_prefix_first(search):
+    signs = search.lookup("coo")
+    assert signs[0].name == "cook"
+    assert signs[0].handshape == "C"
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("book", "book", 0),
+    ("book", "bok", 1),
+    ("book", "cool", 2),
+    ("book", "apple", None),
+])
+def test_bounded_edit_distance(a, b, expected):
+    assert bounded_edit_distance(a, b, 2) == expected
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from data_prep.parseData import buildSigns
+from sign_data.classes import Sign, SignTable
+
+
+@pytest.fixture
+def signs():
+    df = pd.DataFrame({
+        "LemmaID": ["hello", "bye", "hello"],
+        "Movement.2.0": ["straight", "curved", "arc"],
+        "MajorLocation.2.0": ["Head", "Neutral", "Head"],
+        "MinorLocation.2.0": ["Forehead", "Neutral", "Chin"],
+        "HandshapeM2.2.0": ["5", "B", "A"],
+        "Frequency": [4.5, 3.0, 1.0],
+    })
+    return buildSigns(df)
+
+
+def test_lookup_by_name(signs):
+    assert isinstance(signs, SignTable)
+    assert len(signs) == 2
+    assert set(signs) == {"hello", "bye"}
+    assert "bye" in signs
+    assert "nope" not in signs
+
+    bye = signs["bye"]
+    assert isinstance(bye, Sign)
+    assert bye.name == "bye"
+    assert bye.movement == "curved"
+    assert bye.majorLocation == "Neutral"
+    assert bye.minorLocation == "Neutral"
+    assert bye.handshape == "B"
+    assert bye.get("Frequency") == 3.0
+    assert bye.get("missing", "default") == "default"
+
+
+def test_repeated_name_keeps_last_row(signs):
+    # Same as the old dict of signs, the last row for a name wins
+    assert signs["hello"].movement == "arc"
+
+
+def test_signs_are_light_views(signs):
+    sign = signs["hello"]
+    assert not hasattr(sign, "__dict__")
+    assert sign.attrs.to_dict()["Frequency"] == 1.0
+
+    with pytest.raises(KeyError):
+        signs["nope"]
+
+
+def test_sign_at_position(signs):
+    first = signs.sign_at(0)
+    assert first.name == "hello"
+    assert first.movement == "straight"
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sign_data.similarity import build_knn, encode_features, nearest_neighbors
+
+WEIGHTS = {"Handshape": 1.0, "Movement": 1.0, "MajorLocation": 1.0, "Flexion.2.0": 0.5}
+
+
+@pytest.fixture
+def lexicon():
+    rng = np.random.default_rng(1)
+    n = 90
+    df = pd.DataFrame({
+        "LemmaID": [f"sign_{i}" for i in range(n)],
+        "Handshape": rng.choice(["5", "B", "A", "S"], size=n),
+        "Movement": rng.choice(["straight", "arc"], size=n),
+        "MajorLocation": rng.choice(["Head", "Neutral", "Body"], size=n),
+        "Flexion.2.0": rng.choice(["1", "2", "3"], size=n),
+    })
+    df.loc[[4, 40], "Movement"] = np.nan
+    return df
+
+
+def brute_force(df, k):
+    # Every pair compared in pandas, ties broken by row order
+    features = list(WEIGHTS)
+    result = []
+    for i in range(len(df)):
+        dist = []
+        for j in range(len(df)):
+            if i == j:
+                continue
+            d = 0.0
+            for f in features:
+                a, b = df.at[i, f], df.at[j, f]
+                if pd.isna(a) or pd.isna(b):
+                    d += WEIGHTS[f] / 2
+                elif a != b:
+                    d += WEIGHTS[f]
+            dist.append((d, j))
+        result.append(sorted(dist)[:k])
+    return result
+
+
+@pytest.mark.parametrize("block_bytes", [1, 10**9])
+def test_matches_brute_force(lexicon, block_bytes):
+    codes = encode_features(lexicon, list(WEIGHTS))
+    neighbors, distances = nearest_neighbors(codes, list(WEIGHTS.values()), k=5,
+                                             block_bytes=block_bytes)
+
+    expected = brute_force(lexicon, 5)
+    assert neighbors.tolist() == [[j for _, j in row] for row in expected]
+    np.testing.assert_allclose(distances, [[d for d, _ in row] for row in expected])
+
+
+def test_similar_returns_signs_and_persists(lexicon, tmp_path):
+    knn = build_knn(lexicon, WEIGHTS, k=4, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("knn-*.npz"))) == 1
+
+    similar = knn.similar("sign_0", k=2)
+    assert len(similar) == 2
+    assert all(sign.name != "sign_0" for sign, _ in similar)
+    assert similar[0][1] <= similar[1][1]
+
+    # A second build reads the saved lists instead of recomputing them
+    again = build_knn(lexicon, WEIGHTS, k=4, cache_dir=tmp_path)
+    np.testing.assert_array_equal(again.neighbors, knn.neighbors)
+
+
+def test_skips_features_missing_from_frame(lexicon, tmp_path):
+    knn = build_knn(lexicon, {**WEIGHTS, "Spread.2.0": 0.5}, k=3, use_cache=False)
+    assert "Spread.2.0" not in knn.features
+
+
+def test_unknown_sign_raises(lexicon):
+    knn = build_knn(lexicon, WEIGHTS, k=3, use_cache=False)
+    with pytest.raises(KeyError):
+        knn.similar("not_a_sign")
@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_prep import cache, prepareData, sources
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo():
+    prepareData.reset_loaded_data()
+    yield
+    prepareData.reset_loaded_data()
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / "Frequency").mkdir()
+    (tmp_path / "Iconicity").mkdir()
+    pd.DataFrame({
+        "LemmaID": ["hello", "bye", "bye"],
+        "SignFrequency": [5.5, 3.0, 9.9],
+    }).to_csv(tmp_path / "Frequency" / "ASLLEXR.csv", index=False)
+    pd.DataFrame({
+        "LemmaID": ["hello", "hello", "hello", "yes"],
+        "Rating": [1.0, 2.0, 6.0, 4.0],
+        "Rater": ["a", "b", "c", "a"],
+    }).to_csv(tmp_path / "Iconicity" / "IconicityTrial.csv", index=False)
+    return tmp_path
+
+
+@pytest.fixture
+def signs():
+    return pd.DataFrame({"LemmaID": ["hello", "bye", "no"], "Handshape": ["5", "B", "A"]})
+
+
+def test_trials_are_aggregated_per_sign(data_dir, tmp_path):
+    table = sources.load_source("iconicity", data_dir, tmp_path / "cache")
+
+    assert table.loc["hello", "iconicity_Rating_mean"] == pytest.approx(3.0)
+    assert table.loc["hello", "iconicity_n"] == 3
+    # Text columns are not averaged
+    assert "iconicity_Rater_mean" not in table.columns
+
+
+def test_join_keeps_every_sign(data_dir, tmp_path, signs):
+    merged = sources.with_sources(signs, ["frequency", "iconicity"], data_dir,
+                                  tmp_path / "cache")
+
+    assert merged["LemmaID"].tolist() == ["hello", "bye", "no"]
+    # One row per sign in ASLLEXR: the first one wins
+    assert merged["frequency_SignFrequency"].tolist()[:2] == [5.5, 3.0]
+    assert np.isnan(merged["iconicity_Rating_mean"].iloc[1])
+    assert np.isnan(merged["frequency_SignFrequency"].iloc[2])
+
+
+def test_merged_table_is_cached(data_dir, tmp_path, signs, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    first = sources.with_sources(signs, ["iconicity"], data_dir, cache_dir)
+    assert list(cache_dir.glob("merged-*.pkl"))
+
+    # A second run neither re-reads nor re-aggregates the trial file
+    prepareData.reset_loaded_data()
+    monkeypatch.setattr(sources, "read_csv", lambda *a, **k: pytest.fail("re-read"))
+    again = sources.with_sources(signs, ["iconicity"], data_dir, cache_dir)
+    pd.testing.assert_frame_equal(again, first)
+
+
+def test_warm_join_hashes_only_the_sign_ids(data_dir, tmp_path, signs, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    path = data_dir / "Iconicity" / "IconicityTrial.csv"
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - 60 * 10**9))
+    first = sources.with_sources(signs, ["iconicity"], data_dir, cache_dir)
+
+    # Other columns of the frame do not matter; the source file is not read
+    prepareData.reset_loaded_data()
+    monkeypatch.setattr(cache, "file_digest", lambda *a, **k: pytest.fail("re-hashed"))
+    monkeypatch.setattr(sources, "read_csv", lambda *a, **k: pytest.fail("re-read"))
+    again = sources.with_sources(signs.assign(Handshape="5"), ["iconicity"], data_dir, cache_dir)
+    pd.testing.assert_frame_equal(again.drop(columns="Handshape"),
+                                  first.drop(columns="Handshape"))
+
+
+def test_changed_source_replaces_the_merged_entry(data_dir, tmp_path, signs):
+    cache_dir = tmp_path / "cache"
+    sources.with_sources(signs, ["iconicity"], data_dir, cache_dir)
+    sources.with_sources(signs, ["frequency"], data_dir, cache_dir)
+
+    path = data_dir / "Iconicity" / "IconicityTrial.csv"
+    path.write_text(path.read_text() + "bye,7.0,b\n")
+    prepareData.reset_loaded_data()
+    merged = sources.with_sources(signs, ["iconicity"], data_dir, cache_dir)
+
+    assert merged.loc[1, "iconicity_Rating_mean"] == 7.0
+    assert len(list(cache_dir.glob("merged-iconicity-*.pkl"))) == 1
+    assert len(list(cache_dir.glob("merged-frequency-*.pkl"))) == 1
+
+
+def test_missing_and_unknown_sources(data_dir, tmp_path, signs):
+    merged = sources.with_sources(signs, ["iconicity_d"], data_dir, tmp_path / "cache")
+    pd.testing.assert_frame_equal(merged, signs)
+
+    with pytest.raises(ValueError, match="Unknown source"):
+        sources.with_sources(signs, ["nope"], data_dir, tmp_path / "cache")
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from data_prep import cache, prepareData
+from data_prep.prepareData import load_sign_data, stream_sign_data
+
+
+@pytest.fixture
+def sign_csv(tmp_path):
+    path = tmp_path / "signdata.csv"
+    n = 25
+    pd.DataFrame({
+        "LemmaID": [f"sign_{i}" for i in range(n)],
+        "Handshape.2.0": [["5", "B", "A"][i % 3] for i in range(n)],
+        "MovementM2.2.0": [["arc", "straight"][i % 2] for i in range(n)],
+        "Trial": list(range(n)),
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_stream_writes_one_part_per_chunk(sign_csv, tmp_path):
+    entry = stream_sign_data(sign_csv, cache_dir=tmp_path / "cache", chunksize=10)
+
+    parts = sorted(p.name for p in entry.glob("part-*"))
+    assert len(parts) == 3
+
+
+def test_streamed_load_matches_full_load(sign_csv, tmp_path, monkeypatch):
+    expected = load_sign_data(sign_csv, use_cache=False)
+
+    # The whole-file parser must not be used when streaming
+    monkeypatch.setattr(prepareData, "read_csv", lambda *a, **k: pytest.fail("read whole file"))
+    streamed = load_sign_data(sign_csv, cache_dir=tmp_path / "cache", chunksize=7)
+
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_streamed_categorical_parts_combine(sign_csv, tmp_path):
+    cache_dir = tmp_path / "cache"
+    streamed = load_sign_data(sign_csv, cache_dir=cache_dir, chunksize=4, categorical=True)
+
+    assert isinstance(streamed["Handshape"].dtype, pd.CategoricalDtype)
+    assert streamed["Handshape"].tolist()[:4] == ["5", "B", "A", "5"]
+    assert streamed["Trial"].tolist() == list(range(25))
+
+
+def test_concat_parts_keeps_values_of_non_categorical_parts():
+    first = pd.DataFrame({"a": ["x", "y"]})
+    second = pd.DataFrame({"a": pd.Categorical(["y", "y"])})
+
+    combined = cache._concat_parts([first, second])
+    assert combined["a"].tolist() == ["x", "y", "y", "y"]
+    assert isinstance(combined["a"].dtype, pd.CategoricalDtype)
@@ -0,0 +1,58 @@
+# tests/ml_test/conftest.py
+#
+# The small synthetic sign table the ML tests train on. Handshape is one
+# of three labels and Movement follows from it, so both targets are
+# learnable. A test module asks for more rows or extra columns with
+#
+#     pytestmark = pytest.mark.sign_data(n=90, extra=["Location"])
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _selected_fingers(rng, n, handshape):
+    # Missing for one handshape, to exercise missing categories
+    return pd.Categorical(np.where(handshape == "A", None, handshape))
+
+
+# Extra columns by name: f(rng, n, handshape) -> column
+EXTRA_COLUMNS = {
+    "LemmaID": lambda rng, n, handshape: pd.Categorical([f"sign_{i}" for i in range(n)]),
+    "Gloss": lambda rng, n, handshape: pd.Categorical([f"gloss {i}" for i in range(n)]),
+    "Note": lambda rng, n, handshape: pd.Categorical(
+        rng.choice([f"note {i}" for i in range(30)], size=n)
+    ),
+    "Lexicon": lambda rng, n, handshape: pd.Categorical(["ASL"] * n),
+    "Iconicity": lambda rng, n, handshape: rng.normal(size=n),
+    "Location": lambda rng, n, handshape: pd.Categorical(
+        rng.choice(["head", "chest", "neutral"], size=n)
+    ),
+    "SelectedFingers": _selected_fingers,
+    "Handshape.2.0": lambda rng, n, handshape: pd.Categorical(handshape),
+    "HandshapeM2.2.0": lambda rng, n, handshape: pd.Categorical(handshape),
+}
+
+
+def make_sign_data(n=60, extra=(), seed=0):
+    """Frequency, the extra columns (in order), Handshape and Movement for n signs."""
+    rng = np.random.default_rng(seed)
+    handshape = rng.choice(["flat", "B", "A"], size=n)
+    columns = {"Frequency": rng.normal(size=n)}
+    for name in extra:
+        columns[name] = EXTRA_COLUMNS[name](rng, n, handshape)
+    columns["Handshape"] = pd.Categorical(handshape)
+    columns["Movement"] = pd.Categorical(np.where(handshape == "flat", "arc", "straight"))
+    return pd.DataFrame(columns)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "sign_data(n=60, extra=(), seed=0): options of the sign_data fixture"
+    )
+
+
+@pytest.fixture
+def sign_data(request):
+    marker = request.node.get_closest_marker("sign_data")
+    return make_sign_data(**(marker.kwargs if marker else {}))
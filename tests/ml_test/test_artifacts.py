@@ -0,0 +1,54 @@
+# tests/ml_test/test_artifacts.py
+#
+# Models can be saved plain, compressed or memory-mappable, always with a
+# JSON sidecar that is readable without unpickling the model.
+
+import json
+
+import pytest
+
+from ml_scripts import artifacts
+from ml_scripts.training import train_all_targets
+
+
+@pytest.mark.parametrize("artifact_format", ["pickle", "compressed", "mmap"])
+def test_formats_round_trip_with_sidecar(sign_data, tmp_path, artifact_format):
+    results = train_all_targets(sign_data, targets=["Handshape"], models_dir=tmp_path,
+                                artifact_format=artifact_format)
+    path = tmp_path / "model_Handshape.pkl"
+    assert results[0]["path"] == str(path)
+
+    metadata = json.loads((tmp_path / "model_Handshape.json").read_text())
+    assert metadata == artifacts.read_metadata(path)
+    assert metadata["target"] == "Handshape"
+    assert metadata["format"] == artifact_format
+    assert metadata["classes"] == ["A", "B", "flat"]
+    assert metadata["features"] == ["Frequency", "Movement"]
+    assert metadata["stats"]["n_train"] + metadata["stats"]["n_test"] == len(sign_data)
+
+    pipe, info = artifacts.load_artifact(path, verbose=False)
+    assert info["load_seconds"] >= 0
+    assert "rss_bytes" in info
+    assert len(pipe.predict(sign_data.head(3))) == 3
+
+
+def test_compressed_is_smaller(sign_data, tmp_path):
+    sizes = {}
+    for artifact_format in ["pickle", "compressed"]:
+        models_dir = tmp_path / artifact_format
+        train_all_targets(sign_data, targets=["Handshape"], models_dir=models_dir,
+                          artifact_format=artifact_format)
+        sizes[artifact_format] = (models_dir / "model_Handshape.pkl").stat().st_size
+    assert sizes["compressed"] < sizes["pickle"]
+
+
+def test_unknown_format_and_missing_sidecar(sign_data, tmp_path):
+    with pytest.raises(ValueError, match="Unknown artifact format"):
+        artifacts.write_artifact(object(), tmp_path / "m.pkl", "Handshape", "zip")
+    assert artifacts.read_metadata(tmp_path / "model_None.pkl") == {}
+
+
+def test_load_all(sign_data, tmp_path):
+    train_all_targets(sign_data, targets=["Handshape", "Movement"], models_dir=tmp_path)
+    loaded = artifacts.load_all(tmp_path, verbose=False)
+    assert sorted(loaded) == ["model_Handshape", "model_Movement"]
@@ -0,0 +1,101 @@
+# tests/ml_test/test_crossval.py
+#
+# Stratified k-fold cross-validation: fold counts, the unstratified
+# fallback, encodings shared between variants, parallel folds, and the
+# cv modes of training and the null baselines.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_scripts.crossval import NULL_VARIANTS, cross_validate, cv_splits, model_variant
+from ml_scripts.null import null_one_target
+from ml_scripts.training import train_one_target
+
+
+pytestmark = pytest.mark.sign_data(n=90, extra=["Location"])
+
+
+def _xy(sign_data):
+    return sign_data.drop(columns=["Movement"]), sign_data["Movement"]
+
+
+def test_repeated_folds_are_stratified(sign_data):
+    y = sign_data["Movement"]
+    splits = cv_splits(y, n_splits=3, n_repeats=2)
+    assert len(splits) == 6
+    share = (y == "arc").mean()
+    for train_rows, test_rows in splits:
+        assert len(set(train_rows) & set(test_rows)) == 0
+        assert abs((y.iloc[test_rows] == "arc").mean() - share) < 0.05
+
+
+def test_rare_class_keeps_the_other_classes_stratified(sign_data, capsys):
+    y = sign_data["Movement"].cat.add_categories(["wiggle"])
+    y.iloc[:2] = "wiggle"
+    splits = cv_splits(y, n_splits=3)
+
+    assert len(splits) == 3
+    assert "[WARN] Classes with <3 samples are not in every fold: wiggle" in capsys.readouterr().out
+    share = (y == "arc").mean()
+    for train_rows, test_rows in splits:
+        assert abs((y.iloc[test_rows] == "arc").mean() - share) < 0.05
+        assert (y.iloc[train_rows] == "wiggle").sum() >= 1
+
+
+def test_only_rare_classes_fall_back_to_unstratified_folds(capsys):
+    y = pd.Series(pd.Categorical(["arc", "arc", "straight", "straight", "flat"]))
+    assert len(cv_splits(y, n_splits=3)) == 3
+    assert "[WARN] Not stratifying folds" in capsys.readouterr().out
+
+
+def test_variants_share_one_encoding_per_fold(sign_data):
+    X, y = _xy(sign_data)
+    variants = {
+        "rf": model_variant("rf", n_estimators=20),
+        "rf_shallow": model_variant("rf", n_estimators=20, max_depth=2),
+        "hgb": model_variant("hgb", max_iter=20),
+    }
+    result = cross_validate(X, y, variants, n_splits=3)
+
+    assert result["folds"] == 3
+    assert len(result["fold_seconds"]) == 3
+    # One preprocessor fit per engine and fold, not per variant
+    assert all(sorted(fold) == ["hgb", "rf"] for fold in result["encode_seconds"])
+    for name in variants:
+        scores = result[name]
+        assert len(scores["f1_macro"]) == 3
+        assert scores["f1_mean"] == pytest.approx(np.mean(scores["f1_macro"]))
+        assert scores["acc_std"] >= 0
+
+
+def test_parallel_folds_match_sequential(sign_data):
+    X, y = _xy(sign_data)
+    variants = {"rf": model_variant("rf", n_estimators=20), **NULL_VARIANTS}
+    sequential = cross_validate(X, y, variants, n_splits=3)
+    parallel = cross_validate(X, y, variants, n_splits=3, n_jobs=2)
+    for name in variants:
+        assert parallel[name]["accuracy"] == sequential[name]["accuracy"]
+        assert parallel[name]["f1_macro"] == sequential[name]["f1_macro"]
+
+
+def test_train_one_target_cv_does_not_save_a_model(sign_data, tmp_path):
+    result = train_one_target(sign_data, "Movement", models_dir=tmp_path, cv=3, cv_repeats=2)
+
+    assert result["status"] == "ok"
+    assert result["folds"] == 6
+    assert len(result["fold_seconds"]) == 6
+    assert result["acc"] > 0.9
+    assert result["acc_std"] >= 0 and result["f1_std"] >= 0
+    assert result["path"] is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_null_one_target_cv(sign_data):
+    result = null_one_target(sign_data, "Movement", cv=3)
+
+    assert result["folds"] == 3
+    share = (sign_data["Movement"] == "arc").mean()
+    assert result["acc_majority"] == pytest.approx(max(share, 1 - share), abs=0.05)
+    assert result["acc_majority_std"] >= 0
+    assert "f1_stratified_std" in result
@@ -0,0 +1,73 @@
+# tests/ml_test/test_engines.py
+#
+# The "hgb" engine trains gradient boosting on integer-coded categories,
+# through both training paths, and compare_engines measures every engine.
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from ml_scripts import model_pipeline
+from ml_scripts.comparison import compare_engines
+from ml_scripts.encoding import SharedEncoding
+from ml_scripts.training import train_all_targets
+
+
+pytestmark = pytest.mark.sign_data(n=80, extra=["SelectedFingers"])
+
+
+def test_hgb_pipeline_uses_native_categories(sign_data):
+    X = sign_data.drop(columns=["Handshape"])
+    pipe = model_pipeline.build_pipeline(X, engine="hgb")
+    pipe.fit(X, sign_data["Handshape"])
+
+    model = pipe.named_steps["model"]
+    assert isinstance(model, HistGradientBoostingClassifier)
+    # One output per column: codes for the two categorical columns, then the number
+    assert pipe.named_steps["prep"].transform(X).shape == (len(X), 3)
+    assert list(model.is_categorical_) == [True, True, False]
+
+
+def test_unknown_engine_is_rejected(sign_data):
+    with pytest.raises(ValueError, match="Unknown engine"):
+        model_pipeline.build_pipeline(sign_data, engine="svm")
+
+
+def test_shared_encoding_for_hgb_is_dense_codes(sign_data):
+    encoding = SharedEncoding(sign_data, engine="hgb")
+
+    assert isinstance(encoding.matrix, np.ndarray)
+    assert encoding.matrix.shape == (len(sign_data), 4)
+    assert all(len(cols) == 1 for cols in encoding.layout.values())
+    assert list(encoding.categorical) == [True, True, True, False]
+
+    model = encoding.build_model("Handshape")
+    assert list(model.categorical_features) == [True, True, False]
+
+
+@pytest.mark.parametrize("shared_encoding", [True, False])
+def test_train_all_targets_with_hgb(sign_data, tmp_path, shared_encoding):
+    results = train_all_targets(sign_data, targets=["Handshape", "Movement"],
+                                models_dir=tmp_path, engine="hgb",
+                                shared_encoding=shared_encoding)
+
+    assert [r["status"] for r in results] == ["ok", "ok"]
+    pipe = joblib.load(results[0]["path"])
+    assert isinstance(pipe.named_steps["model"], HistGradientBoostingClassifier)
+    # The saved model takes a raw frame, with or without its own target column
+    assert len(pipe.predict(sign_data.drop(columns=["Handshape"]).head(5))) == 5
+
+
+def test_compare_engines_reports_every_engine(sign_data, capsys):
+    results = compare_engines(sign_data, targets=["Handshape", "Missing"])
+
+    assert results[1]["status"] == "skip"
+    stats = results[0]
+    for engine in ["rf", "hgb"]:
+        assert set(stats[engine]) == {
+            "fit_seconds", "predict_row_ms", "predict_batch_ms",
+            "model_mb", "accuracy", "f1_macro",
+        }
+        assert 0 <= stats[engine]["f1_macro"] <= 1
+    assert "Engine Comparison" in capsys.readouterr().out
@@ -0,0 +1,66 @@
+# tests/ml_test/test_features.py
+#
+# Feature pruning: identifiers, constant and high-cardinality columns are
+# left out, and no target is trained on its own versioned source columns.
+
+import pytest
+
+from ml_scripts.encoding import SharedEncoding
+from ml_scripts.features import (
+    feature_columns,
+    feature_report,
+    prune_features,
+    target_siblings,
+)
+
+
+pytestmark = pytest.mark.sign_data(
+    extra=["LemmaID", "Gloss", "Note", "Lexicon", "Handshape.2.0", "HandshapeM2.2.0"]
+)
+
+
+def test_target_siblings_are_versioned_source_columns(sign_data):
+    columns = list(sign_data.columns)
+    assert set(target_siblings("Handshape", columns)) == {"Handshape.2.0", "HandshapeM2.2.0"}
+    assert target_siblings("Movement", columns) == []
+
+    features = feature_columns(columns, "Handshape")
+    assert "Handshape" not in features
+    assert "Handshape.2.0" not in features
+    assert "Movement" in features
+
+
+def test_prune_features_drops_ids_constants_and_wide_columns(sign_data):
+    kept, dropped = prune_features(
+        sign_data, targets=["Handshape", "Movement"], max_categories=20
+    )
+
+    assert dropped == {
+        "LemmaID": "identifier",
+        "Gloss": "identifier",
+        "Note": "high cardinality",
+        "Lexicon": "constant",
+    }
+    assert kept == ["Frequency", "Handshape.2.0", "HandshapeM2.2.0", "Handshape", "Movement"]
+
+
+def test_shared_encoding_drops_target_siblings(sign_data):
+    frame = sign_data[["Frequency", "Handshape.2.0", "Handshape", "Movement"]]
+    encoding = SharedEncoding(frame)
+
+    keep = set(encoding.keep_columns("Handshape"))
+    for col in ["Handshape", "Handshape.2.0"]:
+        assert keep.isdisjoint(encoding.layout[col])
+    assert set(encoding.layout["Movement"]) <= keep
+
+
+def test_feature_report_compares_before_and_after(sign_data, capsys):
+    report = feature_report(sign_data, targets=["Handshape", "Movement"], max_categories=20)
+
+    assert [r["target"] for r in report] == ["Handshape", "Movement"]
+    for r in report:
+        before, after = r["before"], r["after"]
+        assert set(before) == {"n_columns", "width", "fit_seconds", "model_mb", "f1_macro"}
+        assert after["width"] < before["width"]
+        assert after["n_columns"] < before["n_columns"]
+    assert "Feature Pruning Report" in capsys.readouterr().out
@@ -0,0 +1,72 @@
+# tests/ml_test/test_inference.py
+#
+# predict_frame / predict_chunks / predict_csv predict every target at once
+# and agree with each saved model's own predict().
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_scripts import inference
+from ml_scripts.registry import ModelRegistry
+from ml_scripts.training import train_all_targets
+
+TARGETS = ["Handshape", "Movement"]
+
+
+pytestmark = pytest.mark.sign_data(n=80, extra=["LemmaID", "SelectedFingers"])
+
+
+@pytest.fixture(params=[True, False], ids=["shared", "per-target"])
+def registry(request, sign_data, tmp_path):
+    train_all_targets(sign_data.drop(columns=["LemmaID"]), targets=TARGETS,
+                      models_dir=tmp_path, shared_encoding=request.param)
+    return ModelRegistry(tmp_path)
+
+
+def test_predict_frame_matches_each_model(registry, sign_data):
+    batch = sign_data.drop(columns=TARGETS)
+    result = inference.predict_frame(batch, targets=TARGETS + ["MinorLocation"],
+                                     registry=registry, chunksize=30)
+
+    assert result.index.equals(batch.index)
+    for target_col in TARGETS:
+        pipe = registry.get(target_col)
+        # The other target is a feature too; the batch leaves it missing
+        X = batch.assign(**{t: pd.Series(np.nan, index=batch.index, dtype=object)
+                            for t in TARGETS if t != target_col})
+        assert list(result[target_col].astype(str)) == list(pipe.predict(X).astype(str))
+
+        proba = result[[inference.proba_column(target_col, c) for c in pipe.classes_]]
+        np.testing.assert_allclose(proba.to_numpy(), pipe.predict_proba(X))
+    assert "MinorLocation" not in result
+
+
+def test_missing_targets_rescan_the_registry_once(registry, monkeypatch):
+    rescans = []
+    refresh = registry.refresh
+    monkeypatch.setattr(registry, "refresh", lambda: rescans.append(1) or refresh())
+
+    models = inference.load_models(TARGETS + ["MinorLocation", "MajorLocation"], registry)
+    assert sorted(models) == sorted(TARGETS)
+    assert len(rescans) == 1
+
+
+def test_predict_chunks_streams(registry, sign_data):
+    chunks = (sign_data.iloc[i:i + 25] for i in range(0, len(sign_data), 25))
+    results = list(inference.predict_chunks(chunks, targets=TARGETS, registry=registry))
+    assert [len(r) for r in results] == [25, 25, 25, 5]
+
+
+def test_predict_csv_writes_every_row(registry, sign_data, tmp_path):
+    path = tmp_path / "signs.csv"
+    sign_data.drop(columns=TARGETS).to_csv(path, index=False)
+    out_path = tmp_path / "predictions.csv"
+
+    n_rows = inference.predict_csv(path, out_path, targets=TARGETS, registry=registry,
+                                   chunksize=30)
+
+    written = pd.read_csv(out_path)
+    assert n_rows == len(written) == len(sign_data)
+    assert list(written["LemmaID"]) == list(sign_data["LemmaID"])
+    assert {"Handshape", "Movement"} <= set(written.columns)
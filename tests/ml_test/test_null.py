@@ -0,0 +1,116 @@
+# tests/ml_test/test_null.py
+#
+# Null baselines computed from class counts: stratified and random splits,
+# majority and stratified scores against scikit-learn, and bootstrap intervals.
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.dummy import DummyClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+
+from ml_scripts.model_pipeline import train_test_split_data
+from ml_scripts.null import (
+    class_counts,
+    majority_scores,
+    null_all_targets,
+    null_scores,
+    split_counts,
+    stratified_scores,
+    stratified_split_counts,
+)
+
+
+@pytest.fixture
+def labels():
+    rng = np.random.default_rng(1)
+    return pd.Series(pd.Categorical(
+        rng.choice(["flat", "B", "A", "S", "V"], p=[0.4, 0.25, 0.2, 0.1, 0.05], size=300)
+    ))
+
+
+def test_class_counts_follow_sorted_classes():
+    y = pd.Series(pd.Categorical(["b", "a", "b", "c"], categories=["c", "b", "a", "z"]))
+    assert class_counts(y).tolist() == [1, 2, 1]
+
+
+def test_split_counts_draw_the_test_set():
+    rng = np.random.default_rng(0)
+    counts = np.broadcast_to(np.array([50, 30, 15, 5]), (1000, 4))
+    test = split_counts(counts, 20, rng)
+    assert (test.sum(axis=1) == 20).all()
+    assert ((test >= 0) & (test <= counts)).all()
+    # Hypergeometric mean: 20 * 50 / 100 signs of the first class
+    assert test[:, 0].mean() == pytest.approx(10, abs=0.3)
+
+
+def test_majority_scores_match_sklearn():
+    train = np.array([[5, 3, 2], [1, 4, 4], [2, 2, 6]])
+    test = np.array([[2, 1, 0], [0, 0, 3], [1, 1, 1]])
+    acc, f1 = majority_scores(train, test)
+
+    classes = np.arange(3)
+    for i in range(len(test)):
+        y_true = np.repeat(classes, test[i])
+        y_pred = np.full(len(y_true), train[i].argmax())
+        assert acc[i] == pytest.approx(accuracy_score(y_true, y_pred))
+        assert f1[i] == pytest.approx(f1_score(y_true, y_pred, average="macro", zero_division=0))
+
+
+def test_stratified_accuracy_matches_its_expectation():
+    rng = np.random.default_rng(0)
+    train = np.broadcast_to(np.array([60, 30, 10]), (20000, 3))
+    test = np.broadcast_to(np.array([12, 6, 2]), (20000, 3))
+    acc, f1 = stratified_scores(train, test, rng)
+    assert acc.mean() == pytest.approx((12 * 0.6 + 6 * 0.3 + 2 * 0.1) / 20, abs=0.005)
+    assert ((0 <= f1) & (f1 <= 1)).all()
+
+
+def test_stratified_split_counts_match_sklearn():
+    rng = np.random.default_rng(0)
+    counts = np.array([7, 5, 3])
+    y = np.repeat(["A", "B", "flat"], counts)
+    for seed in range(5):
+        _, y_test = train_test_split(y, test_size=3, stratify=y, random_state=seed)
+        expected = [(y_test == c).sum() for c in ["A", "B", "flat"]]
+        assert stratified_split_counts(counts[None, :], 3, rng).tolist() == [expected]
+
+
+def _dummy_scores(y, n_splits=200):
+    """Mean DummyClassifier scores over train_test_split_data splits of y."""
+    X = pd.DataFrame({"x": np.zeros(len(y))})
+    scores = {"acc_majority": [], "f1_majority": [], "acc_stratified": [], "f1_stratified": []}
+    for seed in range(n_splits):
+        X_train, X_test, y_train, y_test = train_test_split_data(X, y, random_state=seed)
+        for strategy, name in [("most_frequent", "majority"), ("stratified", "stratified")]:
+            clf = DummyClassifier(strategy=strategy, random_state=seed).fit(X_train, y_train)
+            y_pred = clf.predict(X_test)
+            scores[f"acc_{name}"].append(accuracy_score(y_test, y_pred))
+            scores[f"f1_{name}"].append(f1_score(y_test, y_pred, average="macro", zero_division=0))
+    return {score: np.mean(values) for score, values in scores.items()}
+
+
+@pytest.mark.parametrize("singleton", [False, True], ids=["stratified", "unstratified"])
+def test_null_scores_match_dummy_classifiers_on_model_splits(labels, singleton):
+    if singleton:
+        # One sign of a class: train_test_split_data no longer stratifies
+        labels = labels.cat.add_categories(["Y"])
+        labels.iloc[0] = "Y"
+
+    result = null_scores(class_counts(labels), n_resamples=4000)
+    for score, expected in _dummy_scores(labels).items():
+        assert result[score] == pytest.approx(expected, abs=0.01)
+
+
+def test_null_all_targets_report_confidence_intervals(labels):
+    signData = pd.DataFrame({"Handshape": labels, "Movement": labels.cat.codes % 2})
+    results = null_all_targets(signData, targets=["Handshape", "Movement", "Missing"],
+                               n_resamples=500)
+
+    assert [r["status"] for r in results] == ["ok", "ok", "skip"]
+    for r in results[:2]:
+        assert r["n_resamples"] == 500
+        for score in ["acc_majority", "f1_majority", "acc_stratified", "f1_stratified"]:
+            low, high = r[f"{score}_ci"]
+            assert 0 <= low <= r[score] <= high <= 1
@@ -0,0 +1,57 @@
+# tests/ml_test/test_parallel_training.py
+#
+# Parallel multi-target training must give the same results and models
+# as training the targets one after another.
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_scripts.training import split_core_budget, train_all_targets
+
+
+@pytest.fixture
+def multi_target_data():
+    rng = np.random.default_rng(0)
+    n = 60
+    return pd.DataFrame({
+        "feat1": rng.normal(size=n),
+        "feat2": rng.normal(size=n),
+        # Integer-coded labels keep every feature numeric
+        "Handshape": rng.choice([0, 1], size=n),
+        "Movement": rng.choice([0, 1, 2], size=n),
+    })
+
+
+@pytest.mark.parametrize("n_jobs, n_targets, expected", [
+    (1, 4, (1, 1)),
+    (8, 4, (4, 2)),
+    (3, 4, (3, 1)),
+    (16, 2, (2, 8)),
+])
+def test_split_core_budget(n_jobs, n_targets, expected):
+    assert split_core_budget(n_jobs, n_targets) == expected
+
+
+def test_split_core_budget_all_cores_never_oversubscribes(monkeypatch):
+    monkeypatch.setattr("ml_scripts.training.cpu_count", lambda: 6)
+    target_jobs, tree_jobs = split_core_budget(-1, 4)
+    assert target_jobs * tree_jobs <= 6
+
+
+def test_parallel_matches_sequential(tmp_path, multi_target_data):
+    targets = ["Handshape", "Movement", "MinorLocation"]
+    sequential = train_all_targets(multi_target_data, targets, tmp_path / "seq", n_jobs=1)
+    parallel = train_all_targets(multi_target_data, targets, tmp_path / "par", n_jobs=2)
+
+    assert [r["target"] for r in parallel] == targets
+    assert parallel[2]["status"] == "skip"
+    for seq, par in zip(sequential[:2], parallel[:2]):
+        assert (seq["acc"], seq["f1_macro"]) == (par["acc"], par["f1_macro"])
+
+        seq_model = joblib.load(seq["path"])
+        par_model = joblib.load(par["path"])
+        assert par_model.named_steps["model"].n_jobs is None
+        X = multi_target_data.drop(columns=[seq["target"]])
+        np.testing.assert_array_equal(seq_model.predict_proba(X), par_model.predict_proba(X))
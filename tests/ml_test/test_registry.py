@@ -0,0 +1,82 @@
+# tests/ml_test/test_registry.py
+#
+# The registry loads models on first use, keeps them in LRU order within a
+# memory budget and reloads a model whose file changed.
+
+import os
+
+import pytest
+
+from ml_scripts.registry import ModelRegistry, get_model_registry
+from ml_scripts.training import train_all_targets
+
+
+pytestmark = pytest.mark.sign_data(extra=["Handshape.2.0"])
+
+
+@pytest.fixture
+def models_dir(sign_data, tmp_path):
+    train_all_targets(sign_data, targets=["Handshape", "Movement"], models_dir=tmp_path,
+                      prune=False)
+    return tmp_path
+
+
+def test_models_load_on_first_use(models_dir, sign_data):
+    registry = ModelRegistry(models_dir)
+    assert registry.targets() == ["Handshape", "Movement"]
+    assert registry.loaded() == []
+
+    assert len(registry.predict("Handshape", sign_data.head(4))) == 4
+    registry.get("Handshape")
+    assert registry.loaded() == ["Handshape"]
+    assert registry.counts["loads"] == 1
+    assert registry.counts["hits"] == 1
+    assert registry.info("Handshape")["memory_bytes"] > 0
+
+
+def test_least_recently_used_model_is_evicted(models_dir):
+    sizes = sorted(p.stat().st_size for p in models_dir.glob("model_*.pkl"))
+    # Room for either model, not both
+    registry = ModelRegistry(models_dir, memory_budget=sizes[1] + sizes[0] // 2)
+
+    registry.get("Handshape")
+    registry.get("Movement")
+    assert registry.loaded() == ["Movement"]
+    assert registry.counts["evictions"] == 1
+
+    registry.get("Handshape")
+    assert registry.loaded() == ["Handshape"]
+    assert registry.counts["loads"] == 3
+
+
+def test_changed_file_is_reloaded(models_dir):
+    registry = ModelRegistry(models_dir)
+    first = registry.get("Movement")
+
+    path = models_dir / "model_Movement.pkl"
+    mtime = path.stat().st_mtime_ns + 10**9
+    os.utime(path, ns=(mtime, mtime))
+
+    assert registry.get("Movement") is not first
+    assert registry.counts["reloads"] == 1
+    assert registry.get("Movement") is registry.get("Movement")
+
+
+def test_unknown_new_and_removed_models(models_dir, sign_data):
+    registry = ModelRegistry(models_dir)
+    with pytest.raises(KeyError, match="No saved model"):
+        registry.get("MinorLocation")
+
+    # Saved after the registry was created; the sidecar gives the real name
+    train_all_targets(sign_data, targets=["Handshape.2.0"], models_dir=models_dir,
+                      prune=False)
+    assert registry.get("Handshape.2.0") is not None
+
+    (models_dir / "model_Movement.pkl").unlink()
+    with pytest.raises(KeyError, match="was removed"):
+        registry.get("Movement")
+    assert "Movement" not in registry
+
+
+def test_get_model_registry_is_shared(models_dir):
+    assert get_model_registry(models_dir) is get_model_registry(str(models_dir))
@@ -0,0 +1,92 @@
+# tests/ml_test/test_search.py
+#
+# Successive-halving search: Pareto helpers, nested stratified rows,
+# halving of the candidates across rungs, and the wall-clock budget.
+
+import pandas as pd
+import pytest
+
+from ml_scripts.search import (
+    candidates,
+    dominates,
+    pareto_front,
+    pareto_ranks,
+    row_order,
+    search_target,
+)
+
+# Small enough to keep the search quick
+SPACE = {
+    "rf": {"n_estimators": [20, 40], "max_depth": [None, 3]},
+    "hgb": {"max_iter": [20], "max_leaf_nodes": [7, 15]},
+}
+
+
+pytestmark = pytest.mark.sign_data(n=160, extra=["Location"])
+
+
+def _record(f1, ms, mb):
+    return {"f1_macro": f1, "predict_batch_ms": ms, "model_mb": mb}
+
+
+def test_pareto_front_keeps_trade_offs():
+    best = _record(0.9, 5.0, 10.0)
+    small = _record(0.8, 1.0, 1.0)
+    worse = _record(0.8, 6.0, 10.0)
+    records = [worse, small, best]
+
+    assert dominates(best, worse) and not dominates(best, small)
+    assert pareto_ranks(records) == [1, 0, 0]
+    assert pareto_front(records) == [best, small]
+
+
+def test_timing_noise_does_not_split_the_front():
+    # Same F1, latency and size within tolerance: tied, not a trade-off
+    a = _record(0.9, 1.00, 2.00)
+    b = _record(0.9, 0.97, 2.03)
+    assert not dominates(a, b) and not dominates(b, a)
+    # A better F1 wins over a model that is only noisily faster
+    better = _record(0.95, 1.05, 2.0)
+    assert dominates(better, b)
+    assert pareto_front([a, b, better]) == [better]
+
+
+def test_row_order_prefixes_keep_every_class():
+    y = pd.Series(["a"] * 90 + ["b"] * 8 + ["c"] * 2)
+    order = row_order(y)
+    assert sorted(order) == list(range(100))
+    assert set(y.iloc[order[:3]]) == {"a", "b", "c"}
+    assert (y.iloc[order[:50]] == "a").sum() == pytest.approx(45, abs=2)
+
+
+def test_candidates_cover_the_space():
+    pool = candidates(["rf", "hgb"], SPACE)
+    assert len(pool) == 6
+    assert ("hgb", {"max_iter": 20, "max_leaf_nodes": 7}) in pool
+
+
+def test_search_halves_candidates_and_grows_rows(sign_data):
+    result = search_target(sign_data, "Movement", budget_seconds=120, space=SPACE)
+
+    assert result["status"] == "ok"
+    assert not result["budget_exhausted"]
+    per_rung = [[c for c in result["candidates"] if c["rung"] == r] for r in range(3)]
+    assert [len(c) for c in per_rung] == [6, 3, 2]
+    assert per_rung[0][0]["n_rows"] < per_rung[1][0]["n_rows"] < per_rung[2][0]["n_rows"]
+
+    # The front comes from the last rung, at full size
+    assert result["rung"] == 2
+    assert result["pareto"]
+    for c in result["pareto"]:
+        assert c["rung"] == 2
+        assert c["trees"] == c["params"].get("n_estimators", c["params"].get("max_iter"))
+        assert c["f1_macro"] > 0.9
+        assert c["predict_batch_ms"] > 0 and c["predict_row_ms"] > 0 and c["model_mb"] > 0
+
+
+def test_spent_budget_stops_the_search(sign_data, capsys):
+    result = search_target(sign_data, "Movement", budget_seconds=0, space=SPACE)
+
+    assert result["budget_exhausted"]
+    assert result["candidates"] == [] and result["pareto"] == []
+    assert "[WARN] Search budget spent" in capsys.readouterr().out
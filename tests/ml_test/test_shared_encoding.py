@@ -0,0 +1,73 @@
+# tests/ml_test/test_shared_encoding.py
+#
+# The features of all targets are encoded once; each target trains on a
+# view of that matrix and its saved model still takes a raw DataFrame.
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_scripts import model_pipeline
+from ml_scripts.encoding import SharedEncoding, output_columns
+from ml_scripts.training import train_all_targets
+
+# training.py hides this warning too; the all-missing column is on purpose
+pytestmark = pytest.mark.filterwarnings("ignore:Skipping features without any observed values")
+
+
+@pytest.fixture
+def wide_data():
+    rng = np.random.default_rng(0)
+    n = 40
+    return pd.DataFrame({
+        "feat1": rng.normal(size=n),
+        "empty": np.full(n, np.nan),
+        "Handshape": pd.Categorical(rng.choice(["flat", "B", "A"], size=n)),
+        "Movement": pd.Categorical(rng.choice(["arc", "straight", None], size=n)),
+    })
+
+
+def test_output_columns_follow_imputer_and_onehot(wide_data):
+    encoding = SharedEncoding(wide_data)
+    layout = output_columns(encoding.preprocessor)
+
+    assert "empty" not in layout
+    assert len(layout["feat1"]) == 1
+    assert len(layout["Handshape"]) == 3
+    assert len(layout["Movement"]) == 2
+    assert sorted(np.concatenate(list(layout.values()))) == list(range(encoding.matrix.shape[1]))
+
+
+def test_target_data_drops_own_columns_and_unlabeled_rows(wide_data):
+    encoding = SharedEncoding(wide_data)
+    X, y = encoding.target_data("Movement")
+
+    assert X.shape == (wide_data["Movement"].notna().sum(), encoding.matrix.shape[1] - 2)
+    assert y.notna().all()
+
+
+def test_preprocessor_is_fitted_once_for_all_targets(tmp_path, wide_data, monkeypatch):
+    calls = []
+    real = model_pipeline.build_preprocessor
+
+    def counting_build_preprocessor(X):
+        calls.append(X.shape)
+        return real(X)
+
+    monkeypatch.setattr(model_pipeline, "build_preprocessor", counting_build_preprocessor)
+    results = train_all_targets(wide_data, ["Handshape", "Movement"], tmp_path)
+
+    assert [r["status"] for r in results] == ["ok", "ok"]
+    assert len(calls) == 1
+
+
+def test_saved_model_predicts_from_raw_frame(tmp_path, wide_data):
+    result = train_all_targets(wide_data, ["Handshape"], tmp_path)[0]
+    pipe = joblib.load(Path(result["path"]))
+
+    assert isinstance(pipe.named_steps["model"].class_weight, dict)
+    predictions = pipe.predict(wide_data.drop(columns=["Handshape"]))
+    assert set(predictions) <= {"flat", "B", "A"}
@@ -0,0 +1,61 @@
+# tests/ml_test/test_training_cache.py
+#
+# train_all_targets skips targets whose data, features and settings are
+# unchanged since their saved model was trained, unless forced.
+
+import pytest
+
+from ml_scripts.training import train_all_targets
+
+TARGETS = ["Handshape", "Movement"]
+
+
+pytestmark = pytest.mark.sign_data(extra=["Iconicity"])
+
+
+def _cached(results):
+    return {r["target"]: r["cached"] for r in results}
+
+
+def test_unchanged_targets_are_not_retrained(sign_data, tmp_path):
+    first = train_all_targets(sign_data, targets=TARGETS, models_dir=tmp_path)
+    mtime = (tmp_path / "model_Handshape.pkl").stat().st_mtime_ns
+
+    second = train_all_targets(sign_data, targets=TARGETS, models_dir=tmp_path)
+    assert _cached(second) == {"Handshape": True, "Movement": True}
+    assert [(r["acc"], r["f1_macro"], r["path"]) for r in second] == \
+        [(r["acc"], r["f1_macro"], r["path"]) for r in first]
+    assert (tmp_path / "model_Handshape.pkl").stat().st_mtime_ns == mtime
+
+
+def test_force_retrains(sign_data, tmp_path):
+    train_all_targets(sign_data, targets=TARGETS, models_dir=tmp_path)
+    again = train_all_targets(sign_data, targets=TARGETS, models_dir=tmp_path, force=True)
+    assert _cached(again) == {"Handshape": False, "Movement": False}
+
+
+def test_changes_invalidate_only_affected_targets(sign_data, tmp_path):
+    train_all_targets(sign_data, targets=TARGETS, models_dir=tmp_path)
+
+    # A changed label only affects the models that use that column
+    changed = sign_data.copy()
+    changed.loc[0, "Movement"] = "arc" if changed.loc[0, "Movement"] == "straight" else "straight"
+    results = train_all_targets(changed, targets=TARGETS, models_dir=tmp_path)
+    # Movement is a label for one model and a feature for the other
+    assert _cached(results) == {"Handshape": False, "Movement": False}
+
+    # Different features or settings retrain as well
+    fewer = changed.drop(columns=["Iconicity"])
+    assert _cached(train_all_targets(fewer, targets=TARGETS, models_dir=tmp_path)) == \
+        {"Handshape": False, "Movement": False}
+    assert _cached(train_all_targets(fewer, targets=TARGETS, models_dir=tmp_path,
+                                     engine="hgb")) == {"Handshape": False, "Movement": False}
+    assert _cached(train_all_targets(fewer, targets=TARGETS, models_dir=tmp_path,
+                                     engine="hgb")) == {"Handshape": True, "Movement": True}
+
+
+def test_new_target_alongside_cached_one(sign_data, tmp_path):
+    train_all_targets(sign_data, targets=["Handshape"], models_dir=tmp_path)
+    results = train_all_targets(sign_data, targets=TARGETS + ["Missing"], models_dir=tmp_path)
+    assert [r["status"] for r in results] == ["ok", "ok", "skip"]
+    assert results[0]["cached"] and not results[1]["cached"]
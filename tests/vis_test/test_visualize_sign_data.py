@@ -13,7 +13,7 @@ def test_runner_calls_all_steps(monkeypatch):
     # Replace get_sign_data so the runner doesn't depend on real data
     monkeypatch.setattr(
         "visualize_sign_data.get_sign_data",
-        lambda: fake_df
+        lambda **kwargs: fake_df
     )
 
     # Counters to check each visualization function is called exactly once
@@ -69,7 +69,7 @@ def test_runner_errors_on_empty_data(monkeypatch):
 
     monkeypatch.setattr(
         "visualize_sign_data.get_sign_data",
-        lambda: pd.DataFrame()  # empty dataset triggers error
+        lambda **kwargs: pd.DataFrame()  # empty dataset triggers error
     )
 
     # Avoid styling side effects again